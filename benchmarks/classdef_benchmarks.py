@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of class definition time, i.e. the time it takes the code generation pipeline to create record and collection classes,
+and of the time it takes to `import tdds'. These matter for the startup time of short-lived processes.
+
+The runner shows how much of each class definition benchmark was spent expanding the templates into source code, compiling that
+source code, and executing it. The rest is spent building the templates, e.g. compiling the fields.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from os import path
+import subprocess
+import sys
+
+# tdds
+import tdds
+from tdds import Field, Record, dict_of, nullable, seq_of, set_of
+from tdds.utils.compatibility import native_string, text_type
+
+# this module
+from .plumbing import build_benchmark_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_BENCHMARKS, benchmark = build_benchmark_registry()
+
+NUM_CLASSES = (10, 100, 1000)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# synthetic schemas
+
+def narrow_class_attrib(index):
+    return {
+        'id': int,
+        'name': text_type,
+        'score': nullable(float),
+    }
+
+def wide_class_attrib(index):
+    attrib = {}
+    for field_num in range(10):
+        attrib['name_%d' % field_num] = text_type
+        attrib['count_%d' % field_num] = Field(int, check='{} >= 0')
+        attrib['score_%d' % field_num] = nullable(float)
+        attrib['tags_%d' % field_num] = set_of(text_type)
+        attrib['label_%d' % field_num] = Field(text_type, default='')
+    return attrib
+
+def nested_class_attrib(index):
+    # Each field compiles four levels of collection classes
+    return {
+        'matrix': seq_of(seq_of(seq_of(seq_of(int)))),
+        'index': dict_of(text_type, seq_of(set_of(dict_of(text_type, int)))),
+        'name': text_type,
+    }
+
+def referencing_class_attrib(index, previous_cls):
+    # A chain of classes, each with a collection of the previous one, like in a real schema
+    attrib = narrow_class_attrib(index)
+    if previous_cls is not None:
+        attrib['children'] = seq_of(previous_cls)
+        attrib['parent'] = nullable(previous_cls)
+    return attrib
+
+
+def define_classes(num_classes, build_attrib, chained=False):
+    # NB the class names are prefixed so that they don't replace any of the other classes registered for unpickling
+    previous_cls = None
+    for index in range(num_classes):
+        attrib = build_attrib(index, previous_cls) if chained else build_attrib(index)
+        attrib['__module__'] = __name__
+        previous_cls = type(Record)(native_string('ClassdefBenchmark%d' % index), (Record,), attrib)
+    return previous_cls
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# class definition benchmarks
+
+def bench_classdef(num_classes, build_attrib, chained=False):
+    return lambda: define_classes(num_classes, build_attrib, chained)
+
+for _num_classes in NUM_CLASSES:
+    benchmark('classdef/narrow/%d' % _num_classes, _num_classes, narrow_class_attrib)(bench_classdef)
+    benchmark('classdef/chained/%d' % _num_classes, _num_classes, referencing_class_attrib, chained=True)(bench_classdef)
+# These are slow enough that we don't go up to 1000
+for _num_classes in NUM_CLASSES[:-1]:
+    benchmark('classdef/wide/%d' % _num_classes, _num_classes, wide_class_attrib)(bench_classdef)
+    benchmark('classdef/nested/%d' % _num_classes, _num_classes, nested_class_attrib)(bench_classdef)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# import time
+
+def bench_python_startup(statement):
+    # NB this is run in a fresh interpreter each time, so it includes the interpreter's own startup time, which is measured by
+    # 'import/baseline' for comparison
+    root_dir = path.dirname(path.dirname(path.abspath(tdds.__file__)))
+    command = [sys.executable, '-c', statement]
+    return lambda: subprocess.check_call(command, cwd=root_dir)
+
+benchmark('import/baseline', 'pass')(bench_python_startup)
+benchmark('import/tdds', 'import tdds')(bench_python_startup)
+
+#----------------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmarks of the core record operations, each measured for tdds records and for the nearest standard library equivalents:
+namedtuples, frozen dataclasses and plain dicts.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from collections import namedtuple
+import pickle
+import sys
+
+# tdds
+from tdds import Record, dict_of, seq_of
+from tdds.utils.compatibility import native_string, text_type
+
+# this module
+from .plumbing import SkipBenchmark, build_benchmark_registry
+
+try:
+    import dataclasses
+except ImportError:  # Python < 3.7
+    dataclasses = None  # pylint: disable=invalid-name
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_BENCHMARKS, benchmark = build_benchmark_registry()
+
+SIZES = (10, 100, 1000)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# the data structures being compared
+
+FIELD_IDS = ('title', 'number', 'total_seconds')
+
+class TrackRecord(Record):
+    title = text_type
+    number = int
+    total_seconds = int
+
+TrackTuple = namedtuple(native_string('TrackTuple'), FIELD_IDS)
+
+def _make_dataclass():
+    if dataclasses is None:
+        return None
+    options = {'frozen': True, 'order': True}
+    if sys.version_info >= (3, 10):
+        options['slots'] = True
+    cls = dataclasses.make_dataclass(
+        'TrackDataclass',
+        [('title', text_type), ('number', int), ('total_seconds', int)],
+        **options
+    )
+    # so that instances can be pickled
+    cls.__module__ = __name__
+    return cls
+
+TrackDataclass = _make_dataclass()
+
+TrackSeq = seq_of(TrackRecord).type
+
+WordCounts = dict_of(text_type, int).type
+
+
+class Flavour(object):
+    """
+    The operations being measured, for one implementation of a "Track" data structure
+    """
+
+    def __init__(self, make, derive, record_pods, from_pods, comparable=True):
+        self.make = make
+        self.derive = derive
+        self.record_pods = record_pods
+        self.from_pods = from_pods
+        self.comparable = comparable
+
+    def make_track(self, number):
+        return self.make(title='Track %d' % number, number=number, total_seconds=180 + number % 120)
+
+
+FLAVOURS = {
+    'tdds': Flavour(
+        make=TrackRecord,
+        derive=lambda track: track.record_derive(number=2),
+        record_pods=lambda track: track.record_pods(),
+        from_pods=TrackRecord.from_pods,
+    ),
+    'namedtuple': Flavour(
+        make=TrackTuple,
+        derive=lambda track: track._replace(number=2),
+        record_pods=lambda track: dict(track._asdict()),
+        from_pods=lambda pods: TrackTuple(**pods),
+    ),
+    'dict': Flavour(
+        make=dict,
+        derive=lambda track: dict(track, number=2),
+        record_pods=dict,
+        from_pods=dict,
+        # dicts can be compared for equality, but can't be hashed or sorted
+        comparable=False,
+    ),
+}
+
+if TrackDataclass is not None:
+    FLAVOURS['dataclass'] = Flavour(
+        make=TrackDataclass,
+        derive=lambda track: dataclasses.replace(track, number=2),
+        record_pods=dataclasses.asdict,
+        from_pods=lambda pods: TrackDataclass(**pods),
+    )
+
+ALL_FLAVOUR_NAMES = ('tdds', 'namedtuple', 'dataclass', 'dict')
+
+def _flavour(flavour_name):
+    flavour = FLAVOURS.get(flavour_name)
+    if flavour is None:
+        raise SkipBenchmark('%s not available' % flavour_name)
+    return flavour
+
+def _comparable_flavour(flavour_name):
+    flavour = _flavour(flavour_name)
+    if not flavour.comparable:
+        raise SkipBenchmark('%s instances are not hashable or sortable' % flavour_name)
+    return flavour
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# single-object operations
+
+def bench_construction(flavour_name):
+    make = _flavour(flavour_name).make
+    return lambda: make(title='Title', number=1, total_seconds=180)
+
+def bench_derive(flavour_name):
+    flavour = _flavour(flavour_name)
+    derive = flavour.derive
+    track = flavour.make_track(1)
+    return lambda: derive(track)
+
+def bench_eq(flavour_name):
+    flavour = _flavour(flavour_name)
+    track_1 = flavour.make_track(1)
+    track_2 = flavour.make_track(1)
+    return lambda: track_1 == track_2
+
+def bench_hash(flavour_name):
+    track = _comparable_flavour(flavour_name).make_track(1)
+    return lambda: hash(track)
+
+def bench_record_pods(flavour_name):
+    flavour = _flavour(flavour_name)
+    record_pods = flavour.record_pods
+    track = flavour.make_track(1)
+    return lambda: record_pods(track)
+
+def bench_from_pods(flavour_name):
+    flavour = _flavour(flavour_name)
+    from_pods = flavour.from_pods
+    pods = flavour.record_pods(flavour.make_track(1))
+    return lambda: from_pods(pods)
+
+def bench_pickle(flavour_name):
+    track = _flavour(flavour_name).make_track(1)
+    dumps, loads, protocol = pickle.dumps, pickle.loads, pickle.HIGHEST_PROTOCOL
+    return lambda: loads(dumps(track, protocol))
+
+for _flavour_name in ALL_FLAVOUR_NAMES:
+    benchmark('construction/%s' % _flavour_name, _flavour_name)(bench_construction)
+    benchmark('derive/%s' % _flavour_name, _flavour_name)(bench_derive)
+    benchmark('eq/%s' % _flavour_name, _flavour_name)(bench_eq)
+    benchmark('hash/%s' % _flavour_name, _flavour_name)(bench_hash)
+    benchmark('record_pods/%s' % _flavour_name, _flavour_name)(bench_record_pods)
+    benchmark('from_pods/%s' % _flavour_name, _flavour_name)(bench_from_pods)
+    benchmark('pickle/%s' % _flavour_name, _flavour_name)(bench_pickle)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# building a record one field at a time, either by deriving a new record for each field, or by filling in a draft
+
+def bench_build_by_derive():
+    def build():
+        track = TrackRecord(title='', number=0, total_seconds=0)
+        track = track.record_derive(title='Track 1')
+        track = track.record_derive(number=1)
+        return track.record_derive(total_seconds=180)
+    return build
+
+def bench_build_by_draft():
+    def build():
+        draft = TrackRecord.draft()
+        draft.title = 'Track 1'
+        draft.number = 1
+        draft.total_seconds = 180
+        return draft.freeze()
+    return build
+
+benchmark('build_field_by_field/derive')(bench_build_by_derive)
+benchmark('build_field_by_field/draft')(bench_build_by_draft)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# operations on collections of several sizes
+
+def bench_sorted(flavour_name, size):
+    flavour = _comparable_flavour(flavour_name)
+    # NB in reverse order, so that sorting has some work to do
+    tracks = [flavour.make_track(number) for number in range(size, 0, -1)]
+    return lambda: sorted(tracks)
+
+def bench_seq_of(size):
+    tracks = [TrackRecord(title='Track %d' % number, number=number, total_seconds=180) for number in range(size)]
+    return lambda: TrackSeq(tracks)
+
+def bench_tuple(size):
+    tracks = [TrackTuple(title='Track %d' % number, number=number, total_seconds=180) for number in range(size)]
+    return lambda: tuple(tracks)
+
+def bench_dict_of(size):
+    counts = {'word%d' % i: i for i in range(size)}
+    return lambda: WordCounts(counts)
+
+def bench_dict(size):
+    counts = {'word%d' % i: i for i in range(size)}
+    return lambda: dict(counts)
+
+def bench_seq_of_from_pods(size):
+    pods = TrackSeq(
+        TrackRecord(title='Track %d' % number, number=number, total_seconds=180)
+        for number in range(size)
+    ).record_pods()
+    return lambda: TrackSeq.from_pods(pods)
+
+for _size in SIZES:
+    for _flavour_name in ALL_FLAVOUR_NAMES:
+        benchmark('sorted/%d/%s' % (_size, _flavour_name), _flavour_name, _size)(bench_sorted)
+    benchmark('seq_of/%d/tdds' % _size, _size)(bench_seq_of)
+    benchmark('seq_of/%d/tuple' % _size, _size)(bench_tuple)
+    benchmark('dict_of/%d/tdds' % _size, _size)(bench_dict_of)
+    benchmark('dict_of/%d/dict' % _size, _size)(bench_dict)
+    benchmark('seq_of_from_pods/%d/tdds' % _size, _size)(bench_seq_of_from_pods)
+
+#----------------------------------------------------------------------------------------------------------------------------------
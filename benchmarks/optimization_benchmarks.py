@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of the code generated by each template, with the optimizations (see `OPTIMIZE' in `tdds.utils.codegen') and without.
+Each benchmark has an "/optimized" and a "/plain" variant, where the classes are compiled within `unoptimized'.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from datetime import date
+
+# tdds
+from tdds import Field, Record, dict_of, fused_from_pods, nonnegative, nullable, one_of, seq_of
+from tdds.utils.codegen import unoptimized
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import build_benchmark_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_BENCHMARKS, benchmark = build_benchmark_registry()
+
+VARIANTS = ('optimized', 'plain')
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# the classes being measured
+
+class Classes(object):
+    """
+    One set of classes, all compiled with the optimizations either enabled or not
+    """
+
+    def __init__(self):
+        class Track(Record):
+            title = text_type
+            number = nonnegative(int)
+            genre = one_of('rock', 'jazz', 'folk', nullable=True)
+            rating = nullable(nonnegative(float))
+            released = nullable(date)
+            explicit = Field(bool, coerce=bool)
+        self.Track = Track
+        # A three-level hierarchy, whose constructor is flattened when optimized
+        class Media(Record):
+            title = text_type
+        class Recording(Media, Record):
+            seconds = nonnegative(int)
+        class LiveRecording(Recording, Record):
+            venue = nullable(text_type)
+        self.LiveRecording = LiveRecording
+        class Album(Record):
+            title = text_type
+            year = nonnegative(int)
+            tracks = seq_of(Track)
+            tags = seq_of(text_type)
+        self.Album = Album
+        self.TrackSeq = seq_of(self.Track).type
+        self.Ratings = seq_of(nullable(nonnegative(int))).type
+        self.WordCounts = dict_of(text_type, nonnegative(int)).type
+
+def _compile_classes(variant):
+    if variant == 'optimized':
+        return Classes()
+    with unoptimized():
+        return Classes()
+
+CLASSES = {variant: _compile_classes(variant) for variant in VARIANTS}
+
+def _track_kwargs(number):
+    return {
+        'title': 'Track %d' % number,
+        'number': number,
+        'genre': 'jazz',
+        'rating': 4.5,
+        'released': date(2020, 1, number % 28 + 1),
+        'explicit': 0,
+    }
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+def bench_record_init(variant):
+    Track = CLASSES[variant].Track
+    kwargs = _track_kwargs(1)
+    return lambda: Track(**kwargs)
+
+def bench_subclass_init(variant):
+    LiveRecording = CLASSES[variant].LiveRecording
+    return lambda: LiveRecording(title='Live', seconds=180, venue='Hall')
+
+def bench_record_derive(variant):
+    classes = CLASSES[variant]
+    album = classes.Album(
+        title='Album',
+        year=2020,
+        tracks=[classes.Track(**_track_kwargs(number)) for number in range(1, 21)],
+        tags=['jazz', 'live'],
+    )
+    return lambda: album.record_derive(year=2021)
+
+def bench_record_update(variant):
+    classes = CLASSES[variant]
+    album = classes.Album(
+        title='Album',
+        year=2020,
+        tracks=[classes.Track(**_track_kwargs(number)) for number in range(1, 21)],
+        tags=['jazz', 'live'],
+    )
+    return lambda: album.record_update('tracks[3].title', 'Moment')
+
+def bench_seq_check_elems(variant):
+    Ratings = CLASSES[variant].Ratings
+    ratings = [None if i % 10 == 0 else i for i in range(1000)]
+    return lambda: Ratings(ratings)
+
+def bench_dict_check_elems(variant):
+    WordCounts = CLASSES[variant].WordCounts
+    counts = {'word%d' % i: i for i in range(1000)}
+    return lambda: WordCounts(counts)
+
+def bench_record_pods(variant):
+    track = CLASSES[variant].Track(**_track_kwargs(1))
+    return track.record_pods
+
+def bench_from_pods(variant):
+    Track = CLASSES[variant].Track
+    pods = Track(**_track_kwargs(1)).record_pods()
+    return lambda: Track.from_pods(pods)
+
+def bench_fused_from_pods(variant):
+    classes = CLASSES[variant]
+    pods = classes.TrackSeq(classes.Track(**_track_kwargs(number)) for number in range(100)).record_pods(profile='native')
+    if variant == 'optimized':
+        decode = fused_from_pods(classes.TrackSeq, profile='native')
+    else:
+        with unoptimized():
+            decode = fused_from_pods(classes.TrackSeq, profile='native')
+    return lambda: decode(pods)
+
+for _variant in VARIANTS:
+    benchmark('record_init/%s' % _variant, _variant)(bench_record_init)
+    benchmark('subclass_init/3_levels/%s' % _variant, _variant)(bench_subclass_init)
+    benchmark('record_derive/%s' % _variant, _variant)(bench_record_derive)
+    benchmark('record_update/%s' % _variant, _variant)(bench_record_update)
+    benchmark('seq_check_elems/1000/%s' % _variant, _variant)(bench_seq_check_elems)
+    benchmark('dict_check_elems/1000/%s' % _variant, _variant)(bench_dict_check_elems)
+    benchmark('record_pods/%s' % _variant, _variant)(bench_record_pods)
+    benchmark('from_pods/%s' % _variant, _variant)(bench_from_pods)
+    benchmark('fused_from_pods/100/%s' % _variant, _variant)(bench_fused_from_pods)
+
+#----------------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from functools import partial
+from timeit import default_timer
+
+# tdds
+from tdds.utils.codegen import record_phase_timings
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class SkipBenchmark(Exception):
+    """
+    Raised by a benchmark's setup function when the thing it measures isn't available, e.g. dataclasses under Python 2
+    """
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+def build_benchmark_registry():
+    """
+    Like `build_test_registry' in the tests. Each registered function is a setup function: it's called once, and returns the
+    function to be timed, which takes no arguments.
+    """
+    all_benchmarks = []
+    def benchmark(benchmark_id, *args, **kwargs):
+        def register_benchmark_func(func):
+            if any(prev_benchmark_id == benchmark_id for prev_benchmark_id, prev_func in all_benchmarks):
+                raise ValueError("Two benchmarks with id '%s'" % benchmark_id)
+            all_benchmarks.append((benchmark_id, partial(func, *args, **kwargs)))
+            return func
+        return register_benchmark_func
+    return all_benchmarks, benchmark
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+def measure(func, min_seconds=0.2, repeat=5):
+    """
+    Times `func', as the best of `repeat' runs, each of which calls `func' enough times to last at least `min_seconds'. Returns the
+    number of seconds per call, and a dict of the time per call spent in each code generation phase, see `record_phase_timings'.
+    """
+    number = 1
+    while True:
+        seconds, phase_timings = _time_calls(func, number)
+        if seconds >= min_seconds:
+            break
+        number *= 10 if seconds < min_seconds / 10 else 2
+    best = seconds, phase_timings
+    for _ in range(repeat - 1):
+        best = min(best, _time_calls(func, number), key=lambda result: result[0])
+    seconds, phase_timings = best
+    return seconds / number, {phase: phase_seconds / number for phase, phase_seconds in phase_timings.items()}
+
+def _time_calls(func, number):
+    with record_phase_timings() as phase_timings:
+        start = default_timer()
+        for _ in range(number):
+            func()
+        seconds = default_timer() - start
+    return seconds, phase_timings
+
+#----------------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Runs the benchmarks, e.g.:
+
+    python -m benchmarks.run                                  # run and print all benchmarks
+    python -m benchmarks.run core                             # only the benchmarks in core_benchmarks.py
+    python -m benchmarks.run --save baseline.json             # save the results
+    python -m benchmarks.run --compare baseline.json          # fail if anything is more than 25% slower than in baseline.json
+    python -m benchmarks.run --compare baseline.json --threshold 1.5
+
+The timings depend on the machine, so a baseline should only be compared against results from the same machine.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from argparse import ArgumentParser
+import io
+import json
+import platform
+import re
+from sys import exit
+
+# this module
+from . import (
+    classdef_benchmarks,
+    core_benchmarks,
+    optimization_benchmarks,
+)
+from .plumbing import SkipBenchmark, measure
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+ALL_BENCHMARK_MODS = (
+    classdef_benchmarks,
+    core_benchmarks,
+    optimization_benchmarks,
+)
+
+DEFAULT_THRESHOLD = 1.25
+
+def iter_all_benchmarks(selected_mod_name, selected_id_regex):
+    mod_name = lambda mod: re.sub(r'.+\.', '', re.sub(r'_benchmarks$', '', mod.__name__))
+    found = False
+    for mod in ALL_BENCHMARK_MODS:
+        if selected_mod_name in (None, mod_name(mod)):
+            found = True
+            for benchmark_id, setup_func in mod.ALL_BENCHMARKS:
+                if selected_id_regex is None or re.search(selected_id_regex, benchmark_id):
+                    yield benchmark_id, setup_func
+    if selected_mod_name and not found:
+        raise Exception("Module '%s' not found. Available modules:\n%s" % (
+            selected_mod_name,
+            ''.join(
+                '\n\t%s' % mod_name(mod)
+                for mod in ALL_BENCHMARK_MODS
+            ),
+        ))
+
+def load_results(file_path):
+    with io.open(file_path, 'rt', encoding='UTF-8') as file_in:
+        return json.load(file_in)['results']
+
+def save_results(file_path, results):
+    data = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'results': results,
+    }
+    with io.open(file_path, 'wt', encoding='UTF-8') as file_out:
+        file_out.write(json.dumps(data, indent=4, sort_keys=True))
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = ArgumentParser(description='Runs the tdds benchmarks')
+    parser.add_argument('module', nargs='?', help='only run the benchmarks in this module')
+    parser.add_argument('--filter', help='only run the benchmarks whose id matches this regex')
+    parser.add_argument('--save', metavar='FILE', help='save the results as JSON to this file')
+    parser.add_argument('--compare', metavar='FILE', help='compare the results to the ones saved in this file')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help='when comparing, fail if a benchmark is slower by more than this factor (default: %(default)s)',
+    )
+    parser.add_argument('--min-seconds', type=float, default=0.2, help='minimum duration of each timing run')
+    args = parser.parse_args(argv)
+    baseline = load_results(args.compare) if args.compare else {}
+
+    def format_result(result_id, seconds):
+        line = ' {:12.3f} us'.format(seconds * 1e6)
+        if baseline.get(result_id):
+            ratio = seconds / baseline[result_id]
+            line += '  {:6.2f}x'.format(ratio)
+            if ratio > args.threshold:
+                line += '  SLOWER'
+        return line
+
+    results = {}
+    regressions = []
+    all_benchmarks = tuple(iter_all_benchmarks(args.module, args.filter))
+    benchmark_id_fmt = '{{:.<{width}}}'.format(width=3 + max(len(benchmark_id) for benchmark_id, setup_func in all_benchmarks))
+    for benchmark_id, setup_func in all_benchmarks:
+        print(benchmark_id_fmt.format(benchmark_id + ' '), end='')
+        try:
+            func = setup_func()
+        except SkipBenchmark as skip:
+            print(' skipped: %s' % skip)
+            continue
+        seconds, phase_timings = measure(func, min_seconds=args.min_seconds)
+        print(format_result(benchmark_id, seconds))
+        timings = [(benchmark_id, seconds)]
+        if any(phase_timings.values()):
+            # The benchmark compiled some code. Show how much of the time was spent on each phase.
+            for phase, phase_seconds in sorted(phase_timings.items()):
+                phase_id = '%s/%s' % (benchmark_id, phase)
+                print(benchmark_id_fmt.format('    ' + phase + ' ') + format_result(phase_id, phase_seconds))
+                timings.append((phase_id, phase_seconds))
+        for result_id, result_seconds in timings:
+            results[result_id] = result_seconds
+            if baseline.get(result_id) and result_seconds / baseline[result_id] > args.threshold:
+                regressions.append(result_id)
+
+    if args.save:
+        save_results(args.save, results)
+    if regressions:
+        print()
+        print('%d benchmark(s) slower than the baseline by more than %.2fx:' % (len(regressions), args.threshold))
+        for benchmark_id in regressions:
+            print('    %s' % benchmark_id)
+    exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
+
+#----------------------------------------------------------------------------------------------------------------------------------
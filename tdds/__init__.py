@@ -3,6 +3,9 @@
 
 #----------------------------------------------------------------------------------------------------------------------------------
 
+# standards
+import sys
+
 from .basics import \
     Field, \
     FieldError, FieldValueError, FieldTypeError, FieldNotNullable, RecordsAreImmutable, \
@@ -12,26 +15,28 @@ from .record import \
     Record
 
 from .pods import \
-    CannotBeSerializedToPods
+    CannotBeSerializedToPods, PodsProfile, \
+    register_pods_profile
 
 from .shortcuts import \
     one_of, nullable, \
     nonempty, nonnegative, strictly_positive, \
     uppercase_letters, uppercase_wchars, uppercase_hex, lowercase_letters, lowercase_wchars, lowercase_hex, digits_str, \
-    absolute_http_url
-
-from .cleaner import \
-    Cleaner
-
-from .collections import \
-    dict_of, pair_of, seq_of, set_of
+    absolute_http_url, \
+    check_many
 
 from .marshaller import \
-    CannotMarshalType, Marshaller, \
+    CannotMarshalType, Marshaller, MarshallerRegistry, \
     register_marshaller, unregister_marshaller, temporary_marshaller_registration
 
-from .utils.builder import \
-    builder
+from .validation import \
+    validation
+
+from .dedupe import \
+    dedupe
+
+from .paths import \
+    InvalidPath
 
 from .utils.codegen import \
     SourceCodeTemplate
@@ -39,4 +44,75 @@ from .utils.codegen import \
 from .utils.immutabledict import \
     ImmutableDict
 
+from .utils.compatibility import \
+    PY2
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# lazy exports
+
+# These are only imported when first accessed, so that a program that only defines a few records doesn't pay for importing them
+# (async_builder, in particular, imports asyncio).
+LAZY_EXPORTS = {
+    'Cleaner': '.cleaner',
+    'dict_of': '.collections',
+    'pair_of': '.collections',
+    'seq_of': '.collections',
+    'set_of': '.collections',
+    'fused_from_pods': '.fused',
+    'builder': '.utils.builder',
+}
+
+if not PY2:
+    LAZY_EXPORTS['async_builder'] = '.utils.async_builder'
+
+def _import_lazy_export(name):
+    from importlib import import_module
+    value = getattr(import_module(LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+# NB `from tdds import *' imports the lazy exports too
+__all__ = [
+    'Field',
+    'FieldError', 'FieldValueError', 'FieldTypeError', 'FieldNotNullable', 'RecordsAreImmutable',
+    'RecursiveType',
+    'Record',
+    'CannotBeSerializedToPods', 'PodsProfile',
+    'register_pods_profile',
+    'one_of', 'nullable',
+    'nonempty', 'nonnegative', 'strictly_positive',
+    'uppercase_letters', 'uppercase_wchars', 'uppercase_hex',
+    'lowercase_letters', 'lowercase_wchars', 'lowercase_hex',
+    'digits_str',
+    'absolute_http_url',
+    'check_many',
+    'CannotMarshalType', 'Marshaller', 'MarshallerRegistry',
+    'register_marshaller', 'unregister_marshaller', 'temporary_marshaller_registration',
+    'validation',
+    'dedupe',
+    'InvalidPath',
+    'SourceCodeTemplate',
+    'ImmutableDict',
+    'Cleaner',
+    'dict_of', 'pair_of', 'seq_of', 'set_of',
+    'fused_from_pods',
+    'builder',
+]
+if not PY2:
+    __all__.append('async_builder')
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name not in LAZY_EXPORTS:
+            raise AttributeError('module %r has no attribute %r' % (__name__, name))
+        return _import_lazy_export(name)
+
+    def __dir__():
+        return sorted(set(globals()) | set(LAZY_EXPORTS))
+
+else:
+    # PEP 562 module `__getattr__' isn't available, so we import everything now
+    for _name in LAZY_EXPORTS:
+        _import_lazy_export(_name)
+
 #----------------------------------------------------------------------------------------------------------------------------------
@@ -7,12 +7,18 @@
 # 2+3 compat
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+# this module
+from .utils.codegen import SourceCodeTemplate
+
 #----------------------------------------------------------------------------------------------------------------------------------
 # core data structures
 
 class Field(object):
 
     def __init__(self, type, nullable=False, default=None, coerce=None, check=None, subfields=()):
+        if isinstance(check, (list, tuple)):
+            # Several checks, which must all pass. Stored as a tuple since fields are immutable.
+            check = tuple(check) or None
         object.__setattr__(self, 'type', type)
         object.__setattr__(self, 'nullable', nullable)
         object.__setattr__(self, 'default', default)
@@ -78,6 +84,34 @@ class FieldNotNullable(FieldValueError):
 class RecursiveType(object):
     pass
 
+#----------------------------------------------------------------------------------------------------------------------------------
+# A value check that restricts the value to a fixed set, as created by `one_of'. This is a check rather than an attribute of the
+# field so that it survives `Field.derive'. The check is compiled to an inline `in' test against the frozenset of possible values.
+
+class EnumCheck(SourceCodeTemplate):
+
+    template = '{} in $possible_values'
+
+    def __init__(self, values):
+        super(EnumCheck, self).__init__()
+        # NB `values' keeps the order in which the values were given, which gives each value its ordinal, see `PodsProfile'
+        unique_values = []
+        for value in values:
+            if value not in unique_values:
+                unique_values.append(value)
+        self.values = tuple(unique_values)
+        self.possible_values = frozenset(unique_values)
+
+def field_enum_check(field):
+    """
+    Returns the EnumCheck among the checks of the given field, if any
+    """
+    checks = field.check if isinstance(field.check, tuple) else (field.check,)
+    for check in checks:
+        if isinstance(check, EnumCheck):
+            return check
+    return None
+
 #----------------------------------------------------------------------------------------------------------------------------------
 
 def compile_field(field, **kwargs):
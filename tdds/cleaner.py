@@ -10,8 +10,16 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 # standards
 from decimal import Decimal
 import re
+from threading import RLock
+
+# optional dependencies
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # pylint: disable=invalid-name
 
 # this repo
+from .utils.codegen import ExternalValue, Joiner, SourceCodeTemplate, compile_template
 from .utils.compatibility import bytes_type, text_type
 from .utils.immutabledict import ImmutableDict
 
@@ -20,6 +28,8 @@ from .utils.immutabledict import ImmutableDict
 class Cleaner(object):
 
     def clean(self, record_class, values, prefix=''):
+        if self._is_compilable():
+            return compiled_cleaner(self.__class__, record_class, prefix).clean(self, values, prefix)
         values = dict(values)
         return {
             field_id: self._clean_field(
@@ -31,6 +41,45 @@ class Cleaner(object):
             for field_id, field in record_class.record_fields.items()
         }
 
+    def build(self, record_class, values, prefix=''):
+        """
+        Same as `record_class(**self.clean(record_class, values))', except that the cleaned values are passed directly to the
+        constructor, without being collected in a dict first.
+        """
+        if self._is_compilable():
+            return compiled_cleaner(self.__class__, record_class, prefix).build(self, values, prefix)
+        return record_class(**self.clean(record_class, values, prefix=prefix))
+
+    def clean_many(self, record_class, rows, prefix=''):
+        """
+        Cleans many rows at once. Returns the same as `[self.clean(record_class, row) for row in rows]', but the rows are transposed
+        into columns, and each column is cleaned in one go. Columns of scalars that are cleaned by type (`clean_int' etc) are handed
+        whole to the corresponding `clean_<type>_column' method, which can use vectorized conversions.
+        """
+        if not self._is_compilable():
+            return [self.clean(record_class, row, prefix=prefix) for row in rows]
+        rows = [row if isinstance(row, dict) else dict(row) for row in rows]
+        field_ids = tuple(record_class.record_fields.keys())
+        if not field_ids:
+            return [{} for _row_unused in rows]
+        columns = compiled_cleaner(self.__class__, record_class, prefix).clean_columns(
+            self,
+            [[row.get(field_id) for row in rows] for field_id in field_ids],
+            prefix,
+        )
+        return [dict(zip(field_ids, values)) for values in zip(*columns)]
+
+    def _is_compilable(self):
+        # Subclasses that override `clean' or the reflection-based methods below get the reflection-based implementation, as do
+        # instances with `clean_*' attributes of their own, since compiled cleaners only look up methods on the class
+        cls = self.__class__
+        return (
+            cls.clean is Cleaner.clean
+            and cls._clean_field is Cleaner._clean_field
+            and cls._cleaner_by_type is Cleaner._cleaner_by_type
+            and not any(attr.startswith('clean_') for attr in getattr(self, '__dict__', ()))
+        )
+
     def _clean_field(self, field_id, field, value, prefix=''):
         if value is None:
             return None
@@ -70,17 +119,7 @@ class Cleaner(object):
         return cleaned
 
     def _cleaner_by_type(self, field):
-        type_name = {
-            text_type: 'text',
-            bytes_type: 'bytes',
-        }.get(field.type)
-        if type_name is None:
-            type_name = re.sub(
-                r'(?<=[a-z])(?=[A-Z])',
-                '_',
-                field.type.__name__,
-            ).lower()
-        return getattr(self, 'clean_%s' % type_name, None)
+        return getattr(self, 'clean_%s' % _cleaner_type_name(field), None)
 
     def clean_text(self, value):
         if not isinstance(value, text_type):
@@ -104,12 +143,380 @@ class Cleaner(object):
 
     def clean_bool(self, value):
         if not isinstance(value, bool):
-            value = {
-                'true': True,
-                '1': True,
-                'false': False,
-                '0': False,
-            }[self.clean_text(value).lower()]
+            value = BOOL_LITERALS[self.clean_text(value).lower()]
         return value
 
+    # Column methods. These take a list of values, any of which may be None, and return the list of cleaned values. They are only
+    # used by `clean_many' when they're defined in the same class as the per-value method they stand for, or in a subclass thereof,
+    # so that overriding e.g. `clean_int' is enough to have it used for columns too.
+
+    def clean_int_column(self, values):
+        return self._clean_column(values, int, self.clean_int, numpy_dtype='int64')
+
+    def clean_float_column(self, values):
+        return self._clean_column(values, float, self.clean_float, numpy_dtype='float64')
+
+    def clean_decimal_column(self, values):
+        return self._clean_column(values, Decimal, self.clean_decimal)
+
+    def clean_bool_column(self, values):
+        clean_text = self.clean_text
+        return [
+            value if value is None or isinstance(value, bool) else BOOL_LITERALS[clean_text(value).lower()]
+            for value in values
+        ]
+
+    def _clean_column(self, values, value_type, clean_one, numpy_dtype=None):
+        cleaned = list(values)
+        todo = [i for i, value in enumerate(values) if value is not None and not isinstance(value, value_type)]
+        if todo and numpy is not None and numpy_dtype is not None:
+            clean_text = self.clean_text
+            try:
+                converted = numpy.array([clean_text(values[i]) for i in todo], dtype=numpy_dtype).tolist()
+            except (ValueError, TypeError, OverflowError):
+                # fall back on the per-value method, which either deals with the value, or raises the expected exception
+                pass
+            else:
+                for i, value in zip(todo, converted):
+                    cleaned[i] = value
+                return cleaned
+        for i in todo:
+            cleaned[i] = clean_one(values[i])
+        return cleaned
+
+BOOL_LITERALS = {
+    'true': True,
+    '1': True,
+    'false': False,
+    '0': False,
+}
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# Compiled cleaners
+#
+# `Cleaner.clean' above works by reflection on every value it cleans: it formats method names, looks them up with getattr, walks an
+# issubclass chain, etc. All of this only depends on the Cleaner subclass and on the record class, so here we generate code that
+# makes all these decisions once, and then only does the actual cleaning.
+#
+# Method names depend on the prefix, which grows with every level of nested records. In order to compile a finite amount of code
+# for recursive types, when no method on the Cleaner class starts with 'clean_<prefix>', we know that no method looked up by field
+# name can match at that level or below, and so we compile and cache the code for that record class with a prefix of None, which
+# stands for "any such prefix". The actual prefix is always passed at runtime, for the error messages.
+
+COMPILED_CLEANERS = {}
+
+# Holders that are still being compiled. They're made available to nested types while we compile, so that recursive types can
+# refer to them, but they're only moved to COMPILED_CLEANERS, where other threads can see them, once the outermost compilation
+# is done, and so all the holders it created have been filled.
+PENDING_CLEANERS = {}
+
+LOCK = RLock()
+
+class CompiledCleaner(object):
+    """
+    Holds the `clean' and `build' functions compiled for one (Cleaner subclass, record class, prefix) triple. Code for nested
+    records calls the holder of the nested class, which is created before the code is compiled, so that recursive types can refer
+    to it.
+    """
+
+    clean = None
+    build = None
+    clean_columns = None
+
+
+def compiled_cleaner(cleaner_class, record_class, prefix):
+    key = (cleaner_class, record_class, prefix)
+    compiled = COMPILED_CLEANERS.get(key)
+    if compiled is None:
+        with LOCK:
+            compiled = COMPILED_CLEANERS.get(key)
+            if compiled is None:
+                outermost = not PENDING_CLEANERS
+                try:
+                    compiled = _compiled_cleaner(cleaner_class, record_class, prefix)
+                    if outermost:
+                        COMPILED_CLEANERS.update(PENDING_CLEANERS)
+                        # Cached under the original prefix too, so that the next lookup doesn't need to canonicalise it
+                        COMPILED_CLEANERS[key] = compiled
+                finally:
+                    if outermost:
+                        PENDING_CLEANERS.clear()
+    return compiled
+
+
+def _compiled_cleaner(cleaner_class, record_class, prefix):
+    if prefix is not None and not any(attr.startswith('clean_' + prefix) for attr in dir(cleaner_class)):
+        prefix = None
+    key = (cleaner_class, record_class, prefix)
+    compiled = COMPILED_CLEANERS.get(key) or PENDING_CLEANERS.get(key)
+    if compiled is None:
+        compiled = PENDING_CLEANERS[key] = CompiledCleaner()
+        ns_dict = compile_template(
+            CompiledCleanerTemplate(cleaner_class, record_class, prefix),
+            name='{}.{}'.format(cleaner_class.__name__, record_class.__name__),
+        )
+        compiled.clean = ns_dict['clean']
+        compiled.build = ns_dict['build']
+        compiled.clean_columns = ns_dict['clean_columns']
+    return compiled
+
+
+class CleanerName(object):
+    """
+    A method name, or a part thereof, that may or may not start with the runtime prefix
+    """
+
+    def __init__(self, text, prefixed):
+        self.text = text
+        self.prefixed = prefixed
+
+    def __add__(self, suffix):
+        return CleanerName(self.text + suffix, self.prefixed)
+
+    def static_value(self, static_prefix):
+        if not self.prefixed:
+            return self.text
+        elif static_prefix is not None:
+            return static_prefix + self.text
+        # else return None: the name depends on a runtime prefix that we know no method matches
+
+    def runtime_expr(self):
+        if self.prefixed:
+            return 'prefix + {!r}'.format(self.text)
+        else:
+            return repr(self.text)
+
+
+class CompiledCleanerTemplate(SourceCodeTemplate):
+
+    template = '''
+        def clean(self, values, prefix):
+            $clean_stmts
+            return {$cleaned_dict_items}
+
+        def build(self, values, prefix):
+            $build_stmts
+            return $record_class($build_kwargs)
+
+        def clean_columns(self, columns, prefix):
+            return [$column_values]
+
+        $column_functions
+
+        $helpers
+    '''
+
+    def __init__(self, cleaner_class, record_class, prefix):
+        super(CompiledCleanerTemplate, self).__init__()
+        self.cleaner_class = cleaner_class
+        self.record_class = record_class
+        self.static_prefix = prefix
+        self.helper_defs = []
+        self.field_ids = tuple(record_class.record_fields.keys())
+        # In `build' mode, nested records are built rather than cleaned into dicts
+        self.clean_stmts, self.build_stmts = (
+            Joiner('\n', 'if not isinstance(values, dict):\n    values = dict(values)\n', values=tuple(
+                self._record_field_stmts(mode, field_id, field)
+                for field_id, field in record_class.record_fields.items()
+            ))
+            for mode in ('clean', 'build')
+        )
+
+    @property
+    def column_values(self):
+        return ', '.join('column_{0}(self, columns[{0}], prefix)'.format(i) for i in range(len(self.field_ids)))
+
+    @property
+    def column_functions(self):
+        return Joiner('\n\n', values=tuple(
+            self._column_function(i, field_id, field)
+            for i, (field_id, field) in enumerate(self.record_class.record_fields.items())
+        ))
+
+    def _column_function(self, index, field_id, field):
+        column_method_name = self._column_method_name(field_id, field)
+        if column_method_name is not None:
+            body = 'return self.{}(column)'.format(column_method_name)
+        else:
+            body = SourceCodeTemplate(
+                '''
+                    cleaned = []
+                    append = cleaned.append
+                    for $variable_name in column:
+                        if $variable_name is not None:
+                            $value_stmts
+                        append($variable_name)
+                    return cleaned
+                ''',
+                variable_name='f_{}'.format(field_id),
+                value_stmts=self._value_stmts(
+                    'clean',
+                    CleanerName('', prefixed=True),
+                    CleanerName(field_id, prefixed=False),
+                    field,
+                    'f_{}'.format(field_id),
+                ) or 'pass',
+            )
+        return SourceCodeTemplate(
+            '''
+                def column_$index(self, column, prefix):
+                    $body
+            ''',
+            index=str(index),
+            body=body,
+        )
+
+    def _column_method_name(self, field_id, field):
+        ftype = field.type
+        if self._method_name(CleanerName(field_id, prefixed=True)) is not None \
+                or hasattr(ftype, 'element_field') \
+                or hasattr(ftype, 'key_field') \
+                or hasattr(ftype, 'record_fields'):
+            return None
+        type_method_name = self._type_method_name(field)
+        if type_method_name is None:
+            return None
+        column_method_name = type_method_name + '_column'
+        if hasattr(self.cleaner_class, column_method_name) and all(
+                _mro_level(self.cleaner_class, column_method_name) <= _mro_level(self.cleaner_class, method_name)
+                for method_name in (type_method_name, 'clean_text')
+                if hasattr(self.cleaner_class, method_name)
+        ):
+            return column_method_name
+
+    @property
+    def helpers(self):
+        return Joiner('\n\n', values=self.helper_defs)
+
+    @property
+    def cleaned_dict_items(self):
+        return ', '.join('{!r}: f_{}'.format(field_id, field_id) for field_id in self.field_ids)
+
+    @property
+    def build_kwargs(self):
+        return ', '.join('{0}=f_{0}'.format(field_id) for field_id in self.field_ids)
+
+    def _record_field_stmts(self, mode, field_id, field):
+        variable_name = 'f_{}'.format(field_id)
+        value_stmts = self._value_stmts(
+            mode,
+            CleanerName('', prefixed=True),
+            CleanerName(field_id, prefixed=False),
+            field,
+            variable_name,
+        )
+        if value_stmts is None:
+            return '{} = values.get({!r})'.format(variable_name, field_id)
+        return SourceCodeTemplate(
+            '''
+                $variable_name = values.get($key)
+                if $variable_name is not None:
+                    $value_stmts
+            ''',
+            variable_name=variable_name,
+            key=repr(field_id),
+            value_stmts=value_stmts,
+        )
+
+    def _method_name(self, name):
+        name_str = name.static_value(self.static_prefix)
+        if name_str is not None and hasattr(self.cleaner_class, 'clean_' + name_str):
+            return 'clean_' + name_str
+
+    def _value_stmts(self, mode, prefix, field_id, field, variable_name):
+        """
+        Returns the statements that clean the value held in `variable_name', which is known not to be None, mirroring what
+        `Cleaner._clean_field' does. Returns None if there's nothing to do.
+        """
+        full_name = CleanerName(prefix.text + field_id.text, prefix.prefixed or field_id.prefixed)
+        method_name = self._method_name(full_name)
+        ftype = field.type
+        if method_name is not None:
+            return '{0} = self.{1}({0})'.format(variable_name, method_name)
+        elif issubclass(ftype, (tuple, frozenset)) and hasattr(ftype, 'element_field'):
+            helper_name = self._helper(mode, full_name + '_element', ftype.element_field)
+            return '{0} = {1}([{2}(self, elem, prefix) for elem in {0}])'.format(
+                variable_name,
+                'tuple' if issubclass(ftype, tuple) else 'frozenset',
+                helper_name,
+            )
+        elif issubclass(ftype, ImmutableDict) and hasattr(ftype, 'key_field') and hasattr(ftype, 'value_field'):
+            # NB keys and values are looked up by field id, without the prefix, like in `Cleaner._clean_field'
+            return '{0} = {{{1}(self, key, prefix): {2}(self, value, prefix) for key, value in {0}.items()}}'.format(
+                variable_name,
+                self._helper(mode, field_id + '_key', ftype.key_field),
+                self._helper(mode, field_id + '_value', ftype.value_field),
+            )
+        else:
+            type_method_name = self._type_method_name(field)
+            type_stmt = (
+                '{0} = self.{1}({0})'.format(variable_name, type_method_name)
+                if type_method_name is not None
+                else 'pass'
+            )
+            if not hasattr(ftype, 'record_fields'):
+                return type_stmt if type_method_name is not None else None
+            nested_prefix = full_name + '_'
+            nested_static_prefix = nested_prefix.static_value(self.static_prefix)
+            return SourceCodeTemplate(
+                '''
+                    if isinstance($variable_name, dict):
+                        try:
+                            $variable_name = $nested.$mode(self, $variable_name, $nested_prefix)
+                        except Exception:
+                            raise ValueError("Couldn't clean '%s'" % ($full_name,))
+                    else:
+                        $type_stmt
+                ''',
+                variable_name=variable_name,
+                nested=ExternalValue(_compiled_cleaner(self.cleaner_class, ftype, nested_static_prefix)),
+                mode=mode,
+                nested_prefix=nested_prefix.runtime_expr(),
+                full_name=full_name.runtime_expr(),
+                type_stmt=type_stmt,
+            )
+
+    def _type_method_name(self, field):
+        method_name = 'clean_%s' % _cleaner_type_name(field)
+        if hasattr(self.cleaner_class, method_name):
+            return method_name
+
+    def _helper(self, mode, field_id, field):
+        # Elements of collections are cleaned by a separate function, since cleaning them may take several statements
+        helper_name = '{}_elem_{}'.format(mode, len(self.helper_defs))
+        value_stmts = self._value_stmts(mode, CleanerName('', prefixed=False), field_id, field, 'value')
+        self.helper_defs.append(SourceCodeTemplate(
+            '''
+                def $helper_name(self, value, prefix):
+                    if value is not None:
+                        $value_stmts
+                    return value
+            ''',
+            helper_name=helper_name,
+            value_stmts=value_stmts or 'pass',
+        ))
+        return helper_name
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# private utils
+
+def _mro_level(cls, attr):
+    # How far up the MRO `attr' is defined. 0 means it's defined on `cls' itself.
+    for level, klass in enumerate(cls.__mro__):
+        if attr in vars(klass):
+            return level
+
+def _cleaner_type_name(field):
+    type_name = {
+        text_type: 'text',
+        bytes_type: 'bytes',
+    }.get(field.type)
+    if type_name is None:
+        type_name = re.sub(
+            r'(?<=[a-z])(?=[A-Z])',
+            '_',
+            field.type.__name__,
+        ).lower()
+    return type_name
+
 #----------------------------------------------------------------------------------------------------------------------------------
@@ -33,6 +33,8 @@ class CollectionTypeCodeTemplate(SourceCodeTemplate):
             def check_elems(iter_elems):
                 $check_elems_body
 
+            $replace_method
+
             $pods_methods
 
             $core_methods
@@ -55,6 +57,7 @@ class SequenceCollCodeTemplate(CollectionTypeCodeTemplate):
     superclass = tuple
     constructor = '__new__'
     class_name_suffix = 'Seq'
+    fixed_length = None
 
     def __init__(self, element_field):
         super(SequenceCollCodeTemplate, self).__init__()
@@ -66,8 +69,12 @@ class SequenceCollCodeTemplate(CollectionTypeCodeTemplate):
             description='[elem]',
         )
         self.class_fields = SourceCodeTemplate(
-            'element_field = $element_field',
+            '''
+            element_field = $element_field
+            fixed_length = $fixed_length
+            ''',
             element_field=element_field,
+            fixed_length=repr(self.fixed_length),
         )
 
     check_elems_body = '''
@@ -76,9 +83,20 @@ class SequenceCollCodeTemplate(CollectionTypeCodeTemplate):
             yield elem
     '''
 
+    # Used by `record_update'. Only the new elements are checked, the others are copied over as they are.
+    replace_method = '''
+        def record_replace(self, changes):
+            elems = list(self)
+            for index, elem in changes.items():
+                $elem_check_impl
+                elems[index] = elem
+            return $superclass.__new__($class_name, elems)
+    '''
+
 class PairCollCodeTemplate(SequenceCollCodeTemplate):
     FieldValueError = FieldValueError
     class_name_suffix = 'Pair'
+    fixed_length = 2
     check_elems_body = '''
         num_elems = 0
         for i, elem in enumerate(iter_elems):
@@ -94,6 +112,8 @@ class PairCollCodeTemplate(SequenceCollCodeTemplate):
 class SetCollCodeTemplate(SequenceCollCodeTemplate):
     superclass = frozenset
     class_name_suffix = 'Set'
+    # Set elements can't be addressed by a path
+    replace_method = None
     core_methods = '''
         def __cmp__(self, other):
             return cmp(sorted(self), sorted(other))
@@ -128,6 +148,18 @@ class DictCollCodeTemplate(CollectionTypeCodeTemplate):
             yield key, value
     '''
 
+    replace_method = '''
+        def record_replace(self, changes):
+            elems = dict(self.items())
+            for key, value in changes.items():
+                $key_handling_stmts
+                $val_handling_stmts
+                elems[key] = value
+            replaced = $superclass.__new__($class_name)
+            $superclass.__init__(replaced, elems)
+            return replaced
+    '''
+
 #----------------------------------------------------------------------------------------------------------------------------------
 
 def compile_collection_field(templ, **kwargs):
@@ -135,7 +167,10 @@ def compile_collection_field(templ, **kwargs):
     collection = compile_expr(templ, templ.class_name, verbose=verbose)
     user_supplied_coerce = kwargs.pop('coerce', None)
     if user_supplied_coerce is None:
-        kwargs['coerce'] = lambda elems: collection(elems) if elems is not None else None
+        # NB an instance of the collection is already checked, and immutable, so it's kept as it is
+        kwargs['coerce'] = lambda elems: elems if elems is None or elems.__class__ is collection else collection(elems)
+        # This lets code generators recognise that the field's coerce does nothing more than build the collection from its elems
+        collection.default_coerce = staticmethod(kwargs['coerce'])
     else:
         kwargs['coerce'] = lambda elems: collection(user_supplied_coerce(elems))
     return Field(collection, **kwargs)
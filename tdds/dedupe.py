@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Deduplication of the values decoded within one batch.
+
+A PODS decoded by `from_pods' typically repeats the same sub-documents many times, e.g. the same track listed in many playlists,
+and each copy is decoded into a separate object. Within a `dedupe' block, equal strings, records and collections decoded by
+`from_pods' are instead shared: the first one decoded is kept in a table, and returned again for every equal value decoded after
+it. The same goes for records loaded by `pickle'. The table is dropped at the end of the block.
+
+    with tdds.dedupe():
+        playlists = [Playlist.from_pods(pods) for pods in all_pods]
+
+    playlist = Playlist.from_pods(pods, dedupe=True)
+
+Unlike interned record classes (see `__intern'), this keeps no state once the block is done, and applies to any record class. The
+table is specific to each thread. Fused decoders don't deduplicate.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from threading import local
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class DedupeTable(dict):
+    """
+    Maps each value decoded so far to itself. The keys include the value's type, so that e.g. two records of different classes
+    that have equal fields are kept apart.
+    """
+
+    def value(self, value):
+        if value is None:
+            return None
+        return self.setdefault((value.__class__, value), value)
+
+    def collection(self, cls, elems):
+        if elems is None:
+            return None
+        return self.value(cls(elems))
+
+
+class DedupeState(local):
+    # The table of the innermost `dedupe' block of the current thread, if any. Read by the generated `from_pods' methods.
+    table = None
+
+DEDUPE_STATE = DedupeState()
+
+
+class DedupeBlock(object):
+
+    def __init__(self):
+        self.previous_table = None
+
+    def __enter__(self):
+        self.previous_table = DEDUPE_STATE.table
+        if self.previous_table is None:
+            DEDUPE_STATE.table = DedupeTable()
+        # else this block is nested in another, and we keep using its table
+
+    def __exit__(self, *exc_info):
+        DEDUPE_STATE.table = self.previous_table
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# public interface
+
+def dedupe():
+    """
+    Returns a context manager within which decoded values are deduplicated, see the module docstring
+    """
+    return DedupeBlock()
+
+#----------------------------------------------------------------------------------------------------------------------------------
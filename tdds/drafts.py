@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Drafts are mutable twins of record classes, for building a record one field at a time:
+
+    draft = Album.draft(title='Kind of Blue')
+    draft.year = 1959
+    draft.tracks.append(Track(title='So What'))
+    album = draft.freeze()
+
+A draft has the same fields as its record class, as plain slots, so setting them doesn't run any checks. Collection fields hold a
+list, set or dict, which is empty to start with unless the field is nullable. `freeze' builds the record, so all checks run then,
+once. Fields and collection elements that hold drafts of nested records are frozen too.
+
+The draft class of each record class is generated the first time it's used. If a record has a field called `draft' or `freeze',
+or defines `draft' itself, the methods are still available as `record_draft' and `record_freeze'. A draft's `record_class'
+attribute is its record class, unless the record has a field of that name.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# this module
+from .utils.codegen import Joiner, SourceCodeTemplate, compile_expr
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class RecordDraft(object):
+    """
+    The superclass of all draft classes
+    """
+    __slots__ = ()
+
+
+def freeze_elem(elem):
+    if isinstance(elem, RecordDraft):
+        return elem.record_freeze()
+    return elem
+
+
+class DraftClassTemplate(SourceCodeTemplate):
+
+    template = '''
+        class $class_name($RecordDraft):
+            __slots__ = $slots
+
+            $record_class_attr
+
+            def __init__(self, $init_params):
+                $init_fields
+
+            def record_freeze(self):
+                $freeze_fields
+                return $record_class($record_kwargs)
+
+            $freeze_alias
+
+            def __repr__(self):
+                return "$class_name($repr_str)" % $values_as_tuple
+    '''
+
+    RecordDraft = RecordDraft
+    freeze_elem = staticmethod(freeze_elem)
+
+    def __init__(self, record_class):
+        super(DraftClassTemplate, self).__init__()
+        self.record_class = record_class
+        self.class_name = 'Draft' + record_class.__name__
+        self.fields = sorted(record_class.record_fields.items())
+
+    @property
+    def slots(self):
+        # NB trailing comma to ensure single value still a tuple
+        return Joiner('', '(', ')', tuple('{!r},'.format(field_id) for field_id, _ in self.fields))
+
+    @property
+    def init_params(self):
+        return Joiner(', ', values=tuple('{}=None'.format(field_id) for field_id, _ in self.fields))
+
+    @property
+    def init_fields(self):
+        return Joiner('\n', values=tuple(
+            SourceCodeTemplate(
+                'self.$field_id = $value',
+                field_id=field_id,
+                value=self._initial_value(field_id, field),
+            )
+            for field_id, field in self.fields
+        ))
+
+    @staticmethod
+    def _initial_value(field_id, field):
+        container = draft_container(field.type)
+        if container is None:
+            return field_id
+        elif field.nullable:
+            return '{0} if {0} is None else {1}({0})'.format(field_id, container.__name__)
+        else:
+            return '{1}() if {0} is None else {1}({0})'.format(field_id, container.__name__)
+
+    @property
+    def freeze_fields(self):
+        return Joiner('\n', values=tuple(
+            self._freeze_field(field_id, field)
+            for field_id, field in self.fields
+        ))
+
+    @staticmethod
+    def _freeze_field(field_id, field):
+        if is_record_type(field.type):
+            return '''
+                {0} = self.{0}
+                if isinstance({0}, $RecordDraft):
+                    {0} = {0}.record_freeze()
+            '''.format(field_id)
+        elif is_record_type(collection_element_type(field.type)):
+            if hasattr(field.type, 'key_field'):
+                freeze_elems = '{{key: $freeze_elem(value) for key, value in {0}.items()}}'
+            else:
+                freeze_elems = 'list(map($freeze_elem, {0}))'
+            return '''
+                {0} = self.{0}
+                if {0} is not None:
+                    {0} = {1}
+            '''.format(field_id, freeze_elems.format(field_id))
+        else:
+            return '{0} = self.{0}'.format(field_id)
+
+    @property
+    def record_kwargs(self):
+        return Joiner(', ', values=tuple('{0}={0}'.format(field_id) for field_id, _ in self.fields))
+
+    @property
+    def record_class_attr(self):
+        # A field called `record_class' is a slot of the draft class, so it takes the place of this attribute
+        if 'record_class' not in self.record_class.record_fields:
+            return 'record_class = $record_class'
+
+    @property
+    def freeze_alias(self):
+        if 'freeze' not in self.record_class.record_fields:
+            return 'freeze = record_freeze'
+
+    @property
+    def repr_str(self):
+        return Joiner(', ', values=tuple('{}=%r'.format(field_id) for field_id, _ in self.fields))
+
+    @property
+    def values_as_tuple(self):
+        # NB trailing comma here too, for the same reason
+        return Joiner('', '(', ')', tuple('self.{},'.format(field_id) for field_id, _ in self.fields))
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# types
+
+def is_record_type(cls):
+    return hasattr(cls, 'record_fields')
+
+def draft_container(cls):
+    """
+    The mutable type that stands for the collection type `cls' in a draft, or None if `cls' isn't a collection type
+    """
+    if hasattr(cls, 'key_field'):
+        return dict
+    elif hasattr(cls, 'element_field'):
+        return set if issubclass(cls, frozenset) else list
+    return None
+
+def collection_element_type(cls):
+    if hasattr(cls, 'key_field'):
+        return cls.value_field.type
+    elif hasattr(cls, 'element_field'):
+        return cls.element_field.type
+    return None
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# public interface
+
+def draft_class(record_class):
+    """
+    Returns the draft class of `record_class', compiling it the first time
+    """
+    # NB the class is looked up in the record class's own `__dict__', since a subclass has its own draft class
+    cls = record_class.__dict__.get('record_draft_class')
+    if cls is None:
+        cls = compile_expr(DraftClassTemplate(record_class), 'Draft' + record_class.__name__)
+        type.__setattr__(record_class, 'record_draft_class', cls)
+    return cls
+
+#----------------------------------------------------------------------------------------------------------------------------------
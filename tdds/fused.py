@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Fused decoders: one compiled unit of code that decodes a PODS into a whole tree of records and collections.
+
+The normal `from_pods' path goes through every level of the type tree separately: a record's `from_pods' calls its collection
+field's `from_pods', which builds a plain list, which the record constructor then passes to the collection constructor, which runs
+`check_elems' on every element again. Here instead we generate one decoder function per type reachable from the root class, all
+compiled together so that they call each other directly. Collections are built straight from their decoded elements, and each value
+is validated once, by the decoder that produces it.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from functools import partial
+
+# this module
+from .basics import FieldValueError
+from .pods import DEFAULT_PODS_PROFILE, PODS_PROFILES, PodsMethodsTemplate
+from .record import FieldHandlingStmtsTemplate, InternedRecordMetaClass, canonical_instance
+from .utils.codegen import OPTIMIZE, Joiner, SourceCodeTemplate, compile_template, is_generated_function
+from .utils.immutabledict import ImmutableDict
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class TrustedFieldHandlingStmtsTemplate(FieldHandlingStmtsTemplate):
+    """
+    Field handling statements for a value that was produced by one of our own decoders, and is therefore already known to be of the
+    right type. Only the null and value checks are left.
+    """
+    promote = None
+    coerce = None
+    type_check = None
+
+
+def is_fusable_record_type(cls):
+    # Non-record subclasses of record classes, and records whose class body defines `__init__', may have their own constructors, so
+    # we only bypass the constructors that were generated by RecordMetaClass itself
+    return (
+        isinstance(cls, type)
+        and 'record_fields' in vars(cls)
+        and is_generated_function(vars(cls).get('__init__'))
+    )
+
+def is_fusable_collection_type(cls):
+    return callable(getattr(cls, 'default_coerce', None))
+
+def is_fusable_field(field):
+    if field.default is not None:
+        return False
+    elif is_fusable_record_type(field.type):
+        return field.coerce is None
+    elif is_fusable_collection_type(field.type):
+        return field.coerce is field.type.default_coerce
+    else:
+        return False
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class FusedDecodersTemplate(SourceCodeTemplate):
+
+    template = '''
+        $decoders
+    '''
+
+    def __init__(self, root_cls, profile):
+        super(FusedDecodersTemplate, self).__init__()
+        self.pods_template = PodsMethodsTemplate()
+        self.pods_template.profile = profile
+        self.decoder_names = {}
+        self.decoder_templates = []
+        self.root_decoder_name = self.decoder_name(root_cls)
+
+    @property
+    def decoders(self):
+        return Joiner('\n\n', values=self.decoder_templates)
+
+    def decoder_name(self, cls):
+        name = self.decoder_names.get(cls)
+        if name is None:
+            # NB the name is registered before the template is built, so that recursive types find it
+            name = self.decoder_names[cls] = 'decode_{}_{}'.format(cls.__name__, len(self.decoder_names))
+            if is_fusable_record_type(cls):
+                templ = FusedRecordDecoderTemplate(self, cls, name)
+            elif hasattr(cls, 'key_field'):
+                templ = FusedDictDecoderTemplate(self, cls, name)
+            else:
+                templ = FusedSequenceDecoderTemplate(self, cls, name)
+            self.decoder_templates.append(templ)
+        return name
+
+    def simple_value_expr(self, field, value_expr):
+        """
+        If the value needs no checks other than the ones its own decoder runs, returns an expression for the decoded value, which
+        can then be used within a comprehension. Else returns None.
+        """
+        if is_fusable_field(field) and field.check is None:
+            decoder_call = '{}({})'.format(self.decoder_name(field.type), value_expr)
+            if field.nullable:
+                return 'None if {0} is None else {1}'.format(value_expr, decoder_call)
+            else:
+                # Like with `from_pods', a None here fails inside the decoder rather than with FieldNotNullable
+                return decoder_call
+
+    def value_stmts(self, field, variable_name, value_expr, description):
+        """
+        Statements that set `variable_name' to the decoded and validated value of `value_expr'
+        """
+        if is_fusable_field(field):
+            return SourceCodeTemplate(
+                '''
+                    $variable_name = $value_expr
+                    if $variable_name is not None:
+                        $variable_name = $decoder_name($variable_name)
+                    $field_stmts
+                ''',
+                variable_name=variable_name,
+                value_expr=value_expr,
+                decoder_name=self.decoder_name(field.type),
+                field_stmts=TrustedFieldHandlingStmtsTemplate(field, variable_name, description),
+            )
+        else:
+            value = self.pods_template.pods_to_value(value_expr, field)
+            return SourceCodeTemplate(
+                '''
+                    $assignment
+                    $field_stmts
+                ''',
+                # NB native values of sequences are decoded as `elem = elem', which we leave out
+                assignment=None if OPTIMIZE[0] and value == variable_name else '{} = $value'.format(variable_name),
+                value=value,
+                field_stmts=FieldHandlingStmtsTemplate(field, variable_name, description),
+            )
+
+
+class FusedRecordDecoderTemplate(SourceCodeTemplate):
+
+    template = '''
+        def $decoder_name(pods):
+            $field_stmts
+            obj = $object.__new__($cls)
+            $set_fields
+            return $result
+    '''
+
+    object = object
+    canonical_instance = staticmethod(canonical_instance)
+
+    def __init__(self, parent, cls, decoder_name):
+        super(FusedRecordDecoderTemplate, self).__init__()
+        self.cls = cls
+        self.decoder_name = decoder_name
+        sorted_fields = sorted(cls.record_fields.items())
+        # Field ids are prefixed so that they can't clash with `pods', `obj', or the decoder function names
+        self.field_stmts = Joiner('\n', values=tuple(
+            parent.value_stmts(
+                field,
+                'f_{}'.format(field_id),
+                'pods.get({!r})'.format(field_id),
+                '{}.{}'.format(cls.__name__, field_id),
+            )
+            for field_id, field in sorted_fields
+        ))
+        self.set_fields = Joiner('\n', values=tuple(
+            self._set_field(field_id)
+            for field_id, _field_unused in sorted_fields
+        ))
+
+    @property
+    def result(self):
+        if isinstance(self.cls, InternedRecordMetaClass):
+            # The record's constructor is bypassed, so we do what its metaclass would
+            return '$canonical_instance($cls, obj)'
+        return 'obj'
+
+    def _set_field(self, field_id):
+        if OPTIMIZE[0]:
+            # The slot's own setter, as in RecordClassTemplate.set_fields. Superclass fields have their slot on the superclass,
+            # where `getattr' finds it.
+            return SourceCodeTemplate(
+                '$slot_setter(obj, f_$field_id)',
+                slot_setter=getattr(self.cls, field_id).__set__,
+                field_id=field_id,
+            )
+        return '$object.__setattr__(obj, "{0}", f_{0})'.format(field_id)
+
+
+class FusedSequenceDecoderTemplate(SourceCodeTemplate):
+
+    template = '''
+        def $decoder_name(pods):
+            $build_elems
+            $length_check
+            return $superclass.__new__($cls, elems)
+    '''
+
+    FieldValueError = FieldValueError
+
+    def __init__(self, parent, cls, decoder_name):
+        super(FusedSequenceDecoderTemplate, self).__init__()
+        self.cls = cls
+        self.decoder_name = decoder_name
+        self.superclass = frozenset if issubclass(cls, frozenset) else tuple
+        self.fixed_length = getattr(cls, 'fixed_length', None)
+        self.elem_expr = parent.simple_value_expr(cls.element_field, 'elem')
+        if self.elem_expr is None:
+            self.elem_stmts = parent.value_stmts(cls.element_field, 'elem', 'elem', '[elem]')
+
+    @property
+    def build_elems(self):
+        if self.elem_expr is not None:
+            return 'elems = [$elem_expr for elem in pods]'
+        else:
+            return '''
+                elems = []
+                append = elems.append
+                for elem in pods:
+                    $elem_stmts
+                    append(elem)
+            '''
+
+    @property
+    def length_check(self):
+        if self.fixed_length == 2:
+            # Same error messages as PairCollCodeTemplate.check_elems
+            return '''
+                if len(elems) > 2:
+                    raise $FieldValueError("A pair cannot have more than two elements")
+                elif len(elems) != 2:
+                    raise $FieldValueError("A pair must have two elements, not %d" % len(elems))
+            '''
+
+
+class FusedDictDecoderTemplate(SourceCodeTemplate):
+
+    template = '''
+        def $decoder_name(pods):
+            elems = {}
+            for key, value in pods.items():
+                $key_stmts
+                $value_stmts
+                elems[key] = value
+            obj = $cls.__new__($cls)
+            $ImmutableDict.__init__(obj, elems)
+            return obj
+    '''
+
+    ImmutableDict = ImmutableDict
+
+    def __init__(self, parent, cls, decoder_name):
+        super(FusedDictDecoderTemplate, self).__init__()
+        self.cls = cls
+        self.decoder_name = decoder_name
+        self.key_stmts = parent.value_stmts(cls.key_field, 'key', 'key', '<key>')
+        self.value_stmts = parent.value_stmts(cls.value_field, 'value', 'value', '<value>')
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# public interface
+
+FUSED_DECODERS = {}
+
+def fused_from_pods(cls, profile=None, verbose=False):
+    """
+    Returns a function that takes a PODS and returns an instance of `cls', equivalent to `cls.from_pods', but with the whole type
+    tree under `cls' decoded by a single unit of generated code. The function is compiled on the first call for a given class and
+    profile, and cached.
+    """
+    profile = PODS_PROFILES[profile] if profile is not None else DEFAULT_PODS_PROFILE
+    key = (cls, profile.name)
+    decoder = FUSED_DECODERS.get(key)
+    if decoder is None:
+        if is_fusable_record_type(cls) or is_fusable_collection_type(cls):
+            templ = FusedDecodersTemplate(cls, profile)
+            decoder = compile_template(
+                templ,
+                verbose=verbose,
+                name='{}.fused'.format(cls.__name__),
+            )[templ.root_decoder_name]
+        elif hasattr(cls, 'record_fields'):
+            # A record with a constructor of its own, which we can't bypass
+            decoder = partial(cls.from_pods, profile=profile.name)
+        else:
+            raise TypeError('Cannot compile a fused decoder for %s' % cls.__name__)
+        FUSED_DECODERS[key] = decoder
+    return decoder
+
+#----------------------------------------------------------------------------------------------------------------------------------
@@ -11,6 +11,7 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+from threading import RLock
 
 # this module
 from .utils.codegen import ExternalCodeInvocation, ExternalValue, SourceCodeTemplate, compile_expr
@@ -34,18 +35,33 @@ class Marshaller(object):
         #
         self.marshalling_code = marshalling_code
         self.unmarshalling_code = unmarshalling_code
-
-        # These are here for tests and debugging, since normally you don't call the code directly, you insert it in a code template
-        #
-        self.marshal, self.unmarshal = (
-            compile_expr(
-                SourceCodeTemplate(
-                    'f = lambda v: $code',
-                    code=ExternalCodeInvocation(code, 'v'),
-                ),
-                'f',
-            )
-            for code in (self.marshalling_code, self.unmarshalling_code)
+        self._marshal = None
+        self._unmarshal = None
+
+    # These are here for tests and debugging, since normally you don't call the code directly, you insert it in a code template.
+    # They're only compiled when first used, so that creating the standard marshallers at import time doesn't compile anything.
+
+    @property
+    def marshal(self):
+        if self._marshal is None:
+            self._marshal = self._compile_function(self.marshalling_code)
+        return self._marshal
+
+    @property
+    def unmarshal(self):
+        if self._unmarshal is None:
+            self._unmarshal = self._compile_function(self.unmarshalling_code)
+        return self._unmarshal
+
+    @staticmethod
+    def _compile_function(code):
+        return compile_expr(
+            SourceCodeTemplate(
+                'f = lambda v: $code',
+                code=ExternalCodeInvocation(code, 'v'),
+            ),
+            'f',
+            name='marshaller',
         )
 
 #----------------------------------------------------------------------------------------------------------------------------------
@@ -151,6 +167,77 @@ def temporary_marshaller_registration(cls, marshaller):
     yield
     unregister_marshaller(cls, marshaller)
 
+#----------------------------------------------------------------------------------------------------------------------------------
+# scoped registries
+
+class MarshallerRegistry(object):
+    """
+    An explicit alternative to the global marshaller lookup. A registry holds its own marshallers (falling back on the standard
+    ones), and can be passed to `record_pods' and `from_pods' via their `registry' kwarg. For each (class, profile) pair, the pods
+    functions specific to this registry are compiled the first time they're needed, and then cached here. Registering or
+    unregistering a marshaller drops the cache, so unlike with the global registry, changes take effect on existing classes too.
+    """
+
+    def __init__(self, marshallers=None):
+        self.marshallers = dict(marshallers or {})
+        self._lock = RLock()
+        self._pods_functions = {}
+        self._pending_pods_functions = {}
+
+    def register(self, cls, marshaller):
+        with self._lock:
+            self.marshallers[cls] = marshaller
+            self._pods_functions = {}
+
+    def unregister(self, cls, marshaller):
+        with self._lock:
+            if self.marshallers.get(cls) is not marshaller:
+                raise KeyError(cls)
+            del self.marshallers[cls]
+            self._pods_functions = {}
+
+    @contextmanager
+    def temporary_registration(self, cls, marshaller):
+        self.register(cls, marshaller)
+        try:
+            yield
+        finally:
+            self.unregister(cls, marshaller)
+
+    def lookup(self, cls):
+        marshaller = self.marshallers.get(cls)
+        if marshaller is None:
+            marshaller = STANDARD_MARSHALLERS.get(cls)
+        return marshaller
+
+    def pods_functions(self, cls, profile=None):
+        key = (cls, profile)
+        functions = self._pods_functions.get(key)
+        if functions is None:
+            with self._lock:
+                functions = self._pods_functions.get(key) or self._pending_pods_functions.get(key)
+                if functions is None:
+                    # Deferred import because pods.py imports this module
+                    from .pods import PodsFunctions  # pylint: disable=import-outside-toplevel,cyclic-import
+                    # The empty holder is made available to nested types while we compile, so that recursive types can refer
+                    # to it, but other threads only see it once it's been filled
+                    functions = self._pending_pods_functions[key] = PodsFunctions()
+                    try:
+                        functions.compile(cls, self, profile)
+                        self._pods_functions[key] = functions
+                    finally:
+                        del self._pending_pods_functions[key]
+        return functions
+
+    def record_pods(self, obj, profile=None):
+        return self.pods_functions(obj.__class__, profile).record_pods(obj)
+
+    def from_pods(self, cls, pods, profile=None):
+        return self.pods_functions(cls, profile).from_pods(cls, pods)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# code-generation utils
+
 def wrap_in_null_check(nullable, value_expr, code):
     if nullable:
         return SourceCodeTemplate(
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Deep memory accounting for graphs of records.
+
+`sys.getsizeof' only measures the object it's given. Here we walk records (via `record_fields'), the generated collection classes,
+ImmutableDicts and the builtin containers, and add up the size of everything reachable.
+
+    >>> sizeof(album)
+    4312
+    >>> print(report(album).format())
+
+With `shared=True' (the default), an object that is reachable through several paths is only counted once, which gives the actual
+memory used. With `shared=False' it's counted every time it's reached, which gives the size the graph would have if nothing was
+shared, e.g. after a round-trip through JSON.
+
+For large graphs, `sample=N' measures at most N randomly picked elements of each container, and extrapolates from them. The result
+is then an estimate.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from random import Random
+import sys
+
+# this module
+from .utils.immutabledict import ImmutableDict
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# constants, config
+
+# These are shared by the whole process, and so never counted
+UNCOUNTED_OBJECTS = (None, True, False, NotImplemented, Ellipsis)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class MemoryReport(object):
+    """
+    The result of `report'.
+
+    `by_class' maps each class name to the number of instances found and their shallow size in bytes. `by_field' maps each record
+    field, as "ClassName.field_id", to the size of the objects reached through it, not counting nested records, which are reported
+    under their own class and fields. The sizes in `by_field' and the sizes of the records in `by_class' therefore add up to
+    `total'.
+    """
+
+    def __init__(self, total, by_class, by_field, sampled):
+        self.total = total
+        self.by_class = by_class
+        self.by_field = by_field
+        self.sampled = sampled
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'by_class': {name: dict(stats) for name, stats in self.by_class.items()},
+            'by_field': dict(self.by_field),
+            'sampled': self.sampled,
+        }
+
+    def format(self):
+        lines = ['total: %d bytes%s' % (self.total, ' (estimated)' if self.sampled else '')]
+        lines.append('by class:')
+        for name, stats in sorted(self.by_class.items(), key=lambda item: -item[1]['bytes']):
+            lines.append('    %-40s %10d bytes %10d objects' % (name, stats['bytes'], stats['count']))
+        lines.append('by field:')
+        for name, num_bytes in sorted(self.by_field.items(), key=lambda item: -item[1]):
+            lines.append('    %-40s %10d bytes' % (name, num_bytes))
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return 'MemoryReport(total=%d)' % self.total
+
+
+class MemoryWalker(object):
+    """
+    Walks a graph of objects, keeping track of the size of each object found. Subclasses can override `visit' to also keep track of
+    where each object was found.
+    """
+
+    def __init__(self, shared=True, sample=None, seed=None):
+        if sample is not None and sample < 1:
+            raise ValueError('sample must be a positive number of elements, not %r' % (sample,))
+        self.shared = shared
+        self.sample = sample
+        self.random = Random(seed)
+        self.seen = set()
+        self.total = 0.0
+        self.sampled = False
+
+    def walk(self, obj):
+        # NB we use an explicit stack rather than recursion, since record graphs can be deeper than the recursion limit. Each entry
+        # holds the object, the record field through which it was reached, and a weight, which is more than 1 for sampled elements.
+        stack = [(obj, None, 1.0)]
+        while stack:
+            obj, owner, weight = stack.pop()
+            if any(obj is uncounted for uncounted in UNCOUNTED_OBJECTS):
+                continue
+            if self.shared:
+                if id(obj) in self.seen:
+                    continue
+                self.seen.add(id(obj))
+            num_bytes = sys.getsizeof(obj) * weight
+            self.total += num_bytes
+            self.visit(obj, owner, num_bytes)
+            record_fields = getattr(type(obj), 'record_fields', None)
+            if record_fields is not None:
+                class_name = type(obj).__name__
+                for field_id in record_fields:
+                    stack.append((getattr(obj, field_id), '%s.%s' % (class_name, field_id), weight))
+            elif isinstance(obj, ImmutableDict):
+                impl = obj._ImmutableDict__impl  # pylint: disable=protected-access
+                stack.append((impl, owner, weight))
+            elif isinstance(obj, dict):
+                # NB not `obj.items()', whose tuples are only created by the iteration, and so aren't part of the graph
+                self._push_elems(stack, obj.keys(), len(obj), owner, weight)
+                self._push_elems(stack, obj.values(), len(obj), owner, weight)
+            elif isinstance(obj, (tuple, list, set, frozenset)):
+                self._push_elems(stack, obj, len(obj), owner, weight)
+        return self
+
+    def _push_elems(self, stack, elems, num_elems, owner, weight):
+        if self.sample is not None and num_elems > self.sample:
+            self.sampled = True
+            elems = self.random.sample(list(elems), self.sample)
+            weight *= num_elems / self.sample
+        for elem in elems:
+            stack.append((elem, owner, weight))
+
+    def visit(self, obj, owner, num_bytes):
+        pass
+
+
+class MemoryReportWalker(MemoryWalker):
+
+    def __init__(self, *args, **kwargs):
+        super(MemoryReportWalker, self).__init__(*args, **kwargs)
+        self.by_class = {}
+        self.by_field = {}
+
+    def visit(self, obj, owner, num_bytes):
+        stats = self.by_class.get(type(obj).__name__)
+        if stats is None:
+            stats = self.by_class[type(obj).__name__] = {'count': 0, 'bytes': 0}
+        stats['count'] += 1
+        stats['bytes'] += num_bytes
+        if owner is not None and not hasattr(type(obj), 'record_fields'):
+            self.by_field[owner] = self.by_field.get(owner, 0) + num_bytes
+
+    def report(self):
+        return MemoryReport(
+            total=int(round(self.total)),
+            by_class={
+                name: {'count': stats['count'], 'bytes': int(round(stats['bytes']))}
+                for name, stats in self.by_class.items()
+            },
+            by_field={
+                name: int(round(num_bytes))
+                for name, num_bytes in self.by_field.items()
+            },
+            sampled=self.sampled,
+        )
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# public interface
+
+def sizeof(obj, shared=True, sample=None, seed=None):
+    """
+    Returns the number of bytes used by `obj' and everything reachable from it. See the module docstring for the arguments.
+    """
+    return int(round(MemoryWalker(shared, sample, seed).walk(obj).total))
+
+def report(obj, shared=True, sample=None, seed=None):
+    """
+    Like `sizeof', but returns a MemoryReport, which breaks down the size by class and by record field.
+    """
+    return MemoryReportWalker(shared, sample, seed).walk(obj).report()
+
+#----------------------------------------------------------------------------------------------------------------------------------
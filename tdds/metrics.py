@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Opt-in construction and validation metrics for record classes.
+
+Metrics are enabled per class, by setting `__metrics' in the class body, or globally for all classes compiled afterwards, by
+calling `set_default_metrics_mode'. The mode is either 'count', which counts constructions and `from_pods' calls, or 'timing', which
+also measures the time spent handling each field in the constructor (default values, coercion, checks). Classes compiled without
+metrics have no instrumentation code generated at all, and so pay nothing.
+
+    class Album(Record):
+        __metrics = 'timing'
+        title = text_type
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from timeit import default_timer
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# constants, config
+
+METRICS_MODES = ('count', 'timing')
+
+DEFAULT_METRICS_MODE = [None]
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class RecordMetrics(object):
+    """
+    The counters for one record class. The generated code updates these attributes directly.
+    """
+
+    def __init__(self, class_name):
+        self.class_name = class_name
+        self.instances = 0
+        self.from_pods = 0
+        self.field_seconds = {}
+
+    def as_dict(self):
+        return {
+            'instances': self.instances,
+            'from_pods': self.from_pods,
+            'field_seconds': dict(self.field_seconds),
+        }
+
+# Metrics are kept by class name. If several classes have the same name, their metrics are added up.
+ALL_METRICS = {}
+
+def record_metrics(class_name, field_ids=()):
+    metrics = ALL_METRICS.get(class_name)
+    if metrics is None:
+        metrics = ALL_METRICS[class_name] = RecordMetrics(class_name)
+    for field_id in field_ids:
+        metrics.field_seconds.setdefault(field_id, 0.0)
+    return metrics
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# public interface
+
+def set_default_metrics_mode(mode):
+    """
+    Sets the metrics mode for all record classes compiled from now on that don't specify their own. `mode' is one of
+    METRICS_MODES, or None to disable metrics.
+    """
+    DEFAULT_METRICS_MODE[0] = check_metrics_mode(mode)
+
+def check_metrics_mode(mode):
+    if mode is True:
+        mode = 'count'
+    elif mode is False:
+        mode = None
+    if mode is not None and mode not in METRICS_MODES:
+        raise ValueError('Unknown metrics mode: %r' % (mode,))
+    return mode
+
+def snapshot():
+    return {
+        class_name: metrics.as_dict()
+        for class_name, metrics in ALL_METRICS.items()
+    }
+
+def reset():
+    for metrics in ALL_METRICS.values():
+        metrics.instances = 0
+        metrics.from_pods = 0
+        for field_id in metrics.field_seconds:
+            metrics.field_seconds[field_id] = 0.0
+
+def prometheus_text():
+    """
+    Returns the metrics in the Prometheus text exposition format
+    """
+    lines = []
+    def metric(name, doc, values):
+        lines.append('# HELP %s %s' % (name, doc))
+        lines.append('# TYPE %s counter' % name)
+        for labels, value in values:
+            lines.append('%s{%s} %r' % (
+                name,
+                ','.join('%s="%s"' % (key, _escape_label_value(val)) for key, val in labels),
+                value,
+            ))
+    all_metrics = sorted(ALL_METRICS.items())
+    metric(
+        'tdds_instances_total',
+        'Number of record instances constructed',
+        (((('record', class_name),), metrics.instances) for class_name, metrics in all_metrics),
+    )
+    metric(
+        'tdds_from_pods_total',
+        'Number of calls to from_pods',
+        (((('record', class_name),), metrics.from_pods) for class_name, metrics in all_metrics),
+    )
+    metric(
+        'tdds_field_handling_seconds_total',
+        'Time spent handling each field in record constructors',
+        (
+            ((('record', class_name), ('field', field_id)), seconds)
+            for class_name, metrics in all_metrics
+            for field_id, seconds in sorted(metrics.field_seconds.items())
+        ),
+    )
+    return '\n'.join(lines) + '\n'
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# private utils
+
+timer = default_timer
+
+def _escape_label_value(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+#----------------------------------------------------------------------------------------------------------------------------------
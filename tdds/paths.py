@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Updates of values nested deep inside a record, addressed by a path:
+
+    album = album.record_update('tracks[3].title', 'Moment')
+    album = album.record_update_many({'tracks[3].title': 'Moment', 'tracks[4].title': 'Blue', 'label': 'Impulse'})
+
+A path is a field name followed by any number of `.field' and `[index]' steps. Indices are Python literals, e.g. `[3]' in a
+`seq_of' or `pair_of', `['fr']' in a `dict_of'. Elements of a `set_of' can't be addressed.
+
+The records and collections from the root to each updated value are copied, and everything else is shared with the original. Each
+copy only checks the values that changed in it, using `record_derive' and `record_replace'. The code for each path is generated
+the first time the path is used on a given class. Paths that only differ by their indices share the same code.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from ast import literal_eval
+import re
+
+# this module
+from .utils.codegen import Joiner, SourceCodeTemplate, compile_expr
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class InvalidPath(ValueError):
+    pass
+
+
+class PathStep(object):
+    """
+    One step of a path: either the field called `field_id' of a record, or the element at `index' of a collection
+    """
+
+    def __init__(self, field_id=None, index=None):
+        self.field_id = field_id
+        self.index = index
+
+    @property
+    def key(self):
+        # NB field IDs are kept apart from indices, since a `dict_of' can have keys that are strings too
+        return ('field', self.field_id) if self.field_id is not None else ('index', self.index)
+
+    def get_code(self, node_expr, index_expr):
+        if self.field_id is not None:
+            return SourceCodeTemplate('$node.$field_id', node=node_expr, field_id=self.field_id)
+        return SourceCodeTemplate('$node[$index]', node=node_expr, index=index_expr)
+
+    def replace_code(self, node_expr, index_expr, value_expr):
+        if self.field_id is not None:
+            return SourceCodeTemplate(
+                '$node.record_derive($field_id=$value)',
+                node=node_expr,
+                field_id=self.field_id,
+                value=value_expr,
+            )
+        return SourceCodeTemplate(
+            '$node.record_replace({$index: $value})',
+            node=node_expr,
+            index=index_expr,
+            value=value_expr,
+        )
+
+    def get(self, node):
+        if self.field_id is not None:
+            return getattr(node, self.field_id)
+        return node[self.index]
+
+    def replace(self, node, changes):
+        """
+        Returns a copy of `node' with the values given in `changes', which maps the keys of steps from `node' to new values
+        """
+        if self.field_id is not None:
+            return node.record_derive(**{field_id: value for (_, field_id), value in changes.items()})
+        return node.record_replace({index: value for (_, index), value in changes.items()})
+
+
+# NB every field step starts with a dot, since `parse_path' adds one before the first field
+PATH_STEP_RE = re.compile(r'''
+    \.(?P<field_id>[^\W\d]\w*)
+    | \[(?P<index>-?\d+|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")\]
+''', re.X)
+
+def parse_path(cls, path):
+    """
+    Parses `path', and checks it against the fields of `cls'. Returns a tuple of PathSteps.
+    """
+    steps = []
+    node_type = cls
+    dotted_path = '.' + path
+    pos = 0
+    while pos < len(dotted_path):
+        match = PATH_STEP_RE.match(dotted_path, pos)
+        if match is None:
+            raise InvalidPath('Invalid path: %r' % (path,))
+        pos = match.end()
+        if match.group('field_id') is not None:
+            field_id = match.group('field_id')
+            field = getattr(node_type, 'record_fields', {}).get(field_id)
+            if field is None:
+                raise InvalidPath('%s has no field %r, in path %r' % (node_type.__name__, field_id, path))
+            steps.append(PathStep(field_id=field_id))
+        else:
+            if hasattr(node_type, 'key_field'):
+                field = node_type.value_field
+            elif hasattr(node_type, 'element_field') and hasattr(node_type, 'record_replace'):
+                field = node_type.element_field
+            else:
+                raise InvalidPath('%s elements cannot be addressed by index, in path %r' % (node_type.__name__, path))
+            steps.append(PathStep(index=literal_eval(match.group('index'))))
+        node_type = field.type
+    if not steps or steps[0].field_id is None:
+        raise InvalidPath('Invalid path: %r' % (path,))
+    return tuple(steps)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# single path
+
+class PathUpdateTemplate(SourceCodeTemplate):
+    """
+    The code for one path shape, i.e. the field IDs along the path. The indices aren't part of the code, but are passed in as
+    arguments, so that all paths that only differ by their indices share the same function.
+    """
+
+    template = '''
+        def update(node_0, value, indices):
+            $unpack_indices
+            $get_nodes
+            $replace_nodes
+            return value
+    '''
+
+    def __init__(self, steps):
+        super(PathUpdateTemplate, self).__init__()
+        self.steps = steps
+
+    def index_expr(self, depth):
+        if self.steps[depth].field_id is None:
+            return 'index_%d' % depth
+
+    @property
+    def unpack_indices(self):
+        index_exprs = tuple(filter(None, map(self.index_expr, range(len(self.steps)))))
+        if index_exprs:
+            return '{}, = indices'.format(', '.join(index_exprs))
+
+    @property
+    def get_nodes(self):
+        # Everything but the last step leads to a node that is copied
+        return Joiner('\n', values=tuple(
+            SourceCodeTemplate(
+                'node_$child_depth = $code',
+                child_depth=str(depth + 1),
+                code=step.get_code('node_%d' % depth, self.index_expr(depth)),
+            )
+            for depth, step in enumerate(self.steps[:-1])
+        ))
+
+    @property
+    def replace_nodes(self):
+        return Joiner('\n', values=tuple(
+            SourceCodeTemplate('value = $code', code=step.replace_code('node_%d' % depth, self.index_expr(depth), 'value'))
+            for depth, step in reversed(tuple(enumerate(self.steps)))
+        ))
+
+
+def path_shape(steps):
+    """
+    A hashable key for the field IDs along a path, with None standing for each index
+    """
+    return tuple(step.field_id for step in steps)
+
+def compile_path_update(cls, steps):
+    shape_name = ''.join('[]' if field_id is None else '.' + field_id for field_id in path_shape(steps))[1:]
+    return compile_expr(PathUpdateTemplate(steps), 'update', name='{}.update[{}]'.format(cls.__name__, shape_name))
+
+def path_update_function(cls, steps):
+    """
+    Returns the function that updates the value at the path made of `steps' in an instance of `cls', compiling it if needed. The
+    function is called with the instance, the new value and the tuple of the path's indices.
+    """
+    # NB the table is looked up in the class's own `__dict__', as for `canonical_instance', since a subclass may have more fields
+    table = cls.__dict__.get('record_path_updates')
+    if table is None:
+        table = {}
+        type.__setattr__(cls, 'record_path_updates', table)
+    shape = path_shape(steps)
+    update = table.get(shape)
+    if update is None:
+        update = table[shape] = compile_path_update(cls, steps)
+    return update
+
+def update_path(obj, path, value):
+    steps = parse_path_cached(obj.__class__, path)
+    indices = tuple(step.index for step in steps if step.field_id is None)
+    return path_update_function(obj.__class__, steps)(obj, value, indices)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# many paths at once
+
+def update_paths(obj, updates):
+    """
+    Like `update_path', for each path and value in `updates', which can be a dict or a sequence of pairs. Nodes shared by several
+    paths are copied only once.
+    """
+    # Each node of the tree maps the keys of its steps to a (step, subtree, value) triple. The subtree is None where the value is
+    # set.
+    tree = {}
+    for path, value in getattr(updates, 'items', lambda: updates)():
+        steps = parse_path_cached(obj.__class__, path)
+        subtree = tree
+        for step in steps[:-1]:
+            subtree = subtree.setdefault(step.key, (step, {}, None))[1]
+            if subtree is None:
+                raise InvalidPath('Path %r is inside a value that is also updated' % (path,))
+        if steps[-1].key in subtree:
+            raise InvalidPath('Path %r is updated more than once, or contains another updated path' % (path,))
+        subtree[steps[-1].key] = (steps[-1], None, value)
+    if not tree:
+        return obj
+    return _update_tree(obj, tree)
+
+def _update_tree(node, tree):
+    changes = {}
+    for key, (step, subtree, value) in tree.items():
+        changes[key] = value if subtree is None else _update_tree(step.get(node), subtree)
+    # NB all steps from one node are of the same kind, so any of them can do the replacing
+    return step.replace(node, changes)  # pylint: disable=undefined-loop-variable
+
+# Paths are cached by their literal text, which includes the indices, and so there can be any number of them. The cache is emptied
+# when it gets to this size.
+MAX_CACHED_PATHS = 1000
+
+def parse_path_cached(cls, path):
+    table = cls.__dict__.get('record_parsed_paths')
+    if table is None:
+        table = {}
+        type.__setattr__(cls, 'record_parsed_paths', table)
+    steps = table.get(path)
+    if steps is None:
+        if len(table) >= MAX_CACHED_PATHS:
+            table.clear()
+        steps = table[path] = parse_path(cls, path)
+    return steps
+
+#----------------------------------------------------------------------------------------------------------------------------------
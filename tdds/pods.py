@@ -15,12 +15,18 @@ JSON specifically, the PODS should be immediately serializable to strings using
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 # standards
+from copy import copy
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 from functools import wraps
+import re
 
 # this module
-from .basics import RecursiveType
-from .marshaller import lookup_marshalling_code_for_type, lookup_unmarshalling_code_for_type, wrap_in_null_check
-from .utils.codegen import ExternalCodeInvocation, ExternalValue, Joiner, SourceCodeTemplate
+from .basics import RecursiveType, field_enum_check
+from .dedupe import DEDUPE_STATE, dedupe
+from .marshaller import lookup_marshaller_for_type, wrap_in_null_check
+from .refs import REFS_STATE, decoding_refs, encoding_refs
+from .utils.codegen import OPTIMIZE, ExternalCodeInvocation, ExternalValue, Joiner, SourceCodeTemplate, compile_template
 from .utils.compatibility import integer_types, string_types, text_type
 
 #----------------------------------------------------------------------------------------------------------------------------------
@@ -34,6 +40,68 @@ PODS_TYPES = frozenset(
 class CannotBeSerializedToPods(TypeError):
     pass
 
+#----------------------------------------------------------------------------------------------------------------------------------
+# profiles
+
+class PodsProfile(object):
+    """
+    A pods profile says which non-record types can be left as they are in the output of `record_pods', rather than marshalled to
+    text. The default 'json' profile only lets through the types that the standard `json' module can handle. Other profiles are for
+    targets that can hold richer objects, e.g. pickle, an in-process cache, or a msgpack-like codec with extension types.
+
+    Each profile registered when a class is compiled gets its own pair of `record_pods_<name>' and `from_pods_<name>' methods, so
+    the choice of marshallers is made once, at codegen time, and not on every call. This includes the default profile, whose
+    methods nested values are called through, so that they don't go through the option handling of `record_pods' and
+    `from_pods'. Profiles must be registered before the classes that use them are compiled.
+
+    If `enum_ordinals' is set, the values of `one_of' fields are encoded as their position in the list of values given to
+    `one_of', which is smaller to store than e.g. a string. This means that values can only be added at the end of that list.
+    """
+
+    def __init__(self, name, native_types, enum_ordinals=False):
+        self.name = name
+        self.native_types = frozenset(native_types)
+        self.enum_ordinals = enum_ordinals
+
+    def __repr__(self):
+        return 'PodsProfile(%r)' % self.name
+
+DEFAULT_PODS_PROFILE = PodsProfile('json', PODS_TYPES)
+
+PODS_PROFILES = {
+    DEFAULT_PODS_PROFILE.name: DEFAULT_PODS_PROFILE,
+    'native': PodsProfile('native', PODS_TYPES | frozenset([Decimal, date, datetime, timedelta])),
+}
+
+def register_pods_profile(name, native_types, enum_ordinals=False):
+    if name in PODS_PROFILES:
+        raise ValueError('Pods profile %r already registered' % name)
+    if not re.search(r'^[a-z_][a-z0-9_]*$', name):
+        raise ValueError('Invalid pods profile name: %r' % name)
+    profile = PODS_PROFILES[name] = PodsProfile(name, native_types, enum_ordinals)
+    return profile
+
+class EnumValueTable(dict):
+    """
+    Used for encoding and decoding the values of `one_of' fields. Values that aren't in the table, including None, are returned as
+    they are, and left for the record constructor to accept or reject.
+    """
+
+    def __missing__(self, key):
+        return key
+
+def lookup_pods_profile_method(obj, method_name, profile_name):
+    method = getattr(obj, '%s_%s' % (method_name, profile_name), None)
+    if method is None:
+        if profile_name in PODS_PROFILES:
+            cls = obj if isinstance(obj, type) else obj.__class__
+            raise ValueError(profile_compiled_too_early_message(cls, profile_name))
+        raise ValueError('Unknown pods profile: %r' % (profile_name,))
+    return method
+
+def profile_compiled_too_early_message(cls, profile_name):
+    return '%s was compiled before pods profile %r was registered' % (cls.__name__, profile_name)
+
 def serialization_exceptions_at_runtime(func):
     """
     This decorates functions that generate source code. If the source code generation raises CannotBeSerializedToPods, instead of
@@ -60,31 +128,165 @@ def serialization_exceptions_at_runtime(func):
 class PodsMethodsTemplate(SourceCodeTemplate):
 
     template = '''
-        def record_pods (self):
+        def record_pods(self, profile=None, registry=None, refs=False):
+            if refs:
+                with $encoding_refs(self):
+                    return self.record_pods(profile, registry)
+            if registry is not None:
+                return registry.record_pods(self, profile)
+            if profile is not None and profile != $default_profile_name:
+                return $lookup_pods_profile_method(self, "record_pods", profile)()
             $record_pods_impl
 
         @classmethod
-        def from_pods (cls, pods):
+        def from_pods(cls, pods, profile=None, registry=None, dedupe=False, refs=False):
+            if refs:
+                with $decoding_refs(pods):
+                    return cls.from_pods(pods, profile, registry, dedupe)
+            if dedupe:
+                with $dedupe():
+                    return cls.from_pods(pods, profile, registry)
+            if registry is not None:
+                return registry.from_pods(cls, pods, profile)
+            if profile is not None and profile != $default_profile_name:
+                return $lookup_pods_profile_method(cls, "from_pods", profile)(pods)
+            $count_from_pods
             $from_pods_impl
+
+        $other_profiles
     '''
 
-    @staticmethod
-    def value_to_pods(value_expr, field, needs_null_check=True):
-        if field.type in PODS_TYPES:
+    profile_template = '''
+        def record_pods_$profile_name(self):
+            $record_pods_impl
+
+        @classmethod
+        def from_pods_$profile_name(cls, pods):
+            $count_from_pods
+            $from_pods_impl
+    '''
+
+    # When compiled for a MarshallerRegistry, the pods code is generated as plain functions rather than methods
+    functions_template = '''
+        def record_pods(self):
+            $record_pods_impl
+
+        def from_pods(cls, pods):
+            $from_pods_impl
+    '''
+
+    profile = DEFAULT_PODS_PROFILE
+    registry = None
+
+    # When set to a RecordMetrics object, calls to `from_pods' are counted
+    metrics = None
+    lookup_pods_profile_method = staticmethod(lookup_pods_profile_method)
+    dedupe = staticmethod(dedupe)
+    encoding_refs = staticmethod(encoding_refs)
+    decoding_refs = staticmethod(decoding_refs)
+
+    @property
+    def count_from_pods(self):
+        if self.metrics is not None:
+            return '$metrics.from_pods += 1'
+
+    @property
+    def default_profile_name(self):
+        return repr(DEFAULT_PODS_PROFILE.name)
+
+    @property
+    def profile_name(self):
+        return self.profile.name
+
+    @property
+    def other_profiles(self):
+        # NB this includes the default profile, see PodsProfile
+        return Joiner('\n\n', values=tuple(
+            self.for_profile(profile)
+            for name, profile in sorted(PODS_PROFILES.items())
+        ))
+
+    def for_profile(self, profile):
+        templ = copy(self)
+        templ.template = self.profile_template
+        templ.profile = profile
+        return templ
+
+    def _profile_method_name(self, cls, method_name):
+        # Nested records and collections have a method specific to our profile, but duck-typed objects with only a plain
+        # `record_pods' or `from_pods' method get called through that
+        profile_method_name = '{}_{}'.format(method_name, self.profile.name)
+        if cls is RecursiveType or callable(getattr(cls, profile_method_name, None)):
+            return profile_method_name
+        elif is_tdds_type(cls):
+            # Falling back on the plain method would silently use the default profile for the nested values
+            raise CannotBeSerializedToPods(profile_compiled_too_early_message(cls, self.profile.name))
+        return method_name
+
+    def _registry_functions(self, cls):
+        if self.registry is not None and is_tdds_type(cls):
+            return self.registry.pods_functions(
+                cls,
+                None if self.profile is DEFAULT_PODS_PROFILE else self.profile.name,
+            )
+
+    def _lookup_marshaller(self, cls):
+        if self.registry is not None:
+            return self.registry.lookup(cls)
+        else:
+            return lookup_marshaller_for_type(cls)
+
+    def _enum_encoding(self, field):
+        enum_check = field_enum_check(field)
+        if enum_check is not None:
+            if self.profile.enum_ordinals:
+                return (
+                    EnumValueTable((value, ordinal) for ordinal, value in enumerate(enum_check.values)),
+                    EnumValueTable(enumerate(enum_check.values)),
+                )
+            elif field.type in self.profile.native_types and field.type in string_types:
+                # Strings are encoded as they are. When decoding, we replace each by the equal string given to `one_of', so that
+                # all records share the same few string objects.
+                return (
+                    None,
+                    EnumValueTable((value, value) for value in enum_check.values),
+                )
+        return None, None
+
+    def value_to_pods(self, value_expr, field, needs_null_check=True):
+        registry_functions = self._registry_functions(field.type)
+        enum_encoding_table = self._enum_encoding(field)[0]
+        if enum_encoding_table is not None:
+            return SourceCodeTemplate('$table[$value]', table=enum_encoding_table, value=value_expr)
+        elif field.type in self.profile.native_types:
             return value_expr
+        elif registry_functions is not None:
+            return wrap_in_null_check(
+                field.nullable and needs_null_check,
+                value_expr,
+                # Instances of subclasses are encoded with the functions for their own class, so that their own fields are kept
+                SourceCodeTemplate(
+                    '$functions.record_pods($value) if $value.__class__ is $cls else $registry.record_pods($value, $profile_name)',
+                    functions=ExternalValue(registry_functions),
+                    value=value_expr,
+                    cls=field.type,
+                    registry=ExternalValue(self.registry),
+                    profile_name=repr(None if self.profile is DEFAULT_PODS_PROFILE else self.profile.name),
+                ),
+            )
         elif field.type is RecursiveType or callable(getattr(field.type, 'record_pods', None)):
             return wrap_in_null_check(
                 field.nullable and needs_null_check,
                 value_expr,
-                '{}.record_pods()'.format(value_expr),
+                '{}.{}()'.format(value_expr, self._profile_method_name(field.type, 'record_pods')),
             )
         else:
-            marshalling_code = lookup_marshalling_code_for_type(field.type)
-            if marshalling_code is not None:
+            marshaller = self._lookup_marshaller(field.type)
+            if marshaller is not None:
                 return wrap_in_null_check(
-                    field.nullable,
+                    field.nullable and (needs_null_check or not OPTIMIZE[0]),
                     value_expr,
-                    ExternalCodeInvocation(marshalling_code, value_expr)
+                    ExternalCodeInvocation(marshaller.marshalling_code, value_expr)
                 )
             else:
                 raise CannotBeSerializedToPods("Don't know how to serialize {} object to a PODS".format(
@@ -92,36 +294,123 @@ class PodsMethodsTemplate(SourceCodeTemplate):
                 ))
 
     @staticmethod
-    def pods_to_value(value_expr, field):
-        if field.type in PODS_TYPES:
+    def with_dedupe(plain_code, dedupe_code):
+        """
+        Code that runs `plain_code' normally, or `dedupe_code' within a `dedupe' block. In `dedupe_code', the block's DedupeTable is
+        available as `dedupe_table'.
+        """
+        return SourceCodeTemplate(
+            '''
+                dedupe_table = $dedupe_state.table
+                if dedupe_table is None:
+                    $plain_code
+                $dedupe_code
+            ''',
+            dedupe_state=DEDUPE_STATE,
+            plain_code=plain_code,
+            dedupe_code=dedupe_code,
+        )
+
+    @staticmethod
+    def dedupe_value(code, field):
+        """
+        Wraps the code that decodes a value so that, within a `dedupe' block, the value is replaced by the first equal one decoded.
+        Records are left alone, as their own `from_pods' does this.
+        """
+        if field.type in string_types:
+            return SourceCodeTemplate('dedupe_table.value($code)', code=code)
+        elif callable(getattr(field.type, 'default_coerce', None)) and field.coerce is field.type.default_coerce:
+            # Collections are decoded as lists, which the constructor of the enclosing record or collection would turn into a new
+            # collection object. Here we build that object first, so that it can be shared. The constructor then keeps it as is.
+            return SourceCodeTemplate('dedupe_table.collection($cls, $code)', cls=field.type, code=code)
+        else:
+            return None
+
+    def pods_to_value(self, value_expr, field):
+        registry_functions = self._registry_functions(field.type)
+        enum_decoding_table = self._enum_encoding(field)[1]
+        if enum_decoding_table is not None:
+            return SourceCodeTemplate('$table[$value]', table=enum_decoding_table, value=value_expr)
+        elif field.type in self.profile.native_types:
             return value_expr
+        elif registry_functions is not None:
+            return wrap_in_null_check(
+                field.nullable,
+                value_expr,
+                SourceCodeTemplate(
+                    '$functions.from_pods($cls, $value)',
+                    functions=ExternalValue(registry_functions),
+                    cls=field.type,
+                    value=value_expr,
+                ),
+            )
         elif field.type is RecursiveType or callable(getattr(field.type, 'from_pods', None)):
             return wrap_in_null_check(
                 field.nullable,
                 value_expr,
                 SourceCodeTemplate(
-                    '$cls.from_pods($value)',
+                    '$cls.$method_name($value)',
                     cls=(
                         ExternalCodeInvocation(lambda: field.type, '')
                         if field.type is RecursiveType
                         else field.type
                     ),
+                    method_name=self._profile_method_name(field.type, 'from_pods'),
                     value=value_expr,
                 ),
             )
         else:
-            unmarshalling_code = lookup_unmarshalling_code_for_type(field.type)
-            if unmarshalling_code is not None:
+            marshaller = self._lookup_marshaller(field.type)
+            if marshaller is not None:
                 return wrap_in_null_check(
                     field.nullable,
                     value_expr,
-                    ExternalCodeInvocation(unmarshalling_code, value_expr),
+                    ExternalCodeInvocation(marshaller.unmarshalling_code, value_expr),
                 )
             else:
                 raise CannotBeSerializedToPods("Don't know how to load {} object from a PODS".format(
                     field.type.__name__,
                 ))
 
+    @staticmethod
+    def can_be_shared(field):
+        # Records and collections can be reached more than once from the same root, and so be encoded as references
+        return field.type is RecursiveType or is_tdds_type(field.type)
+
+    @staticmethod
+    def with_refs(state_attr, plain_code, refs_code):
+        """
+        Code that runs `plain_code' normally, or `refs_code' within `record_pods(refs=True)' or `from_pods(refs=True)', depending on
+        `state_attr'. In `refs_code', the RefsEncoder or RefsDecoder is available as `refs_encoder' or `refs_decoder'.
+        """
+        return SourceCodeTemplate(
+            '''
+                refs_$state_attr = $refs_state.$state_attr
+                if refs_$state_attr is None:
+                    $plain_code
+                $refs_code
+            ''',
+            state_attr=state_attr,
+            refs_state=REFS_STATE,
+            plain_code=plain_code,
+            refs_code=refs_code,
+        )
+
+    def value_to_pods_with_refs(self, value_expr, field, needs_null_check=True):
+        if not self.can_be_shared(field):
+            return self.value_to_pods(value_expr, field, needs_null_check)
+        code = self.value_to_pods('ref_value', field, needs_null_check)
+        return SourceCodeTemplate('refs_encoder.encode($value, lambda ref_value: $code)', value=value_expr, code=code)
+
+    def pods_to_value_with_refs(self, value_expr, field):
+        if not self.can_be_shared(field):
+            return self.pods_to_value(value_expr, field)
+        code = self.pods_to_value('ref_pods', field)
+        if callable(getattr(field.type, 'default_coerce', None)) and field.coerce is field.type.default_coerce:
+            # As in `dedupe_value', the collection object is built here, so that the same one is given to all its parents
+            code = SourceCodeTemplate('$cls($code)', cls=field.type, code=code)
+        return SourceCodeTemplate('refs_decoder.decode($value, lambda ref_pods: $code)', value=value_expr, code=code)
+
 #----------------------------------------------------------------------------------------------------------------------------------
 
 class PodsMethodsForRecordTemplate(PodsMethodsTemplate):
@@ -134,6 +423,12 @@ class PodsMethodsForRecordTemplate(PodsMethodsTemplate):
     @property
     @serialization_exceptions_at_runtime
     def record_pods_impl(self):
+        plain_code = self._record_pods_code(self.value_to_pods)
+        if not any(self.can_be_shared(field) for field in self.fields.values()):
+            return plain_code
+        return self.with_refs('encoder', plain_code, self._record_pods_code(self.value_to_pods_with_refs))
+
+    def _record_pods_code(self, value_to_pods):
         return Joiner('\n', 'pods = {}\n', '\nreturn pods', tuple(
             SourceCodeTemplate(
                 '''
@@ -144,7 +439,7 @@ class PodsMethodsForRecordTemplate(PodsMethodsTemplate):
                 else 'pods[$key] = $value',
                 field_id=field_id,
                 key=repr(field_id),
-                value=self.value_to_pods(
+                value=value_to_pods(
                     'self.{}'.format(field_id),
                     field,
                     needs_null_check=False,
@@ -156,17 +451,52 @@ class PodsMethodsForRecordTemplate(PodsMethodsTemplate):
     @property
     @serialization_exceptions_at_runtime
     def from_pods_impl(self):
-        return Joiner(', ', 'return cls(', ')', tuple(
-            SourceCodeTemplate(
-                '$key = $value',
-                key=field_id,
-                value=self.pods_to_value(
-                    'pods.get({})'.format(repr(field_id)),
+        # Values that are tested for None before being decoded are read from the PODS once, into a variable. The variable names are
+        # prefixed so that they can't clash with `cls' or `pods'.
+        read_once = frozenset(
+            field_id
+            for field_id, field in self.fields.items()
+            if OPTIMIZE[0] and field.nullable and field.type not in self.profile.native_types
+        )
+        fields = tuple(self.fields.values())
+        values = tuple(
+            (
+                field_id,
+                self.pods_to_value(
+                    'f_{}'.format(field_id) if field_id in read_once else 'pods.get({})'.format(repr(field_id)),
                     field,
                 ),
             )
             for field_id, field in self.fields.items()
-        ))
+        )
+        code = self.with_dedupe(
+            Joiner(', ', 'return cls(', ')', tuple(
+                SourceCodeTemplate('$key = $value', key=field_id, value=value)
+                for field_id, value in values
+            )),
+            Joiner(', ', 'return dedupe_table.value(cls(', '))', tuple(
+                SourceCodeTemplate('$key = $value', key=field_id, value=self.dedupe_value(value, field) or value)
+                for (field_id, value), field in zip(values, fields)
+            )),
+        )
+        if any(self.can_be_shared(field) for field in fields):
+            # The values are decoded in the same order as `record_pods' encodes them, so that each object is met in full before
+            # any reference to it
+            code = self.with_refs('decoder', code, Joiner(', ', 'return cls(', ')', tuple(
+                SourceCodeTemplate(
+                    '$key = $value',
+                    key=field_id,
+                    value=self.pods_to_value_with_refs(
+                        'f_{}'.format(field_id) if field_id in read_once else 'pods.get({})'.format(repr(field_id)),
+                        field,
+                    ),
+                )
+                for field_id, field in sorted(self.fields.items())
+            )))
+        return Joiner('\n', values=tuple(
+            'f_{0} = pods.get({0!r})'.format(field_id)
+            for field_id in sorted(read_once)
+        ) + (code,))
 
 #----------------------------------------------------------------------------------------------------------------------------------
 
@@ -179,18 +509,34 @@ class PodsMethodsForSeqTemplate(PodsMethodsTemplate):
     @property
     @serialization_exceptions_at_runtime
     def record_pods_impl(self):
-        return SourceCodeTemplate(
+        plain_code = SourceCodeTemplate(
             'return [ $code_for_elem for elem in self ]',
             code_for_elem=self.value_to_pods('elem', self.element_field),
         )
+        if not self.can_be_shared(self.element_field):
+            return plain_code
+        return self.with_refs('encoder', plain_code, SourceCodeTemplate(
+            'return [ $code_for_elem for elem in self ]',
+            code_for_elem=self.value_to_pods_with_refs('elem', self.element_field),
+        ))
 
     @property
     @serialization_exceptions_at_runtime
     def from_pods_impl(self):
-        return SourceCodeTemplate(
+        code_for_elem = self.pods_to_value('elem', self.element_field)
+        plain_code = SourceCodeTemplate('return [ $code_for_elem for elem in pods ]', code_for_elem=code_for_elem)
+        dedupe_code_for_elem = self.dedupe_value(code_for_elem, self.element_field)
+        if dedupe_code_for_elem is not None:
+            plain_code = self.with_dedupe(
+                plain_code,
+                SourceCodeTemplate('return [ $code_for_elem for elem in pods ]', code_for_elem=dedupe_code_for_elem),
+            )
+        if not self.can_be_shared(self.element_field):
+            return plain_code
+        return self.with_refs('decoder', plain_code, SourceCodeTemplate(
             'return [ $code_for_elem for elem in pods ]',
-            code_for_elem=self.pods_to_value('elem', self.element_field),
-        )
+            code_for_elem=self.pods_to_value_with_refs('elem', self.element_field),
+        ))
 
 #----------------------------------------------------------------------------------------------------------------------------------
 
@@ -204,19 +550,82 @@ class PodsMethodsForDictTemplate(PodsMethodsTemplate):
     @property
     @serialization_exceptions_at_runtime
     def record_pods_impl(self):
-        return SourceCodeTemplate(
+        code_for_key = self.value_to_pods('key', self.key_field)
+        plain_code = SourceCodeTemplate(
             'return { $code_for_key:$code_for_val for key, value in self.items() }',
-            code_for_key=self.value_to_pods('key', self.key_field),
+            code_for_key=code_for_key,
             code_for_val=self.value_to_pods('value', self.value_field),
         )
+        # Keys can't be references, as those aren't hashable. Only the values are shared.
+        if not self.can_be_shared(self.value_field):
+            return plain_code
+        return self.with_refs('encoder', plain_code, SourceCodeTemplate(
+            'return { $code_for_key:$code_for_val for key, value in self.items() }',
+            code_for_key=code_for_key,
+            code_for_val=self.value_to_pods_with_refs('value', self.value_field),
+        ))
 
     @property
     @serialization_exceptions_at_runtime
     def from_pods_impl(self):
-        return SourceCodeTemplate(
+        code_for_key = self.pods_to_value('key', self.key_field)
+        code_for_val = self.pods_to_value('value', self.value_field)
+        plain_code = SourceCodeTemplate(
             'return { $code_for_key:$code_for_val for key, value in pods.items() }',
-            code_for_key=self.pods_to_value('key', self.key_field),
-            code_for_val=self.pods_to_value('value', self.value_field),
+            code_for_key=code_for_key,
+            code_for_val=code_for_val,
         )
+        dedupe_code_for_key = self.dedupe_value(code_for_key, self.key_field)
+        dedupe_code_for_val = self.dedupe_value(code_for_val, self.value_field)
+        if dedupe_code_for_key is not None or dedupe_code_for_val is not None:
+            plain_code = self.with_dedupe(
+                plain_code,
+                SourceCodeTemplate(
+                    'return { $code_for_key:$code_for_val for key, value in pods.items() }',
+                    code_for_key=dedupe_code_for_key or code_for_key,
+                    code_for_val=dedupe_code_for_val or code_for_val,
+                ),
+            )
+        if not self.can_be_shared(self.value_field):
+            return plain_code
+        return self.with_refs('decoder', plain_code, SourceCodeTemplate(
+            'return { $code_for_key:$code_for_val for key, value in pods.items() }',
+            code_for_key=code_for_key,
+            code_for_val=self.pods_to_value_with_refs('value', self.value_field),
+        ))
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# functions compiled for a given MarshallerRegistry
+
+def is_tdds_type(cls):
+    return any(
+        hasattr(cls, attr)
+        for attr in ('record_fields', 'element_field', 'key_field')
+    )
+
+class PodsFunctions(object):
+    """
+    Holds the `record_pods' and `from_pods' functions compiled for one class, under one MarshallerRegistry and one profile. Nested
+    types are called through their own holder, which is resolved when the code is generated, not on every call.
+    """
+
+    record_pods = None
+    from_pods = None
+
+    def compile(self, cls, registry, profile_name=None):
+        if hasattr(cls, 'record_fields'):
+            templ = PodsMethodsForRecordTemplate(cls.__name__, cls.record_fields)
+        elif hasattr(cls, 'key_field'):
+            templ = PodsMethodsForDictTemplate(cls.key_field, cls.value_field)
+        elif hasattr(cls, 'element_field'):
+            templ = PodsMethodsForSeqTemplate(cls.element_field)
+        else:
+            raise CannotBeSerializedToPods("Don't know how to serialize {} object to a PODS".format(cls.__name__))
+        templ.template = templ.functions_template
+        templ.profile = PODS_PROFILES[profile_name or DEFAULT_PODS_PROFILE.name]
+        templ.registry = registry
+        ns_dict = compile_template(templ, name='{}.pods'.format(cls.__name__))
+        self.record_pods = ns_dict['record_pods']
+        self.from_pods = ns_dict['from_pods']
 
 #----------------------------------------------------------------------------------------------------------------------------------
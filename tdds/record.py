@@ -8,17 +8,25 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 # standards
+from copy import copy
 from itertools import chain
+from random import random
 import re
+from weakref import WeakValueDictionary
 
 # this module
 from .basics import Field, FieldError, FieldValueError, FieldTypeError, FieldNotNullable, RecordsAreImmutable, \
     RecursiveType, compile_field
+from .drafts import draft_class
+from .metrics import DEFAULT_METRICS_MODE, check_metrics_mode, record_metrics, timer
+from .paths import update_path, update_paths
 from .pods import PodsMethodsForRecordTemplate
 from .unpickler import RecordRegistryMetaClass, RecordUnpickler
-from .utils.codegen import ExternalCodeInvocation, ExternalValue, Joiner, SourceCodeTemplate, compile_expr
+from .utils.codegen import OPTIMIZE, ExternalCodeInvocation, ExternalValue, Joiner, SourceCodeTemplate, compile_expr, \
+    compile_template, is_generated_function
 from .utils.compatibility import PY2, integer_types, native_string, string_types  # you're confused, pylint: disable=unused-import
 from .utils.immutabledict import ImmutableDict
+from .validation import current_validation_mode, register_record_class, sample_rate
 
 #----------------------------------------------------------------------------------------------------------------------------------
 # the `Record' class is the main export of this module.
@@ -37,11 +45,24 @@ class RecordMetaClass(RecordRegistryMetaClass):
         if bases == (object,) or is_codegen or Record not in bases:
             return type.__new__(mcs, class_name, bases, attrib)
         verbose = attrib.pop('_%s__verbose' % class_name, False)
+        metrics_mode = check_metrics_mode(attrib.pop('_%s__metrics' % class_name, DEFAULT_METRICS_MODE[0]))
+        interned = attrib.pop('_%s__intern' % class_name, False)
         src_code_gen = RecordClassTemplate(class_name, bases, **attrib)
+        if interned:
+            src_code_gen.interned = True
+        if metrics_mode is not None:
+            src_code_gen.enable_metrics(metrics_mode)
+        src_code_gen.validation_mode = current_validation_mode()
         cls = compile_expr(src_code_gen, class_name, verbose=verbose)
         if module is not None:
             setattr(cls, '__module__', module)
         mcs.register(class_name, cls)
+        if src_code_gen.validated_methods:
+            register_record_class(
+                cls,
+                src_code_gen.validated_methods,
+                lambda validation_mode: src_code_gen.compile_init_variant(cls, validation_mode),
+            )
         for field in cls.record_fields.values():
             field.set_recursive_type(cls)
         return cls
@@ -53,6 +74,30 @@ Record = RecordMetaClass(
     {}
 )
 
+
+class InternedRecordMetaClass(RecordMetaClass):
+    """
+    The metaclass of record classes compiled with `__intern = True', and of their subclasses. Constructing an instance that is equal
+    to one that is still alive returns that existing instance instead, so that there is only ever one copy of each value in memory.
+    The instances are kept in a WeakValueDictionary keyed by their `__key__', so their field values must be hashable.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        return canonical_instance(cls, type.__call__(cls, *args, **kwargs))
+
+
+def canonical_instance(cls, obj):
+    """
+    Returns the live instance of `cls' that is equal to `obj', or `obj' itself if there is none, in which case `obj' becomes the
+    canonical instance.
+    """
+    # NB the table is looked up in the class's own `__dict__', since instances of subclasses are kept apart
+    table = cls.__dict__.get('record_intern_table')
+    if table is None:
+        table = WeakValueDictionary()
+        type.__setattr__(cls, 'record_intern_table', table)
+    return table.setdefault(obj.__key__(), obj)
+
 #----------------------------------------------------------------------------------------------------------------------------------
 
 # So this module uses `exec' on a string of Python code in order to generate the new classes.
@@ -72,11 +117,9 @@ class RecordClassTemplate(SourceCodeTemplate):
     template = '''
         class $class_name($superclasses):
             __slots__ = $slots
+            $py2_metaclass
 
-            def __init__(self, $init_params):
-                $super_call
-                $field_checks
-                $set_fields
+            $init_method
 
             $properties
             $classmethods
@@ -92,24 +135,54 @@ class RecordClassTemplate(SourceCodeTemplate):
 
             record_fields = $record_fields
 
-            def record_derive(self, **kwargs):
-                return self.__class__(**{
-                    field_id: kwargs.get(field_id, getattr(self, field_id))
-                    for field_id in $fields_including_super
-                })
-
             $core_methods
+
+        $derive_functions
+    '''
+
+    init_method = '''
+        def __init__(self, $init_params):
+            $count_instance
+            $sample_values
+            $super_call
+            $field_checks
+            $set_fields
+    '''
+
+    # Used by `compile_init_variant' to compile the methods that depend on the validation mode on their own
+    init_variant_template = '''
+        $class_name = $cls
+        $init_method
+        $derive_functions
+        $variant_derive_method
     '''
 
     Record = Record
     RecordsAreImmutable = RecordsAreImmutable
     RecordUnpickler = RecordUnpickler
 
+    InternedRecordMetaClass = InternedRecordMetaClass
+    canonical_instance = staticmethod(canonical_instance)
+    draft_class = staticmethod(draft_class)
+    update_path = staticmethod(update_path)
+    update_paths = staticmethod(update_paths)
+
+    # One of the modes from the `validation' module. Determines which checks `__init__' runs.
+    validation_mode = 'full'
+    random = random
+
+    # Set by `enable_metrics'. When left as None, no instrumentation code is generated.
+    metrics = None
+    metrics_mode = None
+    timer = staticmethod(timer)
+
     def __init__(self, class_name, bases, **fields):
         super(RecordClassTemplate, self).__init__()
         self.class_name = class_name
         self.super_records = tuple(spr for spr in bases if spr is not Record and issubclass(spr, Record))
         self.super_fields = self._compile_super_fields(self.super_records, fields)
+        # Set by RecordMetaClass for classes declared with `__intern = True'. Subclasses of those are interned too.
+        self.interned = any(isinstance(spr, InternedRecordMetaClass) for spr in self.super_records)
         self.property_defs, self.classmethod_defs, self.staticmethod_defs = (
             {
                 field_id: fields.pop(field_id)
@@ -134,6 +207,46 @@ class RecordClassTemplate(SourceCodeTemplate):
         ))
         self.pods_methods = PodsMethodsForRecordTemplate(self.class_name, self.fields_including_super)
 
+    def enable_metrics(self, mode):
+        self.metrics_mode = mode
+        self.metrics = record_metrics(
+            self.class_name,
+            # NB superclass fields are included, since they're timed too when `__init__' is flattened
+            sorted(self.fields_including_super) if mode == 'timing' else (),
+        )
+        self.pods_methods.metrics = self.metrics
+
+    @property
+    def count_instance(self):
+        if self.metrics is not None:
+            return '$metrics.instances += 1'
+
+    def compile_init_variant(self, cls, validation_mode):
+        templ = copy(self)
+        templ.template = self.init_variant_template
+        templ.cls = cls
+        templ.validation_mode = validation_mode
+        ns_dict = compile_template(templ, name='{}.__init__[{}]'.format(self.class_name, validation_mode))
+        return {name: ns_dict[name] for name in self.validated_methods}
+
+    @property
+    def validated_methods(self):
+        """
+        The names of the methods that run the field checks, and so are compiled once per validation mode. Methods defined by the
+        user in the class body are left out, since they're not ours to replace.
+        """
+        names = ('__init__', 'record_derive') if self.fast_derive else ('__init__',)
+        return tuple(name for name in names if name not in self.instancemethod_defs)
+
+    @property
+    def sample_values(self):
+        if self.validation_mode.startswith('sample:'):
+            return '{} = $random() < $sample_rate'.format(self.local_name('_sampled'))
+
+    @property
+    def sample_rate(self):
+        return repr(sample_rate(self.validation_mode))
+
     @staticmethod
     def _compile_super_fields(super_records, fields):
         super_fields = {}
@@ -179,10 +292,48 @@ class RecordClassTemplate(SourceCodeTemplate):
 
     @property
     def superclasses(self):
+        if self.interned and not PY2:
+            return Joiner(', ', values=self.super_records + (Record, 'metaclass=$InternedRecordMetaClass'))
         return Joiner(', ', values=self.super_records + (Record,))
 
+    @property
+    def py2_metaclass(self):
+        if self.interned and PY2:
+            return '__metaclass__ = $InternedRecordMetaClass'
+
+    @property
+    def flatten_init(self):
+        """
+        True if `__init__' checks and sets the superclass fields itself, rather than calling the superclass constructors. This is
+        only done when those constructors are our own, since a user-defined one may do more.
+        """
+        return OPTIMIZE[0] and all(
+            is_generated_function(vars(cls)['__init__'])
+            for spr in self.super_records
+            for cls in spr.__mro__
+            if cls is not object and '__init__' in vars(cls)
+        )
+
+    def _iter_init_fields(self):
+        return self._iter_fields_in_fixed_order(include_super=self.flatten_init)
+
+    def _field_description(self, field_id):
+        if field_id in self.super_fields:
+            # Same as in the error messages of the superclass that defines the field, which is the class that holds its slot
+            owner_name = next(
+                getattr(spr, field_id).__objclass__.__name__
+                for spr in self.super_records
+                if field_id in spr.record_fields
+            )
+        else:
+            owner_name = self.class_name
+        return '{}.{}'.format(owner_name, field_id)
+
     @property
     def super_call(self):
+        if self.flatten_init:
+            # When there are no superclass records, this would only call `object.__init__', which does nothing
+            return None
         return 'super(%s, self).__init__(%s)' % (
             self.class_name,
             ', '.join(
@@ -191,19 +342,149 @@ class RecordClassTemplate(SourceCodeTemplate):
             ),
         )
 
-    @field_joiner_property('\n')
-    def field_checks(self, field_id, field):
-        return FieldHandlingStmtsTemplate(
+    @property
+    def field_checks(self):
+        return Joiner('\n', values=tuple(
+            self._field_check(field_id, field)
+            for field_id, field in self._iter_init_fields()
+        ))
+
+    def local_name(self, name):
+        """
+        Returns `name', prefixed with as many underscores as needed so that it's not the name of any field, as the fields are also
+        local variables of the generated methods
+        """
+        while name in self.fields_including_super:
+            name = '_' + name
+        return name
+
+    def _field_check(self, field_id, field):
+        field_stmts = FieldHandlingStmtsTemplate(
             field,
             field_id,
-            description='{}.{}'.format(self.class_name, field_id)
+            description=self._field_description(field_id),
         )
+        field_stmts.validation_mode = self.validation_mode
+        field_stmts.sampled_name = self.local_name('_sampled')
+        if self.metrics_mode == 'timing':
+            # NB the same timer variable is reused for each field
+            return SourceCodeTemplate(
+                '''
+                    $t0 = $timer()
+                    $field_stmts
+                    $metrics.field_seconds[$field_id_str] += $timer() - $t0
+                ''',
+                t0=self.local_name('_metrics_t0'),
+                field_id_str=repr(field_id),
+                field_stmts=field_stmts,
+                timer=self.timer,
+                metrics=self.metrics,
+            )
+        return field_stmts
+
+    @property
+    def set_fields(self):
+        return Joiner('\n', values=tuple(
+            self._set_field(field_id)
+            for field_id, _field_unused in self._iter_init_fields()
+        ))
 
-    @field_joiner_property('\n')
-    def set_fields(self, field_id, _field_unused):
+    @staticmethod
+    def _set_field(field_id):
+        if OPTIMIZE[0]:
+            # Calling the `__set__' of the slot's descriptor directly saves `object.__setattr__' from looking up the descriptor on
+            # every call. The setters only exist once the class does, see `bind_late_values'.
+            return '{}(self, {})'.format(slot_setter_name(field_id), field_id)
         # you can cheat past our fake immutability by using object.__setattr__, but don't tell anyone
         return 'object.__setattr__(self, "{0}", {0})'.format(field_id)
 
+    @property
+    def fast_derive(self):
+        """
+        True if `record_derive' builds the new record itself, copying the slots of the fields it isn't given, and running the checks
+        of only those it is given. This needs `__init__' to be our own all the way up, as it doesn't get called.
+        """
+        return self.flatten_init and not ('__init__' in self.instancemethod_defs or 'record_derive' in self.instancemethod_defs)
+
+    @property
+    def derive_method(self):
+        if not self.fast_derive:
+            return SourceCodeTemplate(
+                '''
+                    def record_derive(self, **kwargs):
+                        return $derive_by_construction(self, kwargs)
+                ''',
+                derive_by_construction=derive_by_construction,
+            )
+        return SourceCodeTemplate(
+            '''
+                def record_derive(self, **kwargs):
+                    if self.__class__ is not $class_name:
+                        # A subclass that isn't a record itself may have its own constructor
+                        return $derive_by_construction(self, kwargs)
+                    derived = $object_new($class_name)
+                    $copy_fields
+                    $count_instance
+                    for field_id, value in kwargs.items():
+                        derive_field = derive_field_functions.get(field_id)
+                        if derive_field is None:
+                            raise TypeError("record_derive() got an unexpected keyword argument %r" % (field_id,))
+                        derive_field(derived, value)
+                    return $derived
+            ''',
+            class_name=self.class_name,
+            derive_by_construction=derive_by_construction,
+            object_new=object.__new__,
+            copy_fields=Joiner('\n', values=tuple(
+                '{}(derived, self.{})'.format(slot_setter_name(field_id), field_id)
+                for field_id in sorted(self.fields_including_super)
+            )),
+            count_instance=self.count_instance,
+            metrics=self.metrics,
+            derived='$canonical_instance($class_name, derived)' if self.interned else 'derived',
+            canonical_instance=canonical_instance,
+        )
+
+    @property
+    def variant_derive_method(self):
+        if 'record_derive' in self.validated_methods:
+            return self.derive_method
+
+    @property
+    def derive_functions(self):
+        # One function per field, that checks a new value for that field and sets it on a record derived by `record_derive'
+        if not self.fast_derive:
+            return None
+        return Joiner('\n\n', values=tuple(
+            SourceCodeTemplate(
+                '''
+                    def $function_name(self, $field_id):
+                        $sample_values
+                        $field_check
+                        $slot_setter(self, $field_id)
+                ''',
+                function_name=derive_field_function_name(field_id),
+                field_id=field_id,
+                sample_values=self.sample_values,
+                random=self.random,
+                sample_rate=self.sample_rate,
+                field_check=self._field_check(field_id, field),
+                slot_setter=slot_setter_name(field_id),
+            )
+            for field_id, field in sorted(self.fields_including_super.items())
+        ) + (
+            Joiner(', ', 'derive_field_functions = {', '}', tuple(
+                '{!r}: {}'.format(field_id, derive_field_function_name(field_id))
+                for field_id in sorted(self.fields_including_super)
+            )),
+        ))
+
+    def bind_late_values(self, ns_dict):
+        cls = ns_dict[self.class_name]
+        for field_id in self.fields_including_super:
+            # NB `getattr' finds the slots of superclass fields on the superclass that defines them
+            ns_dict[slot_setter_name(field_id)] = getattr(cls, field_id).__set__
+
     @property
     def properties(self):
         if any(prop.fset is not None for prop in self.property_defs.values()):
@@ -240,13 +521,31 @@ class RecordClassTemplate(SourceCodeTemplate):
 
     @property
     def core_methods(self):
+        # Methods, properties, classmethods and staticmethods defined in the class body take precedence over ours
+        user_defined = set(chain(self.instancemethod_defs, self.property_defs, self.classmethod_defs, self.staticmethod_defs))
         return Joiner('\n\n', values=(
             code
             for name, code in self.iter_core_methods()
-            if name not in self.instancemethod_defs
+            if name not in user_defined
         ))
 
     def iter_core_methods(self):
+        yield 'record_derive', self.derive_method
+        yield 'record_draft', '''
+            @classmethod
+            def record_draft(cls, **kwargs):
+                return $draft_class(cls)(**kwargs)
+        '''
+        if 'draft' not in self.fields_including_super:
+            yield 'draft', 'draft = record_draft'
+        yield 'record_update', '''
+            def record_update(self, path, value):
+                return $update_path(self, path, value)
+        '''
+        yield 'record_update_many', '''
+            def record_update_many(self, updates):
+                return $update_paths(self, updates)
+        '''
         yield '__repr__', '''
             def __repr__(self):
                 return "$class_name($repr_str)" % $values_as_tuple
@@ -266,10 +565,17 @@ class RecordClassTemplate(SourceCodeTemplate):
             )),
         )
         # eq, lt and hash defined on the basis of __key__
-        yield '__eq__', '''
-            def __eq__(self, other):
-                return self.__key__() == other.__key__()
-        '''
+        if self.interned:
+            # Equal instances are the same object, except across subclasses, which are interned separately
+            yield '__eq__', '''
+                def __eq__(self, other):
+                    return self is other or self.__key__() == other.__key__()
+            '''
+        else:
+            yield '__eq__', '''
+                def __eq__(self, other):
+                    return self.__key__() == other.__key__()
+            '''
         yield '__lt__', '''
             def __lt__(self, other):
                 return self.__key__() < other.__key__()
@@ -300,6 +606,21 @@ class RecordClassTemplate(SourceCodeTemplate):
     def repr_str(self, field_id, _field_unused):
         return '{}=%r'.format(field_id)
 
+def slot_setter_name(field_id):
+    # NB this can't clash with interned values, whose names all start with "intern___"
+    return 'slot_setter___{}'.format(field_id)
+
+def derive_field_function_name(field_id):
+    return 'derive_field___{}'.format(field_id)
+
+def derive_by_construction(obj, kwargs):
+    """
+    The plain version of `record_derive', which passes all field values to the constructor
+    """
+    values = {field_id: getattr(obj, field_id) for field_id in obj.record_fields}
+    values.update(kwargs)
+    return obj.__class__(**values)
+
 #----------------------------------------------------------------------------------------------------------------------------------
 
 class FieldHandlingStmtsTemplate(SourceCodeTemplate):
@@ -320,8 +641,7 @@ class FieldHandlingStmtsTemplate(SourceCodeTemplate):
         $promote
         $coerce
         $null_check
-        $value_check
-        $type_check
+        $checks
     '''
 
     FieldError = FieldError
@@ -331,6 +651,11 @@ class FieldHandlingStmtsTemplate(SourceCodeTemplate):
     re = re
     integer_types = integer_types
 
+    # See the `validation' module. The record class template sets this, all other users of this template always run all checks.
+    validation_mode = 'full'
+    # In 'sample:' modes, the local variable that says whether the value checks are run
+    sampled_name = '_sampled'
+
     def __init__(self, field, variable_name, description):
         super(FieldHandlingStmtsTemplate, self).__init__()
         self.field = field
@@ -375,9 +700,45 @@ class FieldHandlingStmtsTemplate(SourceCodeTemplate):
     def coerce_invocation(self):
         return ExternalCodeInvocation(self.field.coerce, self.variable_name)
 
+    @property
+    def known_not_null(self):
+        """
+        True if the value can't be None by the time it gets to the value and type checks
+        """
+        return OPTIMIZE[0] and (
+            self.null_check is not None
+            or self.field.coerce in self.KNOWN_COERCE_FUNCTIONS_THAT_NEVER_RETURN_NONE
+            or (self.default_value is not None and self.field.coerce is None)
+        )
+
+    @property
+    def merge_not_null_guards(self):
+        # When a nullable field has both a value check and a type check, they share a single `is not None' test
+        return OPTIMIZE[0] \
+            and self.field.nullable \
+            and not self.known_not_null \
+            and self.value_check is not None \
+            and self.type_check is not None
+
+    @property
+    def checks(self):
+        if self.merge_not_null_guards:
+            return '''
+                if $variable_name is not None:
+                    $value_check
+                    $type_check
+            '''
+        else:
+            return '''
+                $value_check
+                $type_check
+            '''
+
     @property
     def null_check(self):
-        if not self.field.nullable and self.field.coerce not in self.KNOWN_COERCE_FUNCTIONS_THAT_NEVER_RETURN_NONE:
+        if self.validation_mode != 'off' \
+                and not self.field.nullable \
+                and self.field.coerce not in self.KNOWN_COERCE_FUNCTIONS_THAT_NEVER_RETURN_NONE:
             return '''
                 if $variable_name is None:
                     raise $FieldNotNullable("$description cannot be None")
@@ -385,19 +746,38 @@ class FieldHandlingStmtsTemplate(SourceCodeTemplate):
 
     @property
     def value_check(self):
-        if self.field.check is not None:
+        if self.field.check is not None and self.validation_mode not in ('types_only', 'off'):
             return '''
-                if $variable_name is not None and not $check_invocation:
+                if ${value_not_null_and}${sampled_and}not $check_invocation:
                     raise $FieldValueError("$description: %r is not a valid value" % ($variable_name,))
             '''
 
+    @property
+    def value_not_null_and(self):
+        if not (self.known_not_null or self.merge_not_null_guards):
+            return '$variable_name is not None and '
+
+    @property
+    def sampled_and(self):
+        # The variable is set at the start of `__init__', see RecordClassTemplate.sample_values
+        if self.validation_mode.startswith('sample:'):
+            return '{} and '.format(self.sampled_name)
+
     @property
     def check_invocation(self):
-        return ExternalCodeInvocation(self.field.check, self.variable_name)
+        if isinstance(self.field.check, tuple):
+            # All checks are and-ed into a single expression, so that string checks are inlined, and callable checks cost one call
+            # each
+            return Joiner(' and ', '(', ')', values=tuple(
+                ExternalCodeInvocation(check, self.variable_name)
+                for check in self.field.check
+            ))
+        else:
+            return ExternalCodeInvocation(self.field.check, self.variable_name)
 
     @property
     def type_check(self):
-        if self.field.coerce is not self.field.type:
+        if self.validation_mode != 'off' and not self.coerce_ensures_type:
             return '''
                 if $not_null_and not $type_check_expr:
                     raise $FieldTypeError("$description should be of type $field_type_name, not %s (%r)" % (
@@ -406,6 +786,18 @@ class FieldHandlingStmtsTemplate(SourceCodeTemplate):
                     ))
             '''
 
+    @property
+    def coerce_ensures_type(self):
+        coerce = self.field.coerce
+        if coerce is self.field.type:
+            return True
+        # Builtin types always return an instance of themselves, so e.g. a `bool' field coerced with `int' still needs its type
+        # checked, but an `int' field coerced with `bool' doesn't
+        return OPTIMIZE[0] \
+            and coerce in self.KNOWN_COERCE_FUNCTIONS_THAT_NEVER_RETURN_NONE \
+            and self.field.type is not RecursiveType \
+            and issubclass(coerce, self.field.type)
+
     @property
     def type_check_expr(self):
         if self.field.type is RecursiveType:
@@ -419,7 +811,7 @@ class FieldHandlingStmtsTemplate(SourceCodeTemplate):
 
     @property
     def not_null_and(self):
-        if self.field.nullable:
+        if self.field.nullable and not (self.known_not_null or self.merge_not_null_guards):
             return '$variable_name is not None and '
 
 #----------------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Reference-preserving PODS encoding.
+
+By default, `record_pods' encodes a record or collection in full every time it's reached, so an object that is shared by many
+parents is repeated in the PODS, and decoded back into as many separate objects. With `record_pods(refs=True)', each record or
+collection that is reached more than once is encoded in full the first time only, wrapped as
+
+    {"$id": 3, "$pods": {...}}
+
+and every time after that as
+
+    {"$ref": 3}
+
+`from_pods(pods, refs=True)' decodes such a PODS, and returns a graph with the same sharing. Objects are shared by identity, so
+equal objects that aren't the same object are still encoded separately. A `dict_of' value whose PODS has the same keys as one of
+these wrappers can't be encoded with refs.
+
+As with `dedupe', the state of the encoding or decoding is kept in a thread-local while it runs. Values decoded with refs=True are
+not deduplicated.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from threading import local
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# constants, config
+
+REF_KEY = '$ref'
+ID_KEY = '$id'
+PODS_KEY = '$pods'
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# encoding
+
+class RefsEncoder(object):
+
+    def __init__(self, root):
+        self.counts = count_references(root)
+        self.ids = {}
+
+    def encode(self, value, encode_value):
+        """
+        Returns the PODS for `value', a record or collection reached from the root, which `encode_value' computes when needed
+        """
+        if self.counts.get(id(value), 0) < 2:
+            return check_not_wrapper_like(encode_value(value))
+        ref_id = self.ids.get(id(value))
+        if ref_id is not None:
+            return {REF_KEY: ref_id}
+        ref_id = self.ids[id(value)] = len(self.ids)
+        return {ID_KEY: ref_id, PODS_KEY: check_not_wrapper_like(encode_value(value))}
+
+
+def count_references(root):
+    """
+    Returns a dict that maps the `id' of each record and collection reachable from `root' to the number of times it is reached.
+    Each object is only looked into once.
+    """
+    counts = {}
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        num_refs = counts.get(id(obj), 0)
+        counts[id(obj)] = num_refs + 1
+        if num_refs == 0:
+            cls = type(obj)
+            if hasattr(cls, 'record_fields'):
+                children = (getattr(obj, field_id) for field_id in cls.record_fields)
+            elif hasattr(cls, 'key_field'):
+                children = (child for item in obj.items() for child in item)
+            else:
+                children = obj
+            stack.extend(child for child in children if is_shareable(child))
+    return counts
+
+def is_shareable(value):
+    cls = type(value)
+    return hasattr(cls, 'record_fields') or hasattr(cls, 'element_field') or hasattr(cls, 'key_field')
+
+def check_not_wrapper_like(pods):
+    if isinstance(pods, dict) and len(pods) <= 2 and (REF_KEY in pods or ID_KEY in pods):
+        # NB imported here since the pods module imports this one
+        from .pods import CannotBeSerializedToPods
+        raise CannotBeSerializedToPods('Cannot encode %r with refs, as it looks like a reference' % (pods,))
+    return pods
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# decoding
+
+class RefsDecoder(object):
+
+    def __init__(self, root_pods):
+        self.root_pods = root_pods
+        self.objects = {}
+        # Maps each ID to the PODS it wraps. Only built if a reference comes before the object it refers to, which can happen when
+        # the PODS was reordered, e.g. dict keys sorted by a JSON encoder.
+        self.pods_by_id = None
+
+    def decode(self, pods, decode_value):
+        if pods is None:
+            return None
+        elif isinstance(pods, dict) and len(pods) == 1 and REF_KEY in pods:
+            ref_id = pods[REF_KEY]
+            obj = self.objects.get(ref_id)
+            if obj is None:
+                obj = self.objects[ref_id] = decode_value(self._find_pods(ref_id))
+            return obj
+        elif isinstance(pods, dict) and len(pods) == 2 and ID_KEY in pods and PODS_KEY in pods:
+            ref_id = pods[ID_KEY]
+            obj = self.objects.get(ref_id)
+            if obj is None:
+                obj = self.objects[ref_id] = decode_value(pods[PODS_KEY])
+            return obj
+        else:
+            return decode_value(pods)
+
+    def _find_pods(self, ref_id):
+        if self.pods_by_id is None:
+            self.pods_by_id = {}
+            stack = [self.root_pods]
+            while stack:
+                pods = stack.pop()
+                if isinstance(pods, dict):
+                    if len(pods) == 2 and ID_KEY in pods and PODS_KEY in pods:
+                        self.pods_by_id[pods[ID_KEY]] = pods[PODS_KEY]
+                    stack.extend(pods.values())
+                elif isinstance(pods, list):
+                    stack.extend(pods)
+        try:
+            return self.pods_by_id[ref_id]
+        except KeyError:
+            raise ValueError('Reference to unknown object %r' % (ref_id,))
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# state
+
+class RefsState(local):
+    # Set while `record_pods(refs=True)' and `from_pods(refs=True)' run, respectively. Read by the generated methods.
+    encoder = None
+    decoder = None
+
+REFS_STATE = RefsState()
+
+
+class RefsBlock(object):
+
+    def __init__(self, attr, value):
+        self.attr = attr
+        self.value = value
+        self.previous_value = None
+
+    def __enter__(self):
+        self.previous_value = getattr(REFS_STATE, self.attr)
+        setattr(REFS_STATE, self.attr, self.value)
+
+    def __exit__(self, *exc_info):
+        setattr(REFS_STATE, self.attr, self.previous_value)
+
+
+def encoding_refs(root):
+    return RefsBlock('encoder', RefsEncoder(root))
+
+def decoding_refs(root_pods):
+    return RefsBlock('decoder', RefsDecoder(root_pods))
+
+#----------------------------------------------------------------------------------------------------------------------------------
@@ -9,20 +9,24 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 # standards
 import re
+from weakref import WeakKeyDictionary
 
 # this module
+from .basics import EnumCheck
 from .record import Field, compile_field
-from .utils.codegen import SourceCodeTemplate
-from .utils.compatibility import bytes_type, native_string, text_type
+from .utils.compatibility import PY2, bytes_type, native_string, text_type
 
 #----------------------------------------------------------------------------------------------------------------------------------
 
 def value_check(name, check):
     def func(field):
         field = compile_field(field)
-        if field.check is not None:
-            raise Exception("I haven't looked into how to chain value checks yet")
-        return field.derive(check=check)
+        if field.check is None:
+            return field.derive(check=check)
+        else:
+            # The field's existing checks run first
+            existing_checks = field.check if isinstance(field.check, tuple) else (field.check,)
+            return field.derive(check=existing_checks + (check,))
     func.__name__ = native_string(name)
     return func
 
@@ -33,17 +37,35 @@ strictly_positive = value_check('strictly_positive', '{} > 0')
 
 #----------------------------------------------------------------------------------------------------------------------------------
 
+def fullmatch_function(regex):
+    """
+    Returns the `fullmatch' method of the compiled regex. The method object is interned into the generated code, so checking a value
+    costs one call, with no lookup in the `re' module's cache.
+    """
+    if PY2:
+        # No `fullmatch' in Python 2
+        return re.compile((('(?:%s)\\Z' if isinstance(regex, text_type) else b'(?:%s)\\Z') % regex)).match
+    else:
+        return re.compile(regex).fullmatch
+
 def regex_check(name, char_def):
     def func(n=None):
-        multiplier = ('{{%d}}' % n) if n is not None else '*'
-        field = Field(
+        multiplier = ('{%d}' % n) if n is not None else '*'
+        value_regex = '[%s]%s' % (char_def, multiplier)
+        check = fullmatch_function(value_regex)
+        # None of the char_defs match a newline, so we can validate a whole column of values with a single regex match over the
+        # values joined with newlines, see `check_many'
+        COLUMN_CHECKS[check.__self__] = fullmatch_function('(?:%s\n)*%s' % (value_regex, value_regex))
+        return Field(
             type=text_type,
-            check="$re.search(r'^[%s]%s$',{})" % (char_def, multiplier),
+            check=check,
         )
-        return field
     func.__name__ = native_string(name)
     return func
 
+# Maps the compiled patterns used by the above to a function that checks a column of values, joined with newlines
+COLUMN_CHECKS = {}
+
 uppercase_letters = regex_check('uppercase_letters', 'A-Z')
 uppercase_wchars = regex_check('uppercase_wchars', 'A-Z0-9_')
 uppercase_hex = regex_check('uppercase_hex', '0-9A-F')
@@ -56,20 +78,52 @@ digits_str = regex_check('digits_str', '0-9')
 
 absolute_http_url = Field(
     type=bytes_type,
-    check=SourceCodeTemplate(
-        "$re.search(r'^https?://.{{1, 2000}}$', {})",
-        re=re,
-    ),
+    check=fullmatch_function(br'https?://.{1,2000}'),
 )
 
+#----------------------------------------------------------------------------------------------------------------------------------
+# batch checks
+
+def check_many(field, values):
+    """
+    Runs all the checks of `field' on each of the given values, like a record constructor would, and returns the values as a list,
+    after any default values and coercion have been applied. Raises a FieldError for the first invalid value.
+
+    If the field was built by one of the regex shortcuts above, and has no defaults or coercion, all the values are checked in a
+    single regex match. The per-value checks only run if that fails, to find which value is invalid.
+    """
+    field = compile_field(field)
+    values = list(values)
+    column_check = COLUMN_CHECKS.get(getattr(field.check, '__self__', None))
+    if column_check is not None \
+            and field.coerce is None \
+            and field.default is None \
+            and set(map(type, values)) <= set([field.type]):
+        column = '\n'.join(values)
+        # NB the count ensures that none of the values themselves contain a newline
+        if column.count('\n') == len(values) - 1 and column_check(column) is not None:
+            return values
+    return list(_elems_checker(field)(values))
+
+# Maps field objects to the `check_elems' function of a sequence of that field
+ELEMS_CHECKERS = WeakKeyDictionary()
+
+def _elems_checker(field):
+    checker = ELEMS_CHECKERS.get(field)
+    if checker is None:
+        from .collections import seq_of  # imported here since `tdds.collections' is loaded lazily
+        checker = ELEMS_CHECKERS[field] = seq_of(field).type.check_elems
+    return checker
+
 #----------------------------------------------------------------------------------------------------------------------------------
 # other field def utils
 
 class EnumField(Field):
 
-    def __init__(self, type, possible_values, **kwargs):
-        kwargs['check'] = possible_values.__contains__
-        object.__setattr__(self, 'possible_values', possible_values)
+    def __init__(self, type, values, **kwargs):
+        check = EnumCheck(values)
+        kwargs['check'] = check
+        object.__setattr__(self, 'possible_values', check.possible_values)
         super(EnumField, self).__init__(type, **kwargs)
 
 def one_of(*values, **kwargs):
@@ -82,7 +136,6 @@ def one_of(*values, **kwargs):
                 type.__name__,
                 v.__class__.__name__,
             ))
-    values = frozenset(values)
     return EnumField(type, values, **kwargs)
 
 def nullable(field, default=None):
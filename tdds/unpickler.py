@@ -7,6 +7,9 @@
 # 2+3 compat
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+# this module
+from .dedupe import DEDUPE_STATE
+
 #----------------------------------------------------------------------------------------------------------------------------------
 
 # Because Records are dynamically created classes that are compiled within a function, 'pickle' cannot find the class definition by
@@ -39,6 +42,11 @@ class RecordUnpickler(object):
         self.class_name = class_name
 
     def __call__(self, *values):
-        return ALL_RECORDS[self.class_name](*values)
+        obj = ALL_RECORDS[self.class_name](*values)
+        # Within a `dedupe' block, equal records are shared, as when they're decoded by `from_pods'
+        dedupe_table = DEDUPE_STATE.table
+        if dedupe_table is not None:
+            obj = dedupe_table.value(obj)
+        return obj
 
 #----------------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+An asyncio version of the builders in `builder.py', for when field methods do I/O, e.g. fetching a sub-page or calling a lookup
+service. Field methods can be coroutines, and all fields of a record are evaluated concurrently, so that building a record takes
+about as long as its slowest field rather than the sum of all of them.
+
+This module uses Python 3.5+ syntax, and is not imported under Python 2.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# standards
+import asyncio
+from functools import wraps
+from inspect import isawaitable
+
+# this module
+from .builder import BuilderMetaClass
+from .compatibility import native_string
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class AsyncBuilderMetaClass(BuilderMetaClass):
+    """
+    Same as BuilderMetaClass, but the methods generated for "x_and_y" fields are coroutines. The "x_and_y" method itself is only
+    called once even if "x" and "y" are awaited concurrently: the first caller stores a future on `self', and all others await it.
+    """
+
+    compile_call = False
+
+    @staticmethod
+    def _single_field_method(memoized_method, field_index):
+        async def single_field_method(self):
+            return (await memoized_method(self))[field_index]
+        return single_field_method
+
+    @staticmethod
+    def _memoize(name, method):
+        cache_attribute = '__%s_cache' % name
+        @wraps(method)
+        def wrapped(self, *args, **kwargs):
+            future = self.__dict__.get(cache_attribute)
+            if future is None:
+                future = self.__dict__[cache_attribute] = asyncio.ensure_future(
+                    _await_as_tuple(method(self, *args, **kwargs))
+                )
+            return future
+        return wrapped
+
+
+async def _await_as_tuple(value):
+    if isawaitable(value):
+        value = await value
+    if callable(getattr(value, '__iter__', None)) \
+            and not callable(getattr(value, '__len__', None)):
+        value = tuple(value)
+    return value
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class AsyncBuilderBase(AsyncBuilderMetaClass(native_string('AsyncBuilderRoot'), (object,), {})):
+    """
+    Like BuilderBase, but calling an instance returns a coroutine. Field methods may be plain methods or coroutines, and they are
+    all awaited concurrently. If `max_concurrency' is set, no more than that many field methods run at the same time.
+    """
+
+    record_cls = None
+    max_concurrency = None
+
+    def _on_error(self, exception):
+        pass
+
+    async def __call__(self, semaphore=None):
+        if semaphore is None and self.max_concurrency is not None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            field_ids = sorted(self.record_cls.record_fields)
+            values = await asyncio.gather(*(
+                self._field_value(field_id, semaphore)
+                for field_id in field_ids
+            ))
+            return self.record_cls(**dict(zip(field_ids, values)))  # pylint: disable=not-callable
+        except Exception as ex:
+            self._on_error(ex)
+            raise
+
+    async def _field_value(self, field_id, semaphore):
+        value = getattr(self, field_id, None)
+        if callable(value):
+            if semaphore is None:
+                value = value()
+                if isawaitable(value):
+                    value = await value
+            else:
+                async with semaphore:
+                    value = value()
+                    if isawaitable(value):
+                        value = await value
+        return value
+
+    @classmethod
+    async def build_many(cls, inputs):
+        """
+        Builds one record from each of the given inputs, all concurrently. The `max_concurrency' limit, if set, applies to the whole
+        batch.
+        """
+        semaphore = asyncio.Semaphore(cls.max_concurrency) if cls.max_concurrency is not None else None
+        return list(await asyncio.gather(*(
+            cls(value)(semaphore)
+            for value in inputs
+        )))
+
+
+def async_builder(record_cls):
+    return type(
+        native_string('%sAsyncBuilder' % record_cls.__name__),
+        (AsyncBuilderBase,),
+        {'record_cls': record_cls},
+    )
+
+#----------------------------------------------------------------------------------------------------------------------------------
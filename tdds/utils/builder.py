@@ -9,6 +9,12 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 # standards
 from functools import wraps
+from itertools import repeat
+from types import FunctionType
+
+# this module
+from .codegen import Joiner, SourceCodeTemplate, compile_expr
+from .compatibility import native_string
 
 #----------------------------------------------------------------------------------------------------------------------------------
 
@@ -17,14 +23,23 @@ class BuilderMetaClass(type):
     If a Builder class for a record class R defines a method called "x_and_y", and "x" and "y" are both fields of R, then new
     methods named "x" and "y" are automatically created, and when either is called, it will call "x_and_y", cache the result (on
     `self'), and return the corresponding value.
+
+    This also compiles a `__call__' method specific to each Builder class, see BuilderCallTemplate below.
     """
 
     def __new__(mcs, name, bases, attrib):
-        return type.__new__(mcs, name, bases, dict(mcs._expand_multiple_field_methods(bases, attrib)))
+        attrib = dict(mcs._expand_multiple_field_methods(bases, attrib))
+        cls = type.__new__(mcs, name, bases, attrib)
+        if mcs.compile_call and getattr(cls, 'record_cls', None) is not None and '__call__' not in attrib:
+            cls.__call__ = compile_expr(BuilderCallTemplate(cls), '__call__', name='{}.__call__'.format(name))
+        return cls
+
+    # subclasses of this metaclass can set this to False if they provide their own `__call__'
+    compile_call = True
 
     @classmethod
     def _expand_multiple_field_methods(mcs, bases, attrib):
-        record_cls = mcs._find_record_cls(bases)
+        record_cls = attrib.get('record_cls') or mcs._find_record_cls(bases)
         for key, value in attrib.items():
             if record_cls is not None \
                     and '_and_' in key \
@@ -44,7 +59,7 @@ class BuilderMetaClass(type):
             record_cls = getattr(b, 'record_cls', None)
             if record_cls:
                 return record_cls
-        return Exception('record_cls not found')
+        return None
 
     @staticmethod
     def _single_field_method(memoized_method, field_index):
@@ -53,20 +68,68 @@ class BuilderMetaClass(type):
     @staticmethod
     def _memoize(name, method):
         cache_attribute = '__%s_cache' % name
+        not_cached = object()
         @wraps(method)
         def wrapped(self, *args, **kwargs):
-            if not hasattr(self, cache_attribute):
+            # NB reading from `__dict__' directly saves a hasattr and a getattr on every cached access
+            value = self.__dict__.get(cache_attribute, not_cached)
+            if value is not_cached:
                 value = method(self, *args, **kwargs)
                 if callable(getattr(value, '__iter__', None)) \
                         and not callable(getattr(value, '__len__', None)):
                     value = tuple(value)
-                setattr(self, cache_attribute, value)
-            return getattr(self, cache_attribute)
+                self.__dict__[cache_attribute] = value
+            return value
         return wrapped
 
 #----------------------------------------------------------------------------------------------------------------------------------
 
-class BuilderBase(object):
+class BuilderCallTemplate(SourceCodeTemplate):
+    """
+    Generates the `__call__' method of a Builder class. Where the Builder class defines a plain method for a field, the method is
+    called directly. Any other field value (a property, a class attribute, or an attribute set on the instance) is looked up at
+    runtime, the same way as `BuilderBase.__call__' does.
+    """
+
+    template = '''
+        def __call__(self):
+            try:
+                return $record_cls($kwargs)
+            except Exception as ex:
+                self._on_error(ex)
+                raise
+    '''
+
+    def __init__(self, builder_cls):
+        super(BuilderCallTemplate, self).__init__()
+        self.record_cls = builder_cls.record_cls
+        self.kwargs = Joiner(', ', values=tuple(
+            self._kwarg(builder_cls, field_id)
+            for field_id in sorted(builder_cls.record_cls.record_fields)
+        ))
+
+    @staticmethod
+    def _kwarg(builder_cls, field_id):
+        if isinstance(getattr(builder_cls, field_id, None), FunctionType):
+            return '{0}=self.{0}()'.format(field_id)
+        else:
+            return SourceCodeTemplate(
+                '$field_id=$field_value(self, $field_id_str)',
+                field_id=field_id,
+                field_value=field_value,
+                field_id_str=repr(field_id),
+            )
+
+
+def field_value(builder, field_id):
+    value = getattr(builder, field_id, None)
+    if callable(value):
+        value = value()
+    return value
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class BuilderBase(BuilderMetaClass(native_string('BuilderRoot'), (object,), {})):
     """
     Subclasses of this are for taking some input value (typically an HTML Element, but could be anything), and parsing from it an
     instance of some Record data structure. Instances are single-use: you need to build a new instance for every object that gets
@@ -76,29 +139,43 @@ class BuilderBase(object):
     show that this is overkill and cumbersome, maybe I'll end up using it all the time, we'll see.
     """
 
-    __metaclass__ = BuilderMetaClass
-
     record_cls = None
 
     def _on_error(self, exception):
         pass
 
     def __call__(self):
+        # This is only used by Builder classes that don't have a `record_cls'. The metaclass compiles a specialised version of this
+        # for all others.
         try:
             kwargs = {}
             for field_id in self.record_cls.record_fields.keys():
-                value = getattr(self, field_id, None)
-                if callable(value):
-                    value = value()
-                kwargs[field_id] = value
+                kwargs[field_id] = field_value(self, field_id)
             return self.record_cls(**kwargs)  # pylint: disable=not-callable
         except Exception as ex:
             self._on_error(ex)
             raise
 
+    @classmethod
+    def build_many(cls, inputs, executor=None):
+        """
+        Builds one record from each of the given inputs, each of which is passed as the single argument to the Builder's
+        constructor. If an `executor' is given (e.g. a `concurrent.futures' ThreadPoolExecutor or ProcessPoolExecutor), the work is
+        spread over it. With a process pool, the Builder class must be importable by name, like for any other pickled class.
+        """
+        if executor is None:
+            return [cls(value)() for value in inputs]
+        else:
+            return list(executor.map(build_one, repeat(cls), inputs))
+
+
+def build_one(builder_cls, value):
+    return builder_cls(value)()
+
+
 def builder(record_cls):
     return type(
-        '%sBuilder' % record_cls.__name__,
+        native_string('%sBuilder' % record_cls.__name__),
         (BuilderBase,),
         {'record_cls': record_cls},
     )
@@ -12,9 +12,12 @@ A toolset for building and evaluating strings of Python code.
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 # standards
+from contextlib import contextmanager
 from itertools import count
+import linecache
 import logging
 import re
+from timeit import default_timer
 
 from .compatibility import python_builtins, string_types
 
@@ -165,31 +168,128 @@ class ClassDefEvaluationNamespace(object):
 #----------------------------------------------------------------------------------------------------------------------------------
 # compilation functions
 
-def compile_template(template, verbose=False):
+def compile_template(template, verbose=False, name=None):
+    """
+    Expands and evaluates the template, and returns the resulting namespace dict. The expanded source is available in that dict
+    under `__tdds_source__'.
+
+    The code is compiled with a pseudo-filename built from `name', e.g. "<tdds:Album>", and its source registered with `linecache',
+    so that tracebacks and profilers can show the generated lines.
+    """
     ns = ClassDefEvaluationNamespace()
+    start_time = default_timer()
     src_code_str = template.expand(ns)
+    expanded_time = default_timer()
     if verbose:
         logging.debug('\n%s', src_code_str)
+    filename = register_source(name or 'code', src_code_str)
     ns_dict = ns.as_dict()
     try:
-        eval(  # yes, pylint: disable=eval-used
-            compile(src_code_str, '<string>', 'exec'),
-            ns_dict,
-            ns_dict,
-        )
+        code = compile(src_code_str, filename, 'exec')
     except SyntaxError:
         logging.error(src_code_str)
         raise
+    compiled_time = default_timer()
+    eval(code, ns_dict, ns_dict)  # yes, pylint: disable=eval-used
+    # Some values, like the slot descriptors of a class defined by the code, can only be looked up once the code has run
+    bind_late_values = getattr(template, 'bind_late_values', None)
+    if bind_late_values is not None:
+        bind_late_values(ns_dict)
+    phase_timings = PHASE_TIMINGS[0]
+    if phase_timings is not None:
+        phase_timings['expand'] += expanded_time - start_time
+        phase_timings['compile'] += compiled_time - expanded_time
+        phase_timings['exec'] += default_timer() - compiled_time
+    ns_dict['__tdds_source__'] = src_code_str
     return ns_dict
 
-def compile_expr(template, expr_name=None, verbose=False):
+def compile_expr(template, expr_name=None, verbose=False, name=None):
+    """
+    Like `compile_template', but returns only the value named `expr_name'. If that value is a class, the expanded source is saved
+    on it as `__tdds_source__'.
+    """
     if expr_name is None:
         m = re.search(r'^\s*(?:class|def)\s+(\w+)', template)
         if m is None:
             raise ValueError('expr_name not specified and not found in template')
         expr_name = m.group(1)
-    ns_dict = compile_template(template, verbose=verbose)
-    return ns_dict[expr_name]
+    ns_dict = compile_template(template, verbose=verbose, name=name or expr_name)
+    expr = ns_dict[expr_name]
+    if isinstance(expr, type):
+        expr.__tdds_source__ = ns_dict['__tdds_source__']
+    return expr
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# optimizations
+
+# Templates check this when they're expanded, and if it's set, generate code that is faster but less straightforward: null checks
+# merged together, checks that can be seen to always pass left out, etc. Cleared by `unoptimized'.
+OPTIMIZE = [True]
+
+@contextmanager
+def unoptimized():
+    """
+    Within this context manager, templates generate the plain version of their code. Used by the tests and benchmarks, to compare
+    the two versions.
+    """
+    previous = OPTIMIZE[0]
+    OPTIMIZE[0] = False
+    try:
+        yield
+    finally:
+        OPTIMIZE[0] = previous
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# phase timings
+
+# Set by `record_phase_timings'
+PHASE_TIMINGS = [None]
+
+@contextmanager
+def record_phase_timings():
+    """
+    Within this context manager, `compile_template' adds the time it spends expanding, compiling and executing code to the dict
+    that is yielded. Used by the benchmarks.
+    """
+    phase_timings = {'expand': 0.0, 'compile': 0.0, 'exec': 0.0}
+    previous = PHASE_TIMINGS[0]
+    PHASE_TIMINGS[0] = phase_timings
+    try:
+        yield phase_timings
+    finally:
+        PHASE_TIMINGS[0] = previous
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# source registration
+
+# Number of times each name was passed to `register_source', so that each compiled unit gets its own filename
+SOURCE_NAME_COUNTS = {}
+
+def register_source(name, src_code_str):
+    """
+    Picks a unique pseudo-filename for a piece of generated code, and registers the code with `linecache' under that name. Returns
+    the filename.
+    """
+    num = SOURCE_NAME_COUNTS[name] = SOURCE_NAME_COUNTS.get(name, 0) + 1
+    if num == 1:
+        filename = '<tdds:{}>'.format(name)
+    else:
+        filename = '<tdds:{}#{:d}>'.format(name, num)
+    # NB the mtime is None so that `linecache.checkcache' never discards the entry, since there is no file to check against
+    linecache.cache[filename] = (
+        len(src_code_str),
+        None,
+        src_code_str.splitlines(True),
+        filename,
+    )
+    return filename
+
+def is_generated_function(func):
+    """
+    True if `func' was compiled by `compile_template'
+    """
+    code = getattr(func, '__code__', None)
+    return code is not None and code.co_filename.startswith('<tdds:')
 
 #----------------------------------------------------------------------------------------------------------------------------------
 # utils
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Validation modes. These control which checks the record constructors run:
+
+    'full'          all checks, the default
+    'types_only'    null and type checks, but no value checks (the `check' functions and regexes)
+    'sample:0.01'   like 'types_only', plus the value checks for a random 1% of constructions
+    'off'           no checks at all. Default values, coercion and the promotion of dicts to records still happen, since they change
+                    the values that get stored.
+
+When Python runs with -O, the default mode is 'off'.
+
+Each record class has a separate `__init__' and `record_derive' for each mode, generated the first time that mode is used, so the
+mode costs nothing per call. Setting the mode replaces those methods on every record class. This means that the mode is global to
+the process, and that changing it isn't thread-safe.
+
+    tdds.validation('types_only')      # from now on
+    with tdds.validation('off'):       # only within the `with' block
+        ...
+
+The collection classes (seq_of etc) always check their elements.
+"""
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+import re
+from threading import RLock
+from weakref import WeakSet
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# constants, config
+
+VALIDATION_MODES = ('full', 'types_only', 'off')
+
+CURRENT_VALIDATION_MODE = ['full' if __debug__ else 'off']
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class RecordInitVariants(object):
+    """
+    The `__init__' variants of one record class, keyed by validation mode. `compile_variant' is called with a mode and returns a
+    dict of the methods for that mode, i.e. `__init__' and any other method that runs the field checks.
+    """
+
+    def __init__(self, compile_variant):
+        self.compile_variant = compile_variant
+        self.by_mode = {}
+
+    def get(self, mode):
+        init = self.by_mode.get(mode)
+        if init is None:
+            init = self.by_mode[mode] = self.compile_variant(mode)
+        return init
+
+# All record classes that have init variants. The variants themselves are stored on each class, under INIT_VARIANTS_ATTR, rather
+# than in a dict keyed by class, since they refer to the class, and so would keep it alive.
+ALL_RECORD_CLASSES = WeakSet()
+
+INIT_VARIANTS_ATTR = '_record_init_variants'
+
+LOCK = RLock()
+
+def register_record_class(cls, method_names, compile_variant):
+    with LOCK:
+        variants = RecordInitVariants(compile_variant)
+        # The class was compiled for the current mode
+        variants.by_mode[CURRENT_VALIDATION_MODE[0]] = {name: cls.__dict__[name] for name in method_names}
+        setattr(cls, INIT_VARIANTS_ATTR, variants)
+        ALL_RECORD_CLASSES.add(cls)
+
+
+class RestoreValidationMode(object):
+
+    def __init__(self, previous_mode):
+        self.previous_mode = previous_mode
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        set_validation_mode(self.previous_mode)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# public interface
+
+def validation(mode):
+    """
+    Sets the validation mode, and returns a context manager that sets it back to what it was before, so that this can be used
+    either on its own or in a `with' statement.
+    """
+    previous_mode = CURRENT_VALIDATION_MODE[0]
+    set_validation_mode(mode)
+    return RestoreValidationMode(previous_mode)
+
+def set_validation_mode(mode):
+    mode = check_validation_mode(mode)
+    with LOCK:
+        if mode != CURRENT_VALIDATION_MODE[0]:
+            for cls in list(ALL_RECORD_CLASSES):
+                # NB `vars', so that subclasses don't get the variants of their superclass
+                for name, method in vars(cls)[INIT_VARIANTS_ATTR].get(mode).items():
+                    setattr(cls, name, method)
+            CURRENT_VALIDATION_MODE[0] = mode
+
+def current_validation_mode():
+    return CURRENT_VALIDATION_MODE[0]
+
+def check_validation_mode(mode):
+    """
+    Checks that `mode' is a valid mode, and returns it in canonical form
+    """
+    if mode in VALIDATION_MODES:
+        return mode
+    match = re.search(r'^sample:(\d*\.?\d+(?:e-?\d+)?)$', mode or '')
+    if match:
+        rate = float(match.group(1))
+        if 0 <= rate <= 1:
+            return 'sample:%r' % rate
+    raise ValueError('Unknown validation mode: %r' % (mode,))
+
+def sample_rate(mode):
+    """
+    Returns the proportion of constructions that run their value checks in the given mode
+    """
+    if mode.startswith('sample:'):
+        return float(mode[len('sample:'):])
+    elif mode == 'full':
+        return 1.0
+    else:
+        return 0.0
+
+#----------------------------------------------------------------------------------------------------------------------------------
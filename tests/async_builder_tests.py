@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# standards
+import asyncio
+from time import time
+
+# tdds
+from tdds import Record, nullable
+from tdds.utils.async_builder import async_builder
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import assert_eq, build_test_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+class Page(Record):
+    title = text_type
+    author = text_type
+    year = int
+    notes = nullable(text_type)
+
+
+class FakeService(object):
+    """
+    Stands in for a remote lookup service. Every call takes `delay' seconds, and we keep track of how many calls are in flight.
+    """
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def lookup(self, key, value):
+        self.calls.append(key)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return value
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+@test('async builders await coroutine field methods concurrently')
+def _():
+    service = FakeService(delay=0.1)
+    class PageBuilder(async_builder(Page)):
+        def __init__(self, url):
+            self.url = url
+        async def title(self):
+            return await service.lookup('title', 'Title of %s' % self.url)
+        async def author(self):
+            return await service.lookup('author', 'Smith')
+        async def year(self):
+            return await service.lookup('year', 2000)
+    started = time()
+    page = _run(PageBuilder('/a')())
+    assert_eq(page, Page(title='Title of /a', author='Smith', year=2000))
+    assert_eq(service.max_in_flight, 3)
+    assert time() - started < 0.25, time() - started
+
+@test('async builders can mix plain methods, attributes and coroutines')
+def _():
+    service = FakeService()
+    class PageBuilder(async_builder(Page)):
+        author = 'Smith'
+        def __init__(self, url):
+            self.url = url
+        def title(self):
+            return self.url.upper()
+        async def year(self):
+            return await service.lookup('year', 1999)
+    assert_eq(_run(PageBuilder('/b')()), Page(title='/B', author='Smith', year=1999))
+
+@test('async x_and_y builder methods are awaited only once, even though both fields are evaluated concurrently')
+def _():
+    service = FakeService()
+    class PageBuilder(async_builder(Page)):
+        year = 2001
+        async def title_and_author(self):
+            return await service.lookup('title_and_author', ('T', 'A'))
+    assert_eq(_run(PageBuilder()()), Page(title='T', author='A', year=2001))
+    assert_eq(service.calls, ['title_and_author'])
+
+@test('async builders respect max_concurrency')
+def _():
+    service = FakeService()
+    class PageBuilder(async_builder(Page)):
+        max_concurrency = 1
+        async def title(self):
+            return await service.lookup('title', 'T')
+        async def author(self):
+            return await service.lookup('author', 'A')
+        async def year(self):
+            return await service.lookup('year', 1)
+    assert_eq(_run(PageBuilder()()), Page(title='T', author='A', year=1))
+    assert_eq(service.max_in_flight, 1)
+
+@test('async build_many builds many records concurrently, with max_concurrency applying to the whole batch')
+def _():
+    service = FakeService()
+    class PageBuilder(async_builder(Page)):
+        max_concurrency = 2
+        author = 'A'
+        year = 1
+        def __init__(self, url):
+            self.url = url
+        async def title(self):
+            return await service.lookup('title', self.url)
+    pages = _run(PageBuilder.build_many(['/%d' % i for i in range(5)]))
+    assert_eq([p.title for p in pages], ['/%d' % i for i in range(5)])
+    assert_eq(service.max_in_flight, 2)
+
+#----------------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from concurrent.futures import ThreadPoolExecutor
+
+# tdds
+from tdds import FieldTypeError, Record, builder, nullable
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import assert_eq, assert_raises, build_test_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+class Point(Record):
+    x = int
+    y = int
+    label = nullable(text_type)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+@test('builders call one method per field')
+def _():
+    class PointBuilder(builder(Point)):
+        def __init__(self, text):
+            self.text = text
+        def x(self):
+            return int(self.text.split(',')[0])
+        def y(self):
+            return int(self.text.split(',')[1])
+    assert_eq(PointBuilder('1,2')(), Point(x=1, y=2))
+
+@test('builders can use class attributes, instance attributes and properties as field values')
+def _():
+    class PointBuilder(builder(Point)):
+        x = 1
+        def __init__(self, y):
+            self.y = y
+        @property
+        def label(self):
+            return 'p%d' % self.y
+    assert_eq(PointBuilder(2)(), Point(x=1, y=2, label='p2'))
+
+@test('builder fields with no value are None')
+def _():
+    class PointBuilder(builder(Point)):
+        x = 1
+        y = 2
+    assert_eq(PointBuilder()().label, None)
+
+@test('x_and_y builder methods are called once and their result is split between fields')
+def _():
+    calls = []
+    class PointBuilder(builder(Point)):
+        def __init__(self, text):
+            self.text = text
+        def x_and_y(self):
+            calls.append(self.text)
+            return map(int, self.text.split(','))
+    assert_eq(PointBuilder('3,4')(), Point(x=3, y=4))
+    assert_eq(calls, ['3,4'])
+
+@test('builders pass exceptions to _on_error before raising them')
+def _():
+    errors = []
+    class PointBuilder(builder(Point)):
+        x = 'not an int'
+        y = 2
+        def _on_error(self, exception):
+            errors.append(exception.__class__)
+    with assert_raises(FieldTypeError):
+        PointBuilder()()
+    assert_eq(errors, [FieldTypeError])
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# batches
+
+class CsvPointBuilder(builder(Point)):
+    def __init__(self, text):
+        self.text = text
+    def x_and_y(self):
+        return map(int, self.text.split(','))
+
+@test('build_many builds one record per input')
+def _():
+    assert_eq(
+        CsvPointBuilder.build_many(['1,2', '3,4']),
+        [Point(x=1, y=2), Point(x=3, y=4)],
+    )
+
+@test('build_many can spread the work over an executor')
+def _():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert_eq(
+            CsvPointBuilder.build_many(['%d,%d' % (i, i) for i in range(10)], executor=executor),
+            [Point(x=i, y=i) for i in range(10)],
+        )
+
+#----------------------------------------------------------------------------------------------------------------------------------
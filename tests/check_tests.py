@@ -178,6 +178,42 @@ def _():
     with assert_raises(FieldValueError, 'MyRecord.id: 100 is not a valid value'):
         MyRecord()
 
+#----------------------------------------------------------------------------------------------------------------------------------
+# several checks
+
+@test("'check' can be a list of checks, which must all pass")
+def _():
+    class MyRecord(Record):
+        id = Field(
+            type=int,
+            check=['{} >= 0', lambda v: v % 2 == 0, SourceCodeTemplate('{} < $limit', limit='100')],
+        )
+    assert_eq(MyRecord(8).id, 8)
+    for invalid in (-2, 7, 102):
+        with assert_raises(FieldValueError, 'MyRecord.id: %d is not a valid value' % invalid):
+            MyRecord(invalid)
+
+@test('the checks in a list are run in order, and stop at the first failure')
+def _():
+    class MyRecord(Record):
+        name = Field(
+            type=text_type,
+            check=['len({}) > 0', '{}[0] == "x"'],
+        )
+    assert_eq(MyRecord('xyz').name, 'xyz')
+    with assert_raises(FieldValueError):
+        MyRecord('')
+
+@test('string checks in a list are inlined into a single expression')
+def _():
+    class MyRecord(Record):
+        id = Field(type=int, check=['{} >= 0', '{} < 10'])
+    assert '((id >= 0) and (id < 10))' in MyRecord.__tdds_source__, MyRecord.__tdds_source__
+
+@test('an empty list of checks is the same as no check')
+def _():
+    assert_eq(Field(type=int, check=[]).check, None)
+
 #----------------------------------------------------------------------------------------------------------------------------------
 # what the check function returns/raises
 
@@ -12,11 +12,12 @@ from collections import namedtuple
 from decimal import Decimal
 
 # tdds
-from tdds import Cleaner, Record, dict_of, seq_of, set_of
+from tdds import cleaner as tdds_cleaner
+from tdds import Cleaner, Record, RecursiveType, dict_of, nullable, seq_of, set_of
 from tdds.utils.compatibility import text_type
 
 # this module
-from .plumbing import assert_eq, build_test_registry
+from .plumbing import assert_eq, assert_raises, build_test_registry
 
 #----------------------------------------------------------------------------------------------------------------------------------
 # init
@@ -239,3 +240,215 @@ def _():
     )
 
 #----------------------------------------------------------------------------------------------------------------------------------
+# compiled cleaners
+
+class ReflectionCleaner(Cleaner):
+    # The compiled code is meant to behave exactly like the reflection-based implementation, which we force here
+    def _clean_field(self, field_id, field, value, prefix=''):
+        return super(ReflectionCleaner, self)._clean_field(field_id, field, value, prefix=prefix)
+
+@test('compiled cleaners give the same results as reflection-based cleaning')
+def _():
+    class Currency(Record):
+        symbol = text_type
+    class Price(Record):
+        currency = Currency
+        value = Decimal
+        history = seq_of(Decimal)
+        tags = set_of(text_type)
+        rates = dict_of(text_type, float)
+    raw = {
+        'currency': {'symbol': 'gbp'},
+        'value': '1.5',
+        'history': ['1', '2.5'],
+        'tags': [1, 2],
+        'rates': {'usd': '1.25'},
+        'ignored': 'x',
+    }
+    for cleaner_cls in (Cleaner, ReflectionCleaner):
+        class MyClass(cleaner_cls):
+            def clean_currency_symbol(self, value):
+                return value.upper()
+            def clean_tags_element(self, value):
+                return text_type(value)
+        assert_eq(MyClass().clean(Price, raw), {
+            'currency': {'symbol': 'GBP'},
+            'value': Decimal('1.5'),
+            'history': (Decimal('1'), Decimal('2.5')),
+            'tags': frozenset(['1', '2']),
+            'rates': {'usd': 1.25},
+        })
+
+@test('compiled cleaners handle recursive types, with methods looked up by full path')
+def _():
+    class Node(Record):
+        label = text_type
+        nxt = nullable(RecursiveType)
+    class MyClass(Cleaner):
+        def clean_nxt_nxt_label(self, value):
+            return value.upper()
+    assert_eq(
+        MyClass().clean(Node, {'label': 'a', 'nxt': {'label': 'b', 'nxt': {'label': 'c', 'nxt': {'label': 'd'}}}}),
+        {'label': 'a', 'nxt': {'label': 'b', 'nxt': {'label': 'C', 'nxt': {'label': 'd', 'nxt': None}}}},
+    )
+
+@test('compiled cleaners report the path of sub-records that could not be cleaned')
+def _():
+    class Inner(Record):
+        value = int
+    class Outer(Record):
+        inner = Inner
+    with assert_raises(ValueError, "Couldn't clean 'inner'"):
+        Cleaner().clean(Outer, {'inner': {'value': 'not a number'}})
+
+@test('overrides of clean apply to nested records')
+def _():
+    class Inner(Record):
+        name = nullable(text_type)
+    class Outer(Record):
+        inner = Inner
+    class MyClass(Cleaner):
+        def clean(self, record_class, values, prefix=''):
+            if record_class is Inner:
+                return {'name': values['name'].upper()}
+            return super(MyClass, self).clean(record_class, values, prefix=prefix)
+    assert_eq(MyClass().clean(Outer, {'inner': {'name': 'x'}}), {'inner': {'name': 'X'}})
+
+@test('clean_* methods set on the cleaner instance are used')
+def _():
+    class Inner(Record):
+        name = text_type
+    class Outer(Record):
+        inner = Inner
+    cleaner = Cleaner()
+    cleaner.clean_inner_name = lambda value: value.upper()
+    assert_eq(cleaner.clean(Outer, {'inner': {'name': 'x'}}), {'inner': {'name': 'X'}})
+
+@test('cleaner.build cleans values and passes them to the record constructor')
+def _():
+    class Wolf(Record):
+        name = text_type
+        age = int
+    class Pack(Record):
+        leader = Wolf
+        wolves = seq_of(Wolf)
+    class MyClass(Cleaner):
+        def clean_wolves_element_name(self, value):
+            return value.title()
+    assert_eq(
+        MyClass().build(Pack, {'leader': {'name': 'Buck', 'age': '5'}, 'wolves': [{'name': 'spitz', 'age': 4}]}),
+        Pack(leader=Wolf(name='Buck', age=5), wolves=[Wolf(name='Spitz', age=4)]),
+    )
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# batch cleaning
+
+@test('clean_many gives the same results as cleaning each row')
+def _():
+    class MyRecord(Record):
+        i = int
+        f = float
+        d = Decimal
+        b = bool
+        t = text_type
+        l = nullable(seq_of(int))
+    class MyClass(Cleaner):
+        def clean_t(self, value):
+            return value.upper()
+    rows = [
+        {'i': '1', 'f': '2.5', 'd': '3.1', 'b': 'TRUE', 't': 'x', 'l': ['1', 2]},
+        {'i': 2, 'f': 3, 'd': None, 'b': False, 't': 'y', 'other': 'z'},
+        {'i': None, 'f': 4.5, 'b': '0'},
+        [('i', '7')],
+    ]
+    cleaned = MyClass().clean_many(MyRecord, rows)
+    assert_eq(cleaned, [MyClass().clean(MyRecord, row) for row in rows])
+    assert_eq(cleaned[0], {'i': 1, 'f': 2.5, 'd': Decimal('3.1'), 'b': True, 't': 'X', 'l': (1, 2)})
+
+@test('clean_many uses per-value cleaning methods overridden by subclasses')
+def _():
+    class MyRecord(Record):
+        value = int
+    class MyClass(Cleaner):
+        def clean_int(self, value):
+            return int(value) * 2
+    assert_eq(
+        MyClass().clean_many(MyRecord, [{'value': '1'}, {'value': '2'}]),
+        [{'value': 2}, {'value': 4}],
+    )
+
+@test('clean_many uses column cleaning methods defined by subclasses')
+def _():
+    class MyRecord(Record):
+        value = int
+    class MyClass(Cleaner):
+        def clean_int_column(self, values):
+            return [len(values)] * len(values)
+    assert_eq(
+        MyClass().clean_many(MyRecord, [{'value': '1'}, {'value': '2'}]),
+        [{'value': 2}, {'value': 2}],
+    )
+
+@test('clean_many raises the same exceptions as clean on invalid values')
+def _():
+    class MyRecord(Record):
+        i = int
+        b = bool
+    with assert_raises(ValueError):
+        Cleaner().clean_many(MyRecord, [{'i': '1'}, {'i': 'one'}])
+    with assert_raises(KeyError):
+        Cleaner().clean_many(MyRecord, [{'b': 'maybe'}])
+
+class StubNumpy(object):
+    """
+    Stands in for the numpy module in `tdds.cleaner', so that the vectorised column conversions get tested whether or not numpy
+    is installed
+    """
+
+    class ndarray(object):  # pylint: disable=invalid-name
+        def __init__(self, values):
+            self.values = values
+        def tolist(self):
+            return list(self.values)
+
+    def __init__(self):
+        self.calls = []
+
+    def array(self, values, dtype):
+        self.calls.append((list(values), dtype))
+        convert = {'int64': int, 'float64': float}[dtype]
+        return self.ndarray([convert(value) for value in values])
+
+
+def with_stub_numpy(function):
+    stub = StubNumpy()
+    saved = tdds_cleaner.numpy
+    tdds_cleaner.numpy = stub
+    try:
+        return function(stub)
+    finally:
+        tdds_cleaner.numpy = saved
+
+@test('clean_many converts numeric columns with numpy when available')
+def _():
+    class MyRecord(Record):
+        i = nullable(int)
+        f = float
+    def check(stub):
+        cleaned = Cleaner().clean_many(MyRecord, [{'i': '1', 'f': '2.5'}, {'i': None, 'f': 3.5}, {'i': 4, 'f': '4'}])
+        assert_eq(cleaned, [{'i': 1, 'f': 2.5}, {'i': None, 'f': 3.5}, {'i': 4, 'f': 4.0}])
+        # only the values that need converting are passed to numpy
+        assert_eq(sorted(stub.calls), [(['1'], 'int64'), (['2.5', '4'], 'float64')])
+    with_stub_numpy(check)
+
+@test('clean_many falls back on per-value cleaning when numpy rejects a column')
+def _():
+    class MyRecord(Record):
+        i = int
+    def check(stub):
+        with assert_raises(ValueError):
+            Cleaner().clean_many(MyRecord, [{'i': '1'}, {'i': 'one'}])
+        assert_eq(stub.calls, [(['1', 'one'], 'int64')])
+    with_stub_numpy(check)
+
+#----------------------------------------------------------------------------------------------------------------------------------
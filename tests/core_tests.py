@@ -9,14 +9,18 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 # standards
 from abc import ABCMeta
+import linecache
+from os import path
 from random import randrange
+import subprocess
+import sys
 
 # tdds
-from tdds import Field, FieldNotNullable, Record, RecordsAreImmutable, nullable
+from tdds import Field, FieldNotNullable, FieldValueError, Record, RecordsAreImmutable, nullable, seq_of
 from tdds.utils.compatibility import integer_types, native_string, string_types, text_type
 
 # this module
-from .plumbing import assert_eq, assert_is, assert_none, assert_raises, build_test_registry, foreach
+from .plumbing import assert_eq, assert_is, assert_matches, assert_none, assert_raises, build_test_registry, foreach
 
 #----------------------------------------------------------------------------------------------------------------------------------
 # init
@@ -423,3 +427,90 @@ def _():
     )
 
 #----------------------------------------------------------------------------------------------------------------------------------
+# generated source
+
+@test('the generated source is available on the class')
+def _():
+    class MyRecord(Record):
+        id = int
+    assert_matches(r'^class MyRecord\(', MyRecord.__tdds_source__)
+    assert 'def __init__(self, id):' in MyRecord.__tdds_source__, MyRecord.__tdds_source__
+
+@test('the generated source of collection classes is available too')
+def _():
+    class MyRecord(Record):
+        ids = seq_of(int)
+    assert 'def check_elems(' in MyRecord.record_fields['ids'].type.__tdds_source__
+
+@test('tracebacks point to the generated source')
+def _():
+    class MyRecord(Record):
+        id = Field(int, check='{} > 0')
+    with assert_raises(FieldValueError):
+        try:
+            MyRecord(id=-1)
+        except FieldValueError:
+            tb = sys.exc_info()[2]
+            while tb.tb_next is not None:
+                tb = tb.tb_next
+            filename = tb.tb_frame.f_code.co_filename
+            assert_matches(r'^<tdds:MyRecord(?:#\d+)?>$', filename)
+            line = linecache.getline(filename, tb.tb_lineno)
+            assert 'raise' in line, repr(line)
+            raise
+
+@test('each compiled class gets its own pseudo-filename')
+def _():
+    class MyRecord(Record):
+        id = int
+    first = MyRecord.__init__.__code__.co_filename
+    class MyRecord(Record):  # pylint: disable=function-redefined
+        name = text_type
+    second = MyRecord.__init__.__code__.co_filename
+    assert first != second, (first, second)
+    assert 'name' in linecache.getline(second, 4), linecache.getline(second, 4)
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# lazy imports
+
+def _fresh_interpreter_output(statements):
+    root_dir = path.dirname(path.dirname(path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, '-c', statements], cwd=root_dir)
+    return output.decode('UTF-8').strip()
+
+@test('importing tdds does not import the optional submodules')
+def _():
+    output = _fresh_interpreter_output(
+        'import sys, tdds; print(" ".join(sorted(m for m in sys.modules if m in ("asyncio", "tdds.cleaner", "tdds.collections"))))'
+    )
+    if sys.version_info >= (3, 7):
+        assert_eq(output, '')
+
+@test('lazy exports are imported on first access')
+def _():
+    output = _fresh_interpreter_output(
+        'import sys, tdds; from tdds import seq_of; print(seq_of.__module__, "tdds.collections" in sys.modules)'
+    )
+    assert_eq(output, 'tdds.collections True')
+
+@test('star imports include the lazy exports')
+def _():
+    output = _fresh_interpreter_output('from tdds import *; print(seq_of.__name__, Cleaner.__name__)')
+    assert_eq(output, 'seq_of Cleaner')
+
+@test('star imports only include the public names')
+def _():
+    output = _fresh_interpreter_output(
+        'from tdds import *; names = dir(); '
+        'print(" ".join(n for n in ("sys", "PY2", "LAZY_EXPORTS", "basics", "record") if n in names))'
+    )
+    assert_eq(output, '')
+
+@test('importing tdds does not compile the standard marshallers')
+def _():
+    output = _fresh_interpreter_output(
+        'import linecache, tdds; print(len([f for f in linecache.cache if f.startswith("<tdds:marshaller")]))'
+    )
+    assert_eq(output, '0')
+
+#----------------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+import pickle
+
+# tdds
+from tdds import Record, dedupe, dict_of, nullable, seq_of
+from tdds.dedupe import DEDUPE_STATE
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import assert_eq, assert_is, assert_none, build_test_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class DedupedTrack(Record):
+    title = text_type
+    tags = seq_of(text_type)
+    credits = nullable(dict_of(text_type, text_type))
+
+class DedupedPlaylist(Record):
+    name = text_type
+    tracks = seq_of(DedupedTrack)
+
+def _track_pods():
+    # NB built anew each time, so that equal values are different objects, as when they're parsed from JSON
+    return {
+        'title': ''.join(['Blue ', 'Train']),
+        'tags': [''.join(['ja', 'zz'])],
+        'credits': {'sax': ''.join(['Col', 'trane'])},
+    }
+
+def _playlist_pods():
+    return {'name': 'Mix', 'tracks': [_track_pods(), _track_pods()]}
+
+@test('from_pods with dedupe=True shares equal records')
+def _():
+    playlist = DedupedPlaylist.from_pods(_playlist_pods(), dedupe=True)
+    assert_is(playlist.tracks[0], playlist.tracks[1])
+    assert_eq(playlist, DedupedPlaylist.from_pods(_playlist_pods()))
+
+@test('without dedupe, equal records are decoded into separate objects')
+def _():
+    playlist = DedupedPlaylist.from_pods(_playlist_pods())
+    assert playlist.tracks[0] is not playlist.tracks[1]
+
+@test('within a dedupe block, strings, collections and records are shared across from_pods calls')
+def _():
+    with dedupe():
+        track_1 = DedupedTrack.from_pods(_track_pods())
+        track_2 = DedupedTrack.from_pods(dict(_track_pods(), title='Moment'))
+    assert track_1 is not track_2
+    assert_is(track_1.tags, track_2.tags)
+    assert_is(track_1.tags[0], track_2.tags[0])
+    assert_is(track_1.credits, track_2.credits)
+
+@test("records of different classes with the same field values aren't shared")
+def _():
+    class Artist(Record):
+        name = text_type
+    class Label(Record):
+        name = text_type
+    with dedupe():
+        artist = Artist.from_pods({'name': 'Blue Note'})
+        label = Label.from_pods({'name': 'Blue Note'})
+    assert_is(type(artist), Artist)
+    assert_is(type(label), Label)
+    assert_is(artist.name, label.name)
+
+@test('the table is dropped at the end of the dedupe block, and nested blocks share it')
+def _():
+    with dedupe():
+        table = DEDUPE_STATE.table
+        with dedupe():
+            assert_is(DEDUPE_STATE.table, table)
+        assert_is(DEDUPE_STATE.table, table)
+    assert_none(DEDUPE_STATE.table)
+    DedupedPlaylist.from_pods(_playlist_pods(), dedupe=True)
+    assert_none(DEDUPE_STATE.table)
+
+@test('unpickling within a dedupe block shares equal records')
+def _():
+    pickled = [pickle.dumps(DedupedTrack.from_pods(_track_pods())) for _ in range(2)]
+    with dedupe():
+        track_1, track_2 = [pickle.loads(data) for data in pickled]
+    assert_is(track_1, track_2)
+
+@test('a record keeps the collection instance it is given')
+def _():
+    tags = DedupedTrack.record_fields['tags'].type(['jazz'])
+    assert_is(DedupedTrack(title='Blue Train', tags=tags).tags, tags)
+
+#----------------------------------------------------------------------------------------------------------------------------------
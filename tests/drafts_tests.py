@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# tdds
+from tdds import FieldNotNullable, FieldTypeError, FieldValueError, Record, dict_of, nonnegative, nullable, seq_of, set_of
+from tdds.drafts import RecordDraft
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import assert_eq, assert_is, assert_none, assert_raises, build_test_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class DraftedTrack(Record):
+    title = text_type
+    number = nonnegative(int)
+
+class DraftedAlbum(Record):
+    title = text_type
+    tracks = seq_of(DraftedTrack)
+    by_country = dict_of(text_type, DraftedTrack)
+    tags = set_of(text_type)
+    cover = nullable(DraftedTrack)
+    ratings = nullable(seq_of(int))
+
+@test('a draft is filled in field by field, and frozen into a record')
+def _():
+    draft = DraftedTrack.draft(title='So What')
+    draft.number = 1
+    track = draft.freeze()
+    assert_eq(track, DraftedTrack(title='So What', number=1))
+    assert_is(type(track), DraftedTrack)
+
+@test("setting a draft's fields runs no checks, freezing runs them all")
+def _():
+    draft = DraftedTrack.draft()
+    draft.number = -1
+    draft.title = 'So What'
+    with assert_raises(FieldValueError):
+        draft.freeze()
+    draft.number = 1
+    draft.title = 1
+    with assert_raises(FieldTypeError):
+        draft.freeze()
+    draft.title = 'So What'
+    draft.number = None
+    with assert_raises(FieldNotNullable):
+        draft.freeze()
+
+@test('collection fields of a draft are mutable containers, empty unless the field is nullable')
+def _():
+    draft = DraftedAlbum.draft(title='Kind of Blue')
+    assert_eq(draft.tracks, [])
+    assert_eq(draft.by_country, {})
+    assert_eq(draft.tags, set())
+    assert_none(draft.ratings)
+    draft.tracks.append(DraftedTrack(title='So What', number=1))
+    draft.by_country['fr'] = DraftedTrack(title='Blue in Green', number=3)
+    draft.tags.add('jazz')
+    album = draft.freeze()
+    assert_eq(len(album.tracks), 1)
+    assert_eq(sorted(album.by_country), ['fr'])
+    assert_eq(album.tags, frozenset(['jazz']))
+    assert_none(album.ratings)
+
+@test('a draft can be started from existing values, which are copied into mutable containers')
+def _():
+    album = DraftedAlbum(title='Kind of Blue', tracks=[DraftedTrack(title='So What', number=1)], by_country={}, tags=['jazz'])
+    draft = DraftedAlbum.draft(**{field_id: getattr(album, field_id) for field_id in DraftedAlbum.record_fields})
+    draft.tracks.append(DraftedTrack(title='Freddie Freeloader', number=2))
+    assert_eq(len(album.tracks), 1)
+    assert_eq(len(draft.freeze().tracks), 2)
+
+@test('drafts of nested records are frozen along with the draft that holds them')
+def _():
+    draft = DraftedAlbum.draft(title='Kind of Blue')
+    draft.cover = DraftedTrack.draft(title='So What', number=1)
+    draft.tracks.append(DraftedTrack.draft(title='So What', number=1))
+    draft.by_country['fr'] = DraftedTrack.draft(title='So What', number=1)
+    album = draft.freeze()
+    expected = DraftedTrack(title='So What', number=1)
+    assert_eq(album.cover, expected)
+    assert_eq(album.tracks, (expected,))
+    assert_eq(album.by_country['fr'], expected)
+
+@test('drafts have the same fields as their record, and no others')
+def _():
+    draft = DraftedTrack.draft()
+    assert isinstance(draft, RecordDraft)
+    with assert_raises(AttributeError):
+        draft.nope = 1
+    with assert_raises(TypeError):
+        DraftedTrack.draft(nope=1)
+    assert_eq(repr(DraftedTrack.draft(title='So What')), "DraftDraftedTrack(number=None, title='So What')")
+
+@test('records with fields called `draft\' or `freeze\' still have drafts')
+def _():
+    class Order(Record):
+        draft = bool
+        freeze = bool
+    draft = Order.record_draft(draft=True)
+    draft.freeze = False
+    assert_eq(draft.record_freeze(), Order(draft=True, freeze=False))
+
+@test('records that define `draft\' themselves keep their own definition')
+def _():
+    class WithProperty(Record):
+        value = int
+        @property
+        def draft(self):
+            return 'property'
+    class WithClassmethod(Record):
+        value = int
+        @classmethod
+        def draft(cls):
+            return 'classmethod'
+    class WithStaticmethod(Record):
+        value = int
+        @staticmethod
+        def draft():
+            return 'staticmethod'
+    assert_eq(WithProperty(value=1).draft, 'property')
+    assert_eq(WithClassmethod.draft(), 'classmethod')
+    assert_eq(WithStaticmethod.draft(), 'staticmethod')
+    assert_eq(WithClassmethod.record_draft(value=1).freeze(), WithClassmethod(value=1))
+
+@test('records with a field called `record_class\' still have drafts')
+def _():
+    class Registration(Record):
+        record_class = text_type
+    draft = Registration.draft(record_class='A')
+    assert_eq(draft.record_class, 'A')
+    assert_eq(draft.freeze(), Registration(record_class='A'))
+    assert_is(DraftedTrack.draft().record_class, DraftedTrack)
+
+#----------------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from datetime import datetime
+from decimal import Decimal
+
+# tdds
+from tdds import (
+    Field,
+    FieldNotNullable,
+    FieldTypeError,
+    FieldValueError,
+    Record,
+    RecursiveType,
+    dict_of,
+    fused_from_pods,
+    nullable,
+    pair_of,
+    seq_of,
+    set_of,
+)
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import assert_eq, assert_is, assert_isinstance, assert_raises, build_test_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+def _album_classes():
+    class Track(Record):
+        title = text_type
+        total_seconds = Field(int, check='{} > 0')
+    class Album(Record):
+        title = text_type
+        released = nullable(datetime)
+        price = Decimal
+        tracks = seq_of(Track)
+        tags = set_of(text_type)
+        bonus = dict_of(text_type, seq_of(Track))
+        sides = nullable(pair_of(Track))
+    return Track, Album
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+@test('fused decoders give the same result as from_pods')
+def _():
+    Track, Album = _album_classes()
+    album = Album(
+        title='Gyroscope',
+        released=datetime(2000, 1, 1, 12, 0, 0),
+        price=Decimal('9.99'),
+        tracks=[Track(title='Elevon', total_seconds=209), Track(title='Gear', total_seconds=514)],
+        tags=['rock', 'instrumental'],
+        bonus={'live': [Track(title='Stringer', total_seconds=413)]},
+        sides=[Track(title='A', total_seconds=1), Track(title='B', total_seconds=2)],
+    )
+    pods = album.record_pods()
+    decoded = fused_from_pods(Album)(pods)
+    assert_eq(decoded, Album.from_pods(pods))
+    assert_eq(decoded, album)
+
+@test('fused decoders build the declared collection types')
+def _():
+    Track, Album = _album_classes()
+    album = fused_from_pods(Album)({
+        'title': 'x',
+        'price': '1',
+        'tracks': [{'title': 'a', 'total_seconds': 1}],
+        'tags': ['t'],
+        'bonus': {},
+    })
+    assert_isinstance(album.tracks, Album.record_fields['tracks'].type)
+    assert_isinstance(album.tracks[0], Track)
+    assert_isinstance(album.tags, Album.record_fields['tags'].type)
+    assert_isinstance(album.bonus, Album.record_fields['bonus'].type)
+
+@test('fused decoders are cached')
+def _():
+    _, Album = _album_classes()
+    assert_is(fused_from_pods(Album), fused_from_pods(Album))
+
+@test('fused decoders support recursive types')
+def _():
+    class Node(Record):
+        label = text_type
+        children = seq_of(RecursiveType)
+        nxt = nullable(RecursiveType)
+    node = Node(label='a', children=[Node(label='b', children=[])], nxt=Node(label='c', children=[]))
+    assert_eq(fused_from_pods(Node)(node.record_pods()), node)
+
+@test('fused decoders honour pods profiles')
+def _():
+    _, Album = _album_classes()
+    pods = {'title': 'x', 'price': Decimal('1.5'), 'tracks': [], 'tags': [], 'bonus': {}}
+    assert_eq(fused_from_pods(Album, profile='native')(pods).price, Decimal('1.5'))
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# validation
+
+@test('fused decoders run the value checks of nested records')
+def _():
+    _, Album = _album_classes()
+    with assert_raises(FieldValueError, 'Track.total_seconds: 0 is not a valid value'):
+        fused_from_pods(Album)({
+            'title': 'x',
+            'price': '1',
+            'tracks': [{'title': 'a', 'total_seconds': 0}],
+            'tags': [],
+            'bonus': {},
+        })
+
+@test('fused decoders run the type checks of scalar fields and elements')
+def _():
+    _, Album = _album_classes()
+    with assert_raises(FieldTypeError):
+        fused_from_pods(Album)({'title': 1, 'price': '1', 'tracks': [], 'tags': [], 'bonus': {}})
+    with assert_raises(FieldTypeError):
+        fused_from_pods(Album)({'title': 'x', 'price': '1', 'tracks': [], 'tags': [1], 'bonus': {}})
+
+@test('fused decoders refuse nulls in non-nullable collection fields')
+def _():
+    _, Album = _album_classes()
+    with assert_raises(FieldNotNullable, 'Album.tags cannot be None'):
+        fused_from_pods(Album)({'title': 'x', 'price': '1', 'tracks': [], 'bonus': {}})
+
+@test('fused decoders check the length of pairs')
+def _():
+    class MyRecord(Record):
+        pair = pair_of(int)
+    with assert_raises(FieldValueError, 'A pair cannot have more than two elements'):
+        fused_from_pods(MyRecord)({'pair': [1, 2, 3]})
+    with assert_raises(FieldValueError, 'A pair must have two elements, not 1'):
+        fused_from_pods(MyRecord)({'pair': [1]})
+
+@test('fields with a user-supplied coerce go through the normal constructor path')
+def _():
+    class MyRecord(Record):
+        elems = seq_of(int, coerce=sorted)
+    assert_eq(
+        fused_from_pods(MyRecord)({'elems': [2, 1]}),
+        MyRecord.from_pods({'elems': [2, 1]}),
+    )
+    assert_eq(fused_from_pods(MyRecord)({'elems': [2, 1]}).elems, (1, 2))
+
+@test('records with a user-defined constructor go through that constructor')
+def _():
+    class Base(Record):
+        x = int
+    class Scaled(Base, Record):
+        def __init__(self, x):
+            Base.__init__(self, x=x * 10)
+    class MyRecord(Record):
+        scaled = Scaled
+    assert_eq(fused_from_pods(Scaled)({'x': 1}).x, 10)
+    assert_eq(fused_from_pods(MyRecord)({'scaled': {'x': 1}}).scaled.x, 10)
+    assert_eq(fused_from_pods(MyRecord)({'scaled': {'x': 1}}), MyRecord.from_pods({'scaled': {'x': 1}}))
+
+#----------------------------------------------------------------------------------------------------------------------------------
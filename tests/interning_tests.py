@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+import gc
+import pickle
+
+# tdds
+from tdds import Field, Record, fused_from_pods, nullable, seq_of
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import assert_eq, assert_is, build_test_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class InternedCurrency(Record):
+    __intern = True
+    code = Field(text_type, coerce=text_type.upper)
+    symbol = nullable(text_type)
+
+@test('constructing an interned record equal to a live one returns the live one')
+def _():
+    eur = InternedCurrency('EUR', '€')
+    assert_is(InternedCurrency('EUR', '€'), eur)
+    assert_is(InternedCurrency(code='eur', symbol='€'), eur)
+
+@test('interned records with different values are different objects')
+def _():
+    eur = InternedCurrency('EUR', '€')
+    assert InternedCurrency('EUR') is not eur
+    assert InternedCurrency('GBP', '€') is not eur
+
+@test('from_pods, record_derive and unpickling return the canonical instance')
+def _():
+    eur = InternedCurrency('EUR', '€')
+    assert_is(InternedCurrency.from_pods({'code': 'EUR', 'symbol': '€'}), eur)
+    assert_is(InternedCurrency('GBP', '€').record_derive(code='EUR'), eur)
+    assert_is(pickle.loads(pickle.dumps(eur)), eur)
+
+@test('fused decoders return the canonical instances')
+def _():
+    eur = InternedCurrency('EUR', '€')
+    decoded = fused_from_pods(seq_of(InternedCurrency).type)([{'code': 'EUR', 'symbol': '€'}, {'code': 'EUR', 'symbol': '€'}])
+    assert_is(decoded[0], eur)
+    assert_is(decoded[1], eur)
+
+@test("interned records are dropped from the table once they're not referenced anymore")
+def _():
+    class Tag(Record):
+        __intern = True
+        name = text_type
+    tags = [Tag('a'), Tag('b'), Tag('a')]
+    assert_eq(len(Tag.record_intern_table), 2)
+    del tags
+    gc.collect()
+    assert_eq(len(Tag.record_intern_table), 0)
+
+@test('subclasses of interned records are interned separately')
+def _():
+    class Country(Record):
+        __intern = True
+        code = text_type
+    class Capital(Country, Record):
+        city = text_type
+    class NamedCountry(Country):
+        pass
+    country = Country('FR')
+    capital = Capital(code='FR', city='Paris')
+    assert_is(Capital(code='FR', city='Paris'), capital)
+    named = NamedCountry('FR')
+    assert_is(type(named), NamedCountry)
+    assert_is(NamedCountry('FR'), named)
+    assert_is(Country('FR'), country)
+
+@test('interned records still compare and hash by value')
+def _():
+    class Country(Record):
+        __intern = True
+        code = text_type
+    class NamedCountry(Country):
+        pass
+    assert_eq(Country('FR'), NamedCountry('FR'))
+    assert_eq(hash(Country('FR')), hash(NamedCountry('FR')))
+    assert_eq(sorted([Country('FR'), Country('BE')]), [Country('BE'), Country('FR')])
+
+#----------------------------------------------------------------------------------------------------------------------------------
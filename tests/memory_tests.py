@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+import sys
+
+# tdds
+from tdds import Record, dict_of, memory, nullable, seq_of
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import assert_eq, assert_raises, build_test_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class Track(Record):
+    title = text_type
+    total_seconds = int
+
+class Album(Record):
+    title = text_type
+    tracks = seq_of(Track)
+    tags = dict_of(text_type, int)
+    subtitle = nullable(text_type)
+
+def _album(track):
+    return Album(
+        title='Album',
+        tracks=[track, track],
+        tags={'rock': 1000},
+    )
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+@test('sizeof of a scalar is its getsizeof')
+def _():
+    assert_eq(memory.sizeof('abc'), sys.getsizeof('abc'))
+
+@test('sizeof includes the fields of a record')
+def _():
+    track = Track(title='Title', total_seconds=100000)
+    assert_eq(
+        memory.sizeof(track),
+        sys.getsizeof(track) + sys.getsizeof(track.title) + sys.getsizeof(track.total_seconds),
+    )
+
+@test('sizeof counts shared objects once by default')
+def _():
+    track = Track(title='Title', total_seconds=100000)
+    album = _album(track)
+    track_size = memory.sizeof(track)
+    shared_size = memory.sizeof(album)
+    unshared_size = memory.sizeof(album, shared=False)
+    assert_eq(unshared_size - shared_size, track_size)
+
+@test('sizeof of a dict counts its keys and values, and not the item tuples')
+def _():
+    mapping = {'key%d' % i: 100000 + i for i in range(100)}
+    assert_eq(
+        memory.sizeof(mapping),
+        sys.getsizeof(mapping) + sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in mapping.items()),
+    )
+
+@test('None is not counted')
+def _():
+    track = Track(title='Title', total_seconds=100000)
+    assert_eq(
+        memory.sizeof(_album(track)),
+        memory.sizeof(_album(track).record_derive(subtitle=None)),
+    )
+
+@test('report breaks down the total by class and by field')
+def _():
+    track = Track(title='Title', total_seconds=100000)
+    album = _album(track)
+    report = memory.report(album)
+    assert_eq(report.total, memory.sizeof(album))
+    assert_eq(report.by_class['Album'], {'count': 1, 'bytes': sys.getsizeof(album)})
+    assert_eq(report.by_class['Track'], {'count': 1, 'bytes': sys.getsizeof(track)})
+    assert_eq(report.by_field['Track.title'], sys.getsizeof(track.title))
+    assert_eq(report.by_field['Album.tracks'], sys.getsizeof(album.tracks))
+    assert_eq(
+        sum(report.by_field.values()) + report.by_class['Album']['bytes'] + report.by_class['Track']['bytes'],
+        report.total,
+    )
+    assert not report.sampled
+
+@test('the sampling mode gives an estimate')
+def _():
+    album = Album(
+        title='Album',
+        tracks=[Track(title='Track %05d' % i, total_seconds=100000 + i) for i in range(2000)],
+        tags={},
+    )
+    exact = memory.sizeof(album)
+    report = memory.report(album, sample=50, seed=1)
+    assert report.sampled
+    assert abs(report.total - exact) < exact * 0.05, (report.total, exact)
+    assert_eq(report.by_class['Track']['count'], 50)
+
+@test('the sample size must be positive')
+def _():
+    with assert_raises(ValueError):
+        memory.sizeof('abc', sample=0)
+
+#----------------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# tdds
+from tdds import Field, FieldValueError, Record, metrics
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import assert_eq, assert_isinstance, assert_raises, build_test_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+@test('no metrics are collected by default')
+def _():
+    class MetricsOff(Record):
+        id = int
+    MetricsOff(id=1)
+    assert 'MetricsOff' not in metrics.snapshot()
+
+@test('count mode counts instances and calls to from_pods')
+def _():
+    class MetricsCount(Record):
+        __metrics = 'count'
+        id = int
+    MetricsCount(id=1)
+    MetricsCount(id=2)
+    MetricsCount.from_pods({'id': 3})
+    assert_eq(metrics.snapshot()['MetricsCount'], {
+        'instances': 3,
+        'from_pods': 1,
+        'field_seconds': {},
+    })
+
+@test('`__metrics = True` is the same as count mode')
+def _():
+    class MetricsTrue(Record):
+        __metrics = True
+        id = int
+    MetricsTrue(id=1)
+    assert_eq(metrics.snapshot()['MetricsTrue']['instances'], 1)
+
+@test('failed constructions are counted too')
+def _():
+    class MetricsFailed(Record):
+        __metrics = 'count'
+        id = Field(int, check='{} > 0')
+    with assert_raises(FieldValueError):
+        MetricsFailed(id=-1)
+    assert_eq(metrics.snapshot()['MetricsFailed']['instances'], 1)
+
+@test('timing mode measures the time spent on each field')
+def _():
+    class MetricsTiming(Record):
+        __metrics = 'timing'
+        id = int
+        name = Field(text_type, check='len({}) > 0')
+    MetricsTiming(id=1, name='one')
+    stats = metrics.snapshot()['MetricsTiming']
+    assert_eq(stats['instances'], 1)
+    assert_eq(sorted(stats['field_seconds']), ['id', 'name'])
+    for seconds in stats['field_seconds'].values():
+        assert_isinstance(seconds, float)
+        assert seconds >= 0, seconds
+
+@test('timing mode works with fields named like the timer variables')
+def _():
+    class MetricsTimingNames(Record):
+        __metrics = 'timing'
+        x = int
+        x_metrics_t0 = int
+        _metrics_t0 = int
+    record = MetricsTimingNames(x=1, x_metrics_t0=2, _metrics_t0=3)
+    assert_eq((record.x, record.x_metrics_t0, record._metrics_t0), (1, 2, 3))  # pylint: disable=protected-access
+
+@test('the default metrics mode applies to classes compiled afterwards')
+def _():
+    metrics.set_default_metrics_mode('count')
+    try:
+        class MetricsDefault(Record):
+            id = int
+    finally:
+        metrics.set_default_metrics_mode(None)
+    class MetricsAfterDefault(Record):
+        id = int
+    MetricsDefault(id=1)
+    MetricsAfterDefault(id=1)
+    assert_eq(metrics.snapshot()['MetricsDefault']['instances'], 1)
+    assert 'MetricsAfterDefault' not in metrics.snapshot()
+
+@test('unknown metrics modes are rejected')
+def _():
+    with assert_raises(ValueError):
+        class MetricsUnknown(Record):
+            __metrics = 'everything'
+            id = int
+    with assert_raises(ValueError):
+        metrics.set_default_metrics_mode('everything')
+
+@test('reset sets all counters back to zero')
+def _():
+    class MetricsReset(Record):
+        __metrics = 'timing'
+        id = int
+    MetricsReset(id=1)
+    metrics.reset()
+    assert_eq(metrics.snapshot()['MetricsReset'], {
+        'instances': 0,
+        'from_pods': 0,
+        'field_seconds': {'id': 0.0},
+    })
+
+@test('metrics can be dumped in the Prometheus text format')
+def _():
+    class MetricsPrometheus(Record):
+        __metrics = 'timing'
+        id = int
+    MetricsPrometheus(id=1)
+    MetricsPrometheus.from_pods({'id': 2})
+    text = metrics.prometheus_text()
+    assert '# TYPE tdds_instances_total counter\n' in text, text
+    assert 'tdds_instances_total{record="MetricsPrometheus"} 2\n' in text, text
+    assert 'tdds_from_pods_total{record="MetricsPrometheus"} 1\n' in text, text
+    assert 'tdds_field_handling_seconds_total{record="MetricsPrometheus",field="id"} ' in text, text
+
+#----------------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+from datetime import date
+
+# tdds
+from tdds import (
+    Field,
+    FieldNotNullable,
+    FieldTypeError,
+    FieldValueError,
+    Record,
+    RecordsAreImmutable,
+    fused_from_pods,
+    nonnegative,
+    nullable,
+    one_of,
+    seq_of,
+    validation,
+)
+from tdds.utils.codegen import unoptimized
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import assert_eq, assert_raises, build_test_registry, foreach
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+def _record_class():
+    class MyRecord(Record):
+        title = text_type
+        number = nonnegative(int)
+        genre = one_of('rock', 'jazz', nullable=True)
+        rating = nullable(nonnegative(float))
+        label = Field(text_type, nullable=True, default='none', check='len({}) < 10')
+        released = nullable(date)
+        explicit = Field(int, coerce=bool)
+    return MyRecord
+
+def _both_classes():
+    optimized = _record_class()
+    with unoptimized():
+        plain = _record_class()
+    return optimized, plain
+
+def _outcome(cls, kwargs):
+    try:
+        return cls(**kwargs).record_pods()
+    except (FieldNotNullable, FieldTypeError, FieldValueError) as ex:
+        return type(ex), str(ex)
+
+VALID_KWARGS = {'title': 'a', 'number': 1, 'explicit': 0}
+
+@foreach((
+    ('valid values', {}),
+    ('all nullable values set', {'genre': 'jazz', 'rating': 2, 'label': 'x', 'released': date(2020, 1, 2)}),
+    ('a missing value', {'title': None}),
+    ('a value of the wrong type', {'title': 1}),
+    ('an invalid value', {'number': -1}),
+    ('an invalid nullable value', {'rating': -1.0}),
+    ('a nullable value of the wrong type', {'released': 'x'}),
+    ('an invalid one_of value', {'genre': 'folk'}),
+    ('an invalid value with a default', {'label': 'x' * 20}),
+))
+def _(description, kwargs):
+
+    @test('optimized and plain code behave the same with %s' % description)
+    def _():
+        optimized, plain = _both_classes()
+        all_kwargs = dict(VALID_KWARGS, **kwargs)
+        assert_eq(_outcome(optimized, all_kwargs), _outcome(plain, all_kwargs))
+
+@test("optimized records set their fields through their slots' setters")
+def _():
+    MyRecord = _record_class()
+    assert 'object.__setattr__' not in MyRecord.__tdds_source__, MyRecord.__tdds_source__
+    r = MyRecord(**VALID_KWARGS)
+    assert_eq(r.title, 'a')
+    with assert_raises(RecordsAreImmutable):
+        r.title = 'b'
+
+@test('the value and type checks of a nullable field share a single test for None')
+def _():
+    MyRecord = _record_class()
+    assert 'rating is not None and' not in MyRecord.__tdds_source__, MyRecord.__tdds_source__
+    assert_eq(MyRecord(rating=None, **VALID_KWARGS).rating, None)
+
+@test('the type check is left out when the field is coerced with a builtin subclass of its type')
+def _():
+    MyRecord = _record_class()
+    assert 'isinstance(explicit' not in MyRecord.__tdds_source__, MyRecord.__tdds_source__
+    assert_eq(MyRecord(**VALID_KWARGS).explicit, False)
+
+@test("the superclass constructor isn't called when it would only be `object.__init__'")
+def _():
+    MyRecord = _record_class()
+    assert 'super(' not in MyRecord.__tdds_source__, MyRecord.__tdds_source__
+    class SubRecord(MyRecord, Record):
+        extra = int
+    assert_eq(SubRecord(extra=1, **VALID_KWARGS).title, 'a')
+
+@test('from_pods reads each nullable value from the PODS only once')
+def _():
+    MyRecord = _record_class()
+    assert "pods.get('released') is None" not in MyRecord.__tdds_source__, MyRecord.__tdds_source__
+    r = MyRecord(released=date(2020, 1, 2), **VALID_KWARGS)
+    assert_eq(MyRecord.from_pods(r.record_pods()), r)
+
+@foreach((
+    ('no changes', {}),
+    ('a valid value', {'rating': 2}),
+    ('a value of the wrong type', {'title': 1}),
+    ('an invalid value', {'number': -1}),
+    ('a missing value', {'title': None}),
+    ('None for a field with a default', {'label': None}),
+    ('a value to coerce', {'explicit': 1}),
+))
+def _(description, kwargs):
+
+    @test('optimized and plain record_derive behave the same with %s' % description)
+    def _():
+        outcomes = []
+        for cls in _both_classes():
+            try:
+                outcomes.append(cls(**VALID_KWARGS).record_derive(**kwargs).record_pods())
+            except (FieldNotNullable, FieldTypeError, FieldValueError) as ex:
+                outcomes.append((type(ex), str(ex)))
+        assert_eq(*outcomes)
+
+@test('record_derive only checks the fields it is given, and keeps the other values as they are')
+def _():
+    class DerivedAlbum(Record):
+        title = text_type
+        tracks = seq_of(nonnegative(int))
+    album = DerivedAlbum(title='a', tracks=[1, 2])
+    object.__setattr__(album, 'title', 1)
+    derived = album.record_derive(tracks=[3])
+    assert_eq(derived.title, 1)
+    assert_eq(derived.tracks, (3,))
+    assert_eq(album.record_derive().tracks, (1, 2))
+    assert album.record_derive().tracks is album.tracks
+
+@test('record_derive rejects unknown field names, optimized or not')
+def _():
+    for cls in _both_classes():
+        with assert_raises(TypeError):
+            cls(**VALID_KWARGS).record_derive(nope=1)
+
+@test('record_derive follows the validation mode')
+def _():
+    MyRecord = _record_class()
+    r = MyRecord(**VALID_KWARGS)
+    with validation('types_only'):
+        assert_eq(r.record_derive(number=-1).number, -1)
+    with assert_raises(FieldValueError):
+        r.record_derive(number=-1)
+
+@test("record_derive calls the constructor of subclasses that aren't records")
+def _():
+    MyRecord = _record_class()
+    class MySubclass(MyRecord):
+        def __init__(self, **kwargs):
+            super(MySubclass, self).__init__(**dict(kwargs, title=kwargs['title'].upper()))
+    assert_eq(MySubclass(**VALID_KWARGS).record_derive(title='b').title, 'B')
+
+@test('optimized and plain fused decoders return the same records')
+def _():
+    optimized, plain = _both_classes()
+    pods = [dict(VALID_KWARGS, number=n, rating=n) for n in range(3)]
+    decoded_optimized = fused_from_pods(seq_of(optimized).type)(pods)
+    with unoptimized():
+        decoded_plain = fused_from_pods(seq_of(plain).type)(pods)
+    assert_eq(
+        [r.record_pods() for r in decoded_optimized],
+        [r.record_pods() for r in decoded_plain],
+    )
+
+#----------------------------------------------------------------------------------------------------------------------------------
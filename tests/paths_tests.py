@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# tdds
+from tdds import FieldTypeError, FieldValueError, InvalidPath, Record, dict_of, nonnegative, nullable, pair_of, seq_of, set_of
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import assert_eq, assert_is, assert_raises, build_test_registry, foreach
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class PathTrack(Record):
+    title = text_type
+    number = nonnegative(int)
+    tags = set_of(text_type)
+
+class PathAlbum(Record):
+    title = text_type
+    tracks = seq_of(PathTrack)
+    by_country = dict_of(text_type, PathTrack)
+    bounds = pair_of(int)
+    cover = nullable(PathTrack)
+
+def _album():
+    tracks = [PathTrack(title='Track %d' % number, number=number, tags=['jazz']) for number in range(5)]
+    return PathAlbum(
+        title='Album',
+        tracks=tracks,
+        by_country={'fr': tracks[0]},
+        bounds=(0, 4),
+    )
+
+@test('record_update sets a nested value, and shares everything that is not on the path to it')
+def _():
+    album = _album()
+    updated = album.record_update('tracks[3].title', 'Moment')
+    assert_eq(updated.tracks[3].title, 'Moment')
+    assert_eq(album.tracks[3].title, 'Track 3')
+    assert_eq(
+        updated,
+        album.record_derive(tracks=album.tracks[:3] + (album.tracks[3].record_derive(title='Moment'),) + album.tracks[4:]),
+    )
+    assert_is(updated.tracks[2], album.tracks[2])
+    assert_is(updated.tracks[3].tags, album.tracks[3].tags)
+    assert_is(updated.by_country, album.by_country)
+    assert_is(type(updated.tracks), type(album.tracks))
+
+@foreach((
+    ('a dict key', "by_country['fr'].title", 'Bonjour', lambda album: album.by_country['fr'].title),
+    ('a negative index', 'tracks[-1].number', 9, lambda album: album.tracks[4].number),
+    ('a pair index', 'bounds[1]', 9, lambda album: album.bounds[1]),
+))
+def _(description, path, value, get_value):
+
+    @test('record_update works with a path with %s' % description)
+    def _():
+        album = _album()
+        updated = album.record_update(path, value)
+        assert_eq(get_value(updated), value)
+        assert_eq(updated.title, album.title)
+
+@test('record_update compiles one function per path shape, whatever the indices')
+def _():
+    class ShapeAlbum(Record):
+        tracks = seq_of(PathTrack)
+        by_country = dict_of(text_type, PathTrack)
+    album = ShapeAlbum(tracks=_album().tracks, by_country=_album().by_country)
+    for number in range(5):
+        album = album.record_update('tracks[%d].title' % number, 'Title %d' % number)
+    album = album.record_update("by_country['fr'].title", 'Bonjour').record_update("by_country['be']", album.tracks[0])
+    assert_eq([track.title for track in album.tracks], ['Title %d' % number for number in range(5)])
+    assert_eq(album.by_country['fr'].title, 'Bonjour')
+    assert_eq(len(ShapeAlbum.record_path_updates), 3)
+
+@test("record_update can add a key to a dict_of")
+def _():
+    track = PathTrack(title='Bonus', number=9, tags=[])
+    updated = _album().record_update("by_country['be']", track)
+    assert_eq(sorted(updated.by_country), ['be', 'fr'])
+    assert_is(updated.by_country['be'], track)
+
+@test('record_update checks the new value')
+def _():
+    album = _album()
+    with assert_raises(FieldValueError):
+        album.record_update('tracks[0].number', -1)
+    with assert_raises(FieldTypeError):
+        album.record_update('tracks[0]', 'not a track')
+    with assert_raises(FieldTypeError):
+        album.record_update("by_country['fr']", 1)
+
+@foreach((
+    ('an unknown field', 'tracks[0].nope'),
+    ('a field of a collection', 'tracks.title'),
+    ('an index into a record', 'cover[0]'),
+    ('an index into a set', 'tracks[0].tags[0]'),
+    ('a leading dot', '.title'),
+    ('a missing dot', 'tracks[0]title'),
+    ('an index that is not a literal', 'tracks[x]'),
+    ('no field', ''),
+))
+def _(description, path):
+
+    @test('record_update rejects a path with %s' % description)
+    def _():
+        with assert_raises(InvalidPath):
+            _album().record_update(path, 'x')
+
+@test('record_update_many applies all updates, copying the nodes they share once')
+def _():
+    album = _album()
+    updated = album.record_update_many({
+        'tracks[1].title': 'One',
+        'tracks[3].title': 'Three',
+        'tracks[3].number': 30,
+        'title': 'New',
+    })
+    assert_eq(updated, album
+        .record_update('tracks[1].title', 'One')
+        .record_update('tracks[3].title', 'Three')
+        .record_update('tracks[3].number', 30)
+        .record_update('title', 'New')
+    )
+    assert_is(updated.tracks[0], album.tracks[0])
+
+@test('record_update_many accepts a sequence of pairs, and no updates at all')
+def _():
+    album = _album()
+    assert_eq(album.record_update_many([('title', 'New')]).title, 'New')
+    assert_is(album.record_update_many({}), album)
+
+@test('record_update_many rejects paths that overlap')
+def _():
+    album = _album()
+    with assert_raises(InvalidPath):
+        album.record_update_many([('tracks[3]', album.tracks[0]), ('tracks[3].title', 'x')])
+    with assert_raises(InvalidPath):
+        album.record_update_many([('tracks[3].title', 'x'), ('tracks[3]', album.tracks[0])])
+    with assert_raises(InvalidPath):
+        album.record_update_many([('title', 'x'), ('title', 'y')])
+
+#----------------------------------------------------------------------------------------------------------------------------------
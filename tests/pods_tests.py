@@ -9,22 +9,28 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 # standards
 from collections import namedtuple
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
 # tdds
 from tdds import (
     CannotBeSerializedToPods,
     FieldNotNullable,
+    FieldValueError,
     Marshaller,
+    MarshallerRegistry,
     Record,
+    RecursiveType,
     dict_of,
     nullable,
+    one_of,
     pair_of,
+    register_pods_profile,
     seq_of,
     set_of,
     temporary_marshaller_registration,
 )
+from tdds.pods import PODS_PROFILES, PODS_TYPES
 from tdds.utils.compatibility import bytes_type, integer_types, text_type
 
 # this module
@@ -351,3 +357,230 @@ def _():
             MyRecord(Point(1, 2)).record_pods()
 
 #----------------------------------------------------------------------------------------------------------------------------------
+# profiles
+
+@test("the 'native' pods profile leaves Decimal, datetime, date and timedelta objects as they are")
+def _():
+    class MyRecord(Record):
+        amount = Decimal
+        created = datetime
+        day = date
+        duration = timedelta
+    r = MyRecord(
+        amount=Decimal('10.3'),
+        created=datetime(2009, 10, 28, 8, 53, 2),
+        day=date(2009, 10, 28),
+        duration=timedelta(seconds=30),
+    )
+    assert_eq(r.record_pods(profile='native'), {
+        'amount': Decimal('10.3'),
+        'created': datetime(2009, 10, 28, 8, 53, 2),
+        'day': date(2009, 10, 28),
+        'duration': timedelta(seconds=30),
+    })
+    assert_eq(MyRecord.from_pods(r.record_pods(profile='native'), profile='native'), r)
+
+@test("the 'json' pods profile is the default one")
+def _():
+    class MyRecord(Record):
+        amount = Decimal
+    r = MyRecord(amount=Decimal('10.3'))
+    assert_eq(r.record_pods(profile='json'), r.record_pods())
+    assert_eq(r.record_pods(), {'amount': '10.3'})
+    assert_eq(MyRecord.from_pods({'amount': '10.3'}, profile='json'), r)
+
+@test('pods profiles apply to nested records and collections')
+def _():
+    class Payment(Record):
+        amount = Decimal
+        when = nullable(date)
+    class Account(Record):
+        payments = seq_of(Payment)
+        totals = dict_of(text_type, Decimal)
+    a = Account(
+        payments=[Payment(amount=Decimal('1.5'), when=date(2020, 1, 2)), Payment(amount=Decimal('2'))],
+        totals={'all': Decimal('3.5')},
+    )
+    pods = a.record_pods(profile='native')
+    assert_eq(pods, {
+        'payments': [{'amount': Decimal('1.5'), 'when': date(2020, 1, 2)}, {'amount': Decimal('2')}],
+        'totals': {'all': Decimal('3.5')},
+    })
+    assert_eq(Account.from_pods(pods, profile='native'), a)
+
+@test('duck-typed nested objects are serialized with their plain record_pods method under any profile')
+def _():
+    class Name(object):
+        def __init__(self, first, last):
+            self.first = first
+            self.last = last
+        def record_pods(self):
+            return [self.first, self.last]
+    class Person(Record):
+        name = Name
+    assert_eq(
+        Person(Name('Robert', 'Smith')).record_pods(profile='native'),
+        {'name': ['Robert', 'Smith']},
+    )
+
+@test('asking for an unknown pods profile raises ValueError')
+def _():
+    class MyRecord(Record):
+        v = int
+    with assert_raises(ValueError):
+        MyRecord(1).record_pods(profile='nonesuch')
+    with assert_raises(ValueError):
+        MyRecord.from_pods({'v': 1}, profile='nonesuch')
+
+@test('custom pods profiles can be registered, and apply to classes compiled after registration')
+def _():
+    register_pods_profile('test_dates_only', [int, date])
+    try:
+        class MyRecord(Record):
+            day = date
+            amount = Decimal
+        r = MyRecord(day=date(2020, 1, 2), amount=Decimal('4'))
+        assert_eq(r.record_pods(profile='test_dates_only'), {'day': date(2020, 1, 2), 'amount': '4'})
+        assert_eq(MyRecord.from_pods(r.record_pods(profile='test_dates_only'), profile='test_dates_only'), r)
+    finally:
+        del PODS_PROFILES['test_dates_only']
+
+@test('classes compiled before a pods profile was registered refuse to use it, rather than fall back on the default one')
+def _():
+    class MyInner(Record):
+        day = date
+    register_pods_profile('test_late', [int, date])
+    try:
+        class MyOuter(Record):
+            inner = MyInner
+        r = MyOuter(inner=MyInner(day=date(2020, 1, 2)))
+        with assert_raises(CannotBeSerializedToPods, 'MyInner was compiled before pods profile \'test_late\' was registered'):
+            r.record_pods(profile='test_late')
+        with assert_raises(ValueError, 'MyInner was compiled before pods profile \'test_late\' was registered'):
+            r.inner.record_pods(profile='test_late')
+    finally:
+        del PODS_PROFILES['test_late']
+
+@test('pods profiles can encode one_of values as ordinals')
+def _():
+    register_pods_profile('test_enum_ordinals', PODS_TYPES, enum_ordinals=True)
+    try:
+        class MyRecord(Record):
+            color = one_of('red', 'green', 'blue')
+            size = nullable(one_of(1, 10, 100))
+        r = MyRecord(color='blue', size=None)
+        pods = r.record_pods(profile='test_enum_ordinals')
+        assert_eq(pods, {'color': 2})
+        assert_eq(MyRecord.from_pods(pods, profile='test_enum_ordinals'), r)
+        assert_eq(MyRecord.from_pods({'color': 0, 'size': 1}, profile='test_enum_ordinals').size, 10)
+        with assert_raises(FieldValueError):
+            MyRecord.from_pods({'color': 3, 'size': None}, profile='test_enum_ordinals')
+    finally:
+        del PODS_PROFILES['test_enum_ordinals']
+
+@test('string one_of values decoded from a PODS are the objects given to one_of')
+def _():
+    red = text_type('red')
+    class MyRecord(Record):
+        color = one_of(red, 'green')
+    decoded = MyRecord.from_pods({'color': ''.join(['r', 'e', 'd'])})
+    assert decoded.color is red
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# scoped marshaller registries
+
+def _point_marshallers():
+    Point = namedtuple('Point', ('x', 'y'))
+    as_text = Marshaller(
+        lambda pt: '%d,%d' % pt,
+        lambda s: Point(*map(int, s.split(','))),
+    )
+    as_list = Marshaller(
+        lambda pt: [pt.x, pt.y],
+        lambda l: Point(*l),
+    )
+    return Point, as_text, as_list
+
+@test('a marshaller registry can be passed to record_pods and from_pods')
+def _():
+    Point, as_text, _as_list_unused = _point_marshallers()
+    registry = MarshallerRegistry({Point: as_text})
+    class MyRecord(Record):
+        pt = Point
+    r = MyRecord(Point(1, 2))
+    assert_eq(r.record_pods(registry=registry), {'pt': '1,2'})
+    assert_eq(MyRecord.from_pods({'pt': '1,2'}, registry=registry), r)
+
+@test('marshallers registered with a registry apply to classes compiled before the registration')
+def _():
+    Point, as_text, _as_list_unused = _point_marshallers()
+    class MyRecord(Record):
+        pt = Point
+    registry = MarshallerRegistry()
+    with assert_raises(CannotBeSerializedToPods):
+        MyRecord(Point(1, 2)).record_pods(registry=registry)
+    with registry.temporary_registration(Point, as_text):
+        assert_eq(MyRecord(Point(1, 2)).record_pods(registry=registry), {'pt': '1,2'})
+    with assert_raises(CannotBeSerializedToPods):
+        MyRecord(Point(1, 2)).record_pods(registry=registry)
+
+@test('different registries give different pods for the same class, and do not affect the default pods methods')
+def _():
+    Point, as_text, as_list = _point_marshallers()
+    class MyRecord(Record):
+        pt = Point
+    r = MyRecord(Point(1, 2))
+    api = MarshallerRegistry({Point: as_text})
+    archive = MarshallerRegistry({Point: as_list})
+    assert_eq(r.record_pods(registry=api), {'pt': '1,2'})
+    assert_eq(r.record_pods(registry=archive), {'pt': [1, 2]})
+    with assert_raises(CannotBeSerializedToPods):
+        r.record_pods()
+
+@test('marshaller registries encode nested subclass instances with their own fields')
+def _():
+    class Base(Record):
+        a = int
+    class Sub(Base, Record):
+        b = int
+    class MyRecord(Record):
+        x = Base
+        xs = seq_of(Base)
+    r = MyRecord(x=Sub(a=1, b=2), xs=[Base(a=3), Sub(a=4, b=5)])
+    assert_eq(r.record_pods(registry=MarshallerRegistry()), {'x': {'a': 1, 'b': 2}, 'xs': [{'a': 3}, {'a': 4, 'b': 5}]})
+    assert_eq(r.record_pods(registry=MarshallerRegistry()), r.record_pods())
+
+@test('marshaller registries apply to nested records, collections and recursive types')
+def _():
+    Point, _as_text_unused, as_list = _point_marshallers()
+    registry = MarshallerRegistry({Point: as_list})
+    class Shape(Record):
+        points = seq_of(Point)
+        labels = dict_of(text_type, Point)
+        child = nullable(RecursiveType)
+    s = Shape(
+        points=[Point(1, 2)],
+        labels={'origin': Point(0, 0)},
+        child=Shape(points=[Point(3, 4)], labels={}),
+    )
+    pods = s.record_pods(registry=registry)
+    assert_eq(pods, {
+        'points': [[1, 2]],
+        'labels': {'origin': [0, 0]},
+        'child': {'points': [[3, 4]], 'labels': {}},
+    })
+    assert_eq(Shape.from_pods(pods, registry=registry), s)
+
+@test('marshaller registries can be combined with pods profiles')
+def _():
+    Point, as_text, _as_list_unused = _point_marshallers()
+    registry = MarshallerRegistry({Point: as_text})
+    class MyRecord(Record):
+        pt = Point
+        amount = Decimal
+    r = MyRecord(pt=Point(1, 2), amount=Decimal('3.5'))
+    pods = r.record_pods(registry=registry, profile='native')
+    assert_eq(pods, {'pt': '1,2', 'amount': Decimal('3.5')})
+    assert_eq(MyRecord.from_pods(pods, registry=registry, profile='native'), r)
+
+#----------------------------------------------------------------------------------------------------------------------------------
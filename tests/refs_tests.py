@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+import json
+
+# tdds
+from tdds import CannotBeSerializedToPods, Record, dict_of, nullable, seq_of
+from tdds.refs import REFS_STATE
+from tdds.utils.compatibility import text_type
+
+# this module
+from .plumbing import assert_eq, assert_is, assert_none, assert_raises, build_test_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+class RefTrack(Record):
+    title = text_type
+    tags = seq_of(text_type)
+
+class RefPlaylist(Record):
+    name = text_type
+    tracks = seq_of(RefTrack)
+    cover = nullable(RefTrack)
+
+class RefLibrary(Record):
+    playlists = seq_of(RefPlaylist)
+    by_name = dict_of(text_type, RefPlaylist)
+
+def _library():
+    track = RefTrack(title='Blue Train', tags=['jazz'])
+    tracks = RefPlaylist.record_fields['tracks'].type([track, track])
+    playlists = [RefPlaylist(name=name, tracks=tracks, cover=track) for name in ('a', 'b')]
+    return RefLibrary(playlists=playlists, by_name={p.name: p for p in playlists})
+
+@test('record_pods with refs=True encodes each shared object once')
+def _():
+    library = _library()
+    pods = library.record_pods(refs=True)
+    assert_eq(json.dumps(pods).count('Blue Train'), 1)
+    assert_eq(pods['by_name']['b']['$pods']['cover'], {'$ref': 1})
+    assert_eq(pods['playlists'], [{'$ref': 0}, {'$ref': 3}])
+
+@test('from_pods with refs=True rebuilds the sharing')
+def _():
+    library = RefLibrary.from_pods(_library().record_pods(refs=True), refs=True)
+    assert_eq(library, _library())
+    playlist_a, playlist_b = library.playlists
+    assert_is(library.by_name['a'], playlist_a)
+    assert_is(playlist_a.tracks, playlist_b.tracks)
+    assert_is(playlist_a.tracks[0], playlist_a.tracks[1])
+    assert_is(playlist_a.cover, playlist_a.tracks[0])
+
+@test("objects that aren't shared are encoded as without refs")
+def _():
+    track = RefTrack(title='Blue Train', tags=['jazz'])
+    playlist = RefPlaylist(name='a', tracks=[track], cover=RefTrack(title='Blue Train', tags=['jazz']))
+    assert_eq(playlist.record_pods(refs=True), playlist.record_pods())
+    assert_eq(RefPlaylist.from_pods(playlist.record_pods(), refs=True), playlist)
+
+@test('references are resolved even when they come before the object they refer to')
+def _():
+    pods = _library().record_pods(refs=True)
+    pods['playlists'], pods['by_name'] = list(pods['by_name'].values()), dict(zip('ab', pods['playlists']))
+    library = RefLibrary.from_pods(pods, refs=True)
+    assert_eq(library, _library())
+    assert_is(library.by_name['a'], library.playlists[0])
+
+@test('a dict whose PODS looks like a reference cannot be encoded with refs')
+def _():
+    class RefLabels(Record):
+        labels = seq_of(dict_of(text_type, text_type))
+    labels = RefLabels(labels=[{'$ref': 'x'}])
+    with assert_raises(CannotBeSerializedToPods):
+        labels.record_pods(refs=True)
+
+@test('the state is cleared once the call is done')
+def _():
+    RefLibrary.from_pods(_library().record_pods(refs=True), refs=True)
+    assert_none(REFS_STATE.encoder)
+    assert_none(REFS_STATE.decoder)
+
+#----------------------------------------------------------------------------------------------------------------------------------
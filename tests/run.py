@@ -14,35 +14,59 @@ from sys import argv, exit
 
 # this module
 from . import (
+    async_builder_tests,
+    builder_tests,
     check_tests,
     cleaner_tests,
     coercion_tests,
     collection_tests,
     core_tests,
+    dedupe_tests,
+    drafts_tests,
+    fused_tests,
+    interning_tests,
     marshaller_tests,
+    memory_tests,
+    metrics_tests,
+    optimization_tests,
+    paths_tests,
     pickle_tests,
     pods_tests,
     readme_tests,
     recursive_types_tests,
+    refs_tests,
     shortcut_tests,
     subclassing_tests,
+    validation_tests,
 )
 
 #----------------------------------------------------------------------------------------------------------------------------------
 
 ALL_TEST_MODS = (
+    async_builder_tests,
+    builder_tests,
     check_tests,
     cleaner_tests,
     coercion_tests,
     collection_tests,
     core_tests,
+    dedupe_tests,
+    drafts_tests,
+    fused_tests,
+    interning_tests,
     marshaller_tests,
+    memory_tests,
+    metrics_tests,
+    optimization_tests,
+    paths_tests,
     pickle_tests,
     pods_tests,
     readme_tests,
     recursive_types_tests,
+    refs_tests,
     shortcut_tests,
     subclassing_tests,
+    validation_tests,
 )
 
 def iter_all_tests(selected_mod_name):
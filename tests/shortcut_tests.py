@@ -12,8 +12,11 @@ from functools import total_ordering
 
 # tdds
 from tdds import (
+    FieldNotNullable,
     FieldValueError,
     Record,
+    absolute_http_url,
+    check_many,
     dict_of,
     one_of,
     nonempty,
@@ -126,6 +129,65 @@ def _():
     with assert_raises(FieldValueError):
         MyRecord(s='a')
 
+@test('uppercase_letters(3) does not accept a trailing newline')
+def _():
+    class MyRecord(Record):
+        s = uppercase_letters(3)
+    with assert_raises(FieldValueError):
+        MyRecord(s='ABC\n')
+
+@test('absolute_http_url accepts http and https URLs')
+def _():
+    class MyRecord(Record):
+        url = absolute_http_url
+    assert_eq(MyRecord(url=b'https://example.com/').url, b'https://example.com/')
+    with assert_raises(FieldValueError):
+        MyRecord(url=b'ftp://example.com/')
+    with assert_raises(FieldValueError):
+        MyRecord(url=b'http://')
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# check_many
+
+@test('check_many returns the valid values as a list')
+def _():
+    assert_eq(
+        check_many(uppercase_letters(3), iter(['USD', 'EUR', 'GBP'])),
+        ['USD', 'EUR', 'GBP'],
+    )
+
+@test('check_many accepts an empty list')
+def _():
+    assert_eq(check_many(uppercase_letters(3), []), [])
+
+@foreach((
+    ('a value with the wrong format', ['USD', 'eur'], FieldValueError),
+    ('a value with a newline in it', ['USD', 'EUR\nGBP'], FieldValueError),
+    ('a None', ['USD', None], FieldNotNullable),
+))
+def _(desc, values, exc_type):
+    @test('check_many rejects {}'.format(desc))
+    def _():
+        with assert_raises(exc_type):
+            check_many(uppercase_letters(3), values)
+
+@test('check_many also accepts empty strings when the regex allows it')
+def _():
+    assert_eq(check_many(uppercase_letters(), ['', 'A', '']), ['', 'A', ''])
+
+@test('check_many works with fields that are not regex shortcuts')
+def _():
+    assert_eq(check_many(nonnegative(int), [0, 1]), [0, 1])
+    with assert_raises(FieldValueError):
+        check_many(nonnegative(int), [0, -1])
+
+@test('check_many applies coercion and default values')
+def _():
+    assert_eq(
+        check_many(nullable(text_type, default='x'), [None, 'y']),
+        ['x', 'y'],
+    )
+
 #----------------------------------------------------------------------------------------------------------------------------------
 # one_of
 
@@ -204,6 +266,13 @@ def _():
         v = one_of('a', 'b', 'c', coerce=text_type.lower)
     assert_eq(MyRecord('C').v, 'c')
 
+@test('one_of checks are compiled to an inline test against a frozenset')
+def _():
+    class MyRecord(Record):
+        v = one_of('a', 'b', 'c')
+    source = MyRecord.__init__.__globals__['__tdds_source__']
+    assert '(v in intern___' in source, source
+
 #----------------------------------------------------------------------------------------------------------------------------------
 # nonempty
 
@@ -228,6 +297,28 @@ def _(ftype, ftype_name, empty_val):
         with assert_raises(FieldValueError):
             MyRecord(empty_val)
 
+#----------------------------------------------------------------------------------------------------------------------------------
+# chaining value checks
+
+@test('value checks can be chained')
+def _():
+    class MyRecord(Record):
+        v = nonempty(uppercase_letters())
+    assert_eq(MyRecord('ABC').v, 'ABC')
+    with assert_raises(FieldValueError):
+        MyRecord('')
+    with assert_raises(FieldValueError):
+        MyRecord('abc')
+
+@test('value checks can be chained with a nullable field')
+def _():
+    class MyRecord(Record):
+        v = strictly_positive(nonnegative(nullable(int)))
+    assert_none(MyRecord().v)
+    assert_eq(MyRecord(1).v, 1)
+    with assert_raises(FieldValueError):
+        MyRecord(0)
+
 #----------------------------------------------------------------------------------------------------------------------------------
 # misc
 
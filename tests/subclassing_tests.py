@@ -8,7 +8,7 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 # tdds
-from tdds import Record, RecordsAreImmutable
+from tdds import FieldTypeError, Record, RecordsAreImmutable, nullable
 from tdds.utils.compatibility import text_type
 
 # this module
@@ -242,6 +242,39 @@ def _():
     assert_eq(c.record_derive(x=3), Child(3, 2))
     assert_eq(c.record_derive(y=4), Child(1, 4))
 
+@test("a record subclass's constructor checks and sets the superclass fields itself, at any depth")
+def _():
+    class GrandParent(Record):
+        x = int
+    class Parent(GrandParent, Record):
+        y = nullable(text_type)
+    class Child(Parent, Record):
+        z = int
+    assert 'super(' not in Child.__tdds_source__, Child.__tdds_source__
+    c = Child(x=1, y='a', z=3)
+    assert_eq((c.x, c.y, c.z), (1, 'a', 3))
+    assert_eq(Child(x=1, z=3).y, None)
+    # error messages name the class that defines the field, like the superclass constructor would
+    with assert_raises(FieldTypeError, "GrandParent.x should be of type int, not str ('1')"):
+        Child(x='1', z=3)
+    with assert_raises(FieldTypeError, "Parent.y should be of type %s, not int (2)" % text_type.__name__):
+        Child(x=1, y=2, z=3)
+
+@test("if a superclass of a record has a constructor of its own, the record's constructor calls it")
+def _():
+    calls = []
+    class GrandParent(Record):
+        x = int
+    class Parent(GrandParent):
+        def __init__(self, **kwargs):
+            calls.append(kwargs)
+            super(Parent, self).__init__(**kwargs)
+    class Child(Parent, Record):
+        y = int
+    c = Child(x=1, y=2)
+    assert_eq((c.x, c.y), (1, 2))
+    assert_eq(calls, [{'x': 1}])
+
 # 2017-03-03 - I'm comment this one out even though it passes, but 3-way inheritance doesn't work anyway because of some problem
 # with __slots__ (see 'Layout Conflicts' at http://mcjeff.blogspot.co.uk/2009/05/odd-python-errors.html)
 #
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# includes
+
+# 2+3 compat
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# standards
+import gc
+import subprocess
+import sys
+import weakref
+
+# tdds
+from tdds import Field, FieldNotNullable, FieldTypeError, FieldValueError, Record, nullable, seq_of, validation
+from tdds.utils.compatibility import text_type
+from tdds.validation import current_validation_mode
+
+# this module
+from .plumbing import assert_eq, assert_is, assert_raises, build_test_registry
+
+#----------------------------------------------------------------------------------------------------------------------------------
+# init
+
+ALL_TESTS, test = build_test_registry()
+
+#----------------------------------------------------------------------------------------------------------------------------------
+
+def _record_class():
+    class MyRecord(Record):
+        id = Field(int, check='{} > 0')
+        name = nullable(text_type)
+    return MyRecord
+
+@test('the default validation mode is full')
+def _():
+    assert_eq(current_validation_mode(), 'full')
+    MyRecord = _record_class()
+    with assert_raises(FieldValueError):
+        MyRecord(id=-1)
+
+@test("'types_only' skips the value checks")
+def _():
+    MyRecord = _record_class()
+    with validation('types_only'):
+        assert_eq(MyRecord(id=-1).id, -1)
+        with assert_raises(FieldTypeError):
+            MyRecord(id='1')
+        with assert_raises(FieldNotNullable):
+            MyRecord(id=None)
+
+@test("'off' skips all checks")
+def _():
+    MyRecord = _record_class()
+    with validation('off'):
+        assert_eq(MyRecord(id=-1).id, -1)
+        assert_eq(MyRecord(id='1').id, '1')
+        assert_eq(MyRecord(id=None).id, None)
+
+@test("'off' still applies default values and coercion")
+def _():
+    class MyRecord(Record):
+        name = Field(text_type, nullable=True, default='anon')
+        ids = seq_of(int)
+    with validation('off'):
+        record = MyRecord(ids=[1, 2])
+    assert_eq(record.name, 'anon')
+    assert_is(record.ids.__class__, MyRecord.record_fields['ids'].type)
+
+@test("'sample' runs the value checks on some constructions only")
+def _():
+    MyRecord = _record_class()
+    num_failures = 0
+    with validation('sample:0.5'):
+        for _ in range(1000):
+            try:
+                MyRecord(id=-1)
+            except FieldValueError:
+                num_failures += 1
+        with assert_raises(FieldNotNullable):
+            MyRecord(id=None)
+    assert 300 < num_failures < 700, num_failures
+
+@test("'sample:0' never runs value checks, 'sample:1' always does")
+def _():
+    MyRecord = _record_class()
+    with validation('sample:0'):
+        assert_eq(MyRecord(id=-1).id, -1)
+    with validation('sample:1'):
+        with assert_raises(FieldValueError):
+            MyRecord(id=-1)
+
+@test("'sample' mode works with fields named like its local variables")
+def _():
+    class MyRecord(Record):
+        _sampled = int
+        y = Field(int, check='{} > 0')
+    with validation('sample:1'):
+        assert_eq(MyRecord(_sampled=0, y=2)._sampled, 0)  # pylint: disable=protected-access
+        with assert_raises(FieldValueError):
+            MyRecord(_sampled=0, y=-1)
+        assert_eq(MyRecord(_sampled=0, y=2).record_derive(y=3)._sampled, 0)  # pylint: disable=protected-access
+
+@test('the validation mode is restored at the end of the with block')
+def _():
+    MyRecord = _record_class()
+    with validation('off'):
+        with validation('types_only'):
+            assert_eq(current_validation_mode(), 'types_only')
+        assert_eq(current_validation_mode(), 'off')
+    assert_eq(current_validation_mode(), 'full')
+    with assert_raises(FieldValueError):
+        MyRecord(id=-1)
+
+@test('the validation mode applies to classes defined while it is set')
+def _():
+    with validation('off'):
+        MyRecord = _record_class()
+        assert_eq(MyRecord(id=-1).id, -1)
+    with assert_raises(FieldValueError):
+        MyRecord(id=-1)
+
+@test('the validation mode applies to superclass fields')
+def _():
+    MyRecord = _record_class()
+    class MySubRecord(MyRecord, Record):
+        label = text_type
+    with validation('off'):
+        assert_eq(MySubRecord(id=-1, label=None).id, -1)
+    with assert_raises(FieldValueError):
+        MySubRecord(id=-1, label='label')
+
+@test('changing the validation mode keeps user-defined constructors')
+def _():
+    MyRecord = _record_class()
+    calls = []
+    class MySubRecord(MyRecord, Record):
+        def __init__(self, id):  # pylint: disable=redefined-builtin
+            calls.append(id)
+            MyRecord.__init__(self, id=id)
+    with validation('off'):
+        assert_eq(MySubRecord(id=-1).id, -1)
+    with assert_raises(FieldValueError):
+        MySubRecord(id=-2)
+    assert_eq(calls, [-1, -2])
+
+@test('record classes can still be garbage-collected')
+def _():
+    class_refs = []
+    for _i_unused in range(10):
+        MyRecord = _record_class()
+        with validation('off'):
+            MyRecord(id=-1)
+        class_refs.append(weakref.ref(MyRecord))
+    del MyRecord
+    gc.collect()
+    # NB the last class may still be referenced from elsewhere, e.g. the last frame of the `with' block
+    assert sum(ref() is not None for ref in class_refs) <= 1, class_refs
+
+@test('unknown validation modes are rejected')
+def _():
+    for mode in ('everything', 'sample:', 'sample:2', 'sample:x', None):
+        with assert_raises(ValueError):
+            validation(mode)
+    assert_eq(current_validation_mode(), 'full')
+
+@test('validation is off under python -O')
+def _():
+    output = subprocess.check_output([
+        sys.executable,
+        '-O',
+        '-c',
+        'from tdds.validation import current_validation_mode; print(current_validation_mode())',
+    ])
+    assert_eq(output.decode('UTF-8').strip(), 'off')
+
+#----------------------------------------------------------------------------------------------------------------------------------